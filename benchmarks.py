@@ -0,0 +1,234 @@
+"""Microbenchmarks for the Unicode analysis hot paths.
+
+Each benchmark runs over generated texts of several shapes (ASCII prose,
+CJK, emoji sequences, control-heavy and combining-heavy text) and sizes
+(in UTF-8 bytes, 10 B to 1 MB). Texts are generated from a fixed seed, so
+runs on different versions of the code or of unicodedata2 see the same
+inputs and their results can be compared with compare().
+
+Timing follows timeit: one warm-up call (filling the codepoint table and
+the per-character caches, so steady-state cost is measured), then a loop
+count calibrated to last at least min_time, repeated; the per-call minimum
+is the figure to compare, the median and spread show the noise.
+"""
+
+import platform
+import random
+import statistics
+import time
+from datetime import datetime, timezone
+from importlib import metadata
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import django
+from django.test import RequestFactory, override_settings
+import unicodedata2 as ud
+
+import decode.unicode_util as u
+from decode import views
+
+# Bump when the result format or the generated inputs change.
+BENCHMARK_FORMAT_VERSION = 1
+# Input sizes in UTF-8 bytes.
+BENCHMARK_SIZES = (10, 100, 1000, 10_000, 100_000, 1_000_000)
+# Minimum seconds per timed repeat, and repeats per benchmark.
+BENCHMARK_MIN_TIME = 0.1
+BENCHMARK_REPEAT = 5
+# compare() reports cases at least this many times slower than the baseline.
+REGRESSION_THRESHOLD = 1.25
+
+_WORDS = ('the', 'quick', 'brown', 'fox', 'jumps', 'over', 'lazy', 'dog', 'Unicode', 'text', 'of',
+          'and', 'to', 'a', 'in', 'is', 'it', 'you', 'that', 'was', 'for', 'on', 'are', 'with')
+
+# Units each shape's texts are drawn from. (No NUL: the decode form rejects it.)
+SHAPES: Dict[str, Tuple[str, ...]] = {
+    'ascii': (*(word + ' ' for word in _WORDS), 'end.\n', 'comma, ', '42 '),
+    'cjk': (*map(chr, range(0x4E00, 0x9FA6, 7)), *map(chr, range(0x3041, 0x3097)),
+            '\u3001', '\u3002', '\uFF0C', '\u3000', '\uAC00', '\uD55C'),
+    'emoji': ('\U0001F600', '\U0001F602', '\U0001F44D\U0001F3FD', '\u2764\uFE0F', '\U0001F1EF\U0001F1F5',
+              '\U0001F468\u200D\U0001F469\u200D\U0001F467', '\U0001F3F3\uFE0F\u200D\U0001F308', ' ', 'ok '),
+    'control': (*(word + ' ' for word in _WORDS[:8]), '\t', '\r\n', '\x01', '\x1b[0m', '\x7f', '\x85',
+                '\xAD', '\u200B', '\u200D', '\u2060', '\uFEFF', '\u202E', '\u202C', '\u2066', '\u2069'),
+    'combining': (*(base + marks for base in 'aeiouyn'
+                    for marks in ('\u0301', '\u0308\u0301', '\u0323\u0302', '\u0327', '\u0303\u0304\u0306')),
+                  '\u0915\u094D\u0937\u093F', '\u1100\u1161\u11A8', '\u05E9\u05B8\u05C1', ' '),
+}
+
+
+class Benchmark(NamedTuple):
+    """A timed function: setup builds the arguments from the text, outside the timing."""
+
+    name: str
+    run: Callable[..., Any]
+    setup: Callable[[str], Tuple[Any, ...]]
+
+
+def _decode_request(text: str) -> Tuple[Any, ...]:
+    return (RequestFactory().post('/', {'text': text}),)
+
+
+def _decode_render(request) -> int:
+    """POST the decode page and return the length of the response."""
+    return len(views.decode(request).content)
+
+
+BENCHMARKS: Tuple[Benchmark, ...] = (
+    Benchmark('examen_unicode', u.examen_unicode, lambda text: (text,)),
+    Benchmark('get_normalization_form', u.get_normalization_form, lambda text: (text,)),
+    # Per-character lookups, as the character table makes them.
+    Benchmark('Alias.get_aliases', lambda text: list(map(u.alias.get_aliases, text)), lambda text: (text,)),
+    Benchmark('get_script', lambda text: list(map(u.get_script, text)), lambda text: (text,)),
+    Benchmark('_text_summary', views._text_summary, lambda text: (u.examen_unicode(text),)),
+    Benchmark('views.decode', _decode_render, _decode_request),
+)
+
+
+def make_text(shape: str, size: int) -> str:
+    """Generate the benchmark input of a shape with at most size UTF-8 bytes.
+
+    Args:
+        shape: One of SHAPES.
+        size: Length in UTF-8 bytes; the text is cut at the last whole
+            character that fits.
+
+    Returns:
+        The same text for the same shape and size on every run.
+    """
+    units = SHAPES[shape]
+    rng = random.Random(f'{shape}:{size}')
+    parts: List[str] = []
+    length = 0
+    while length < size:
+        unit = rng.choice(units)
+        parts.append(unit)
+        length += len(unit.encode('utf-8'))
+    return ''.join(parts).encode('utf-8')[:size].decode('utf-8', 'ignore')
+
+
+def _time(run: Callable[..., Any], args: Tuple[Any, ...], min_time: float, repeat: int) -> Tuple[int, List[float]]:
+    """Return the loop count and per-call seconds of each repeat (after one warm-up call)."""
+    run(*args)
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            run(*args)
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number *= 10 if elapsed < min_time / 10 else 2
+    timings = [elapsed / number]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            run(*args)
+        timings.append((time.perf_counter() - start) / number)
+    return number, timings
+
+
+def environment() -> Dict[str, Optional[str]]:
+    """Versions that affect the results, recorded with every run."""
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'machine': platform.machine(),
+        'system': platform.system(),
+        'django': django.get_version(),
+        'unicodedata2': metadata.version('unicodedata2'),
+        'unidata_version': ud.unidata_version,
+        'numpy': u.np.__version__ if u.np is not None else None,
+    }
+
+
+def run_benchmarks(benchmarks: Optional[Iterable[str]] = None, shapes: Optional[Iterable[str]] = None,
+                   sizes: Iterable[int] = BENCHMARK_SIZES, min_time: float = BENCHMARK_MIN_TIME,
+                   repeat: int = BENCHMARK_REPEAT,
+                   progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+    """Time every selected benchmark on every shape and size.
+
+    Args:
+        benchmarks: Names from BENCHMARKS (all by default).
+        shapes: Names from SHAPES (all by default).
+        sizes: Input sizes in UTF-8 bytes.
+        min_time: Minimum seconds per repeat; calls are looped until a
+            repeat takes at least this long.
+        repeat: Number of timed repeats.
+        progress: Called with each result as it is measured.
+
+    Returns:
+        JSON-serializable dict with the format version, the time of the run,
+        environment() and one result per (benchmark, shape, size), with
+        per-call seconds (min, median, mean, stdev) and UTF-8 bytes per
+        second at the minimum.
+
+    Raises:
+        ValueError: If a benchmark or shape is unknown.
+    """
+    names = None if benchmarks is None else set(benchmarks)
+    shapes = list(SHAPES if shapes is None else shapes)
+    unknown = (names or set()) - {b.name for b in BENCHMARKS} | set(shapes) - set(SHAPES)
+    if unknown:
+        raise ValueError(f'unknown benchmarks or shapes: {", ".join(sorted(unknown))}')
+    selected = [b for b in BENCHMARKS if names is None or b.name in names]
+    results = []
+    # Keep the decode page's live-revision texts out of the configured caches.
+    with override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                                               'LOCATION': 'decode-benchmarks'}}):
+        for shape in shapes:
+            for size in sizes:
+                text = make_text(shape, size)
+                for benchmark in selected:
+                    number, timings = _time(benchmark.run, benchmark.setup(text), min_time, repeat)
+                    best = min(timings)
+                    result = {
+                        'benchmark': benchmark.name,
+                        'shape': shape,
+                        'size': size,
+                        'chars': len(text),
+                        'number': number,
+                        'repeat': repeat,
+                        'min': best,
+                        'median': statistics.median(timings),
+                        'mean': statistics.fmean(timings),
+                        'stdev': statistics.stdev(timings) if repeat > 1 else 0.0,
+                        'bytes_per_second': len(text.encode('utf-8')) / best if best else None,
+                    }
+                    results.append(result)
+                    if progress is not None:
+                        progress(result)
+    return {
+        'format': BENCHMARK_FORMAT_VERSION,
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'environment': environment(),
+        'results': results,
+    }
+
+
+class Comparison(NamedTuple):
+    """One case measured in both runs; ratio > 1 means the current run is slower."""
+
+    benchmark: str
+    shape: str
+    size: int
+    baseline: float
+    current: float
+    ratio: float
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any]) -> List[Comparison]:
+    """Match the cases of two run_benchmarks() results and compare their minimum times.
+
+    Cases present in only one run are skipped.
+
+    Raises:
+        ValueError: If the runs have different format versions (their inputs differ).
+    """
+    if baseline.get('format') != current.get('format'):
+        raise ValueError('benchmark results have different formats and cannot be compared')
+
+    def key(result: Dict[str, Any]) -> Tuple[str, str, int]:
+        return result['benchmark'], result['shape'], result['size']
+
+    before = {key(result): result['min'] for result in baseline['results']}
+    return [Comparison(*key(result), before[key(result)], result['min'], result['min'] / before[key(result)])
+            for result in current['results'] if before.get(key(result))]
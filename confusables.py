@@ -0,0 +1,139 @@
+"""Confusable detection (Unicode Technical Standard #39, section 4).
+
+Two strings are confusable when they have the same skeleton: the NFD form
+with every character replaced by its prototype from files/confusables.txt,
+normalized to NFD again. The mapping is parsed once into a str.translate
+table, so a skeleton costs two normalizations and one translate -- linear in
+the length of the text. SkeletonIndex hashes the skeletons of a target set
+(brand names, existing usernames) so screening each candidate against it is
+one skeleton and one dict lookup, however large the set.
+"""
+
+import os
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, Iterator, List, NamedTuple, Optional
+
+import unicodedata2 as ud
+
+# App package directory (decode/)
+_APP_DIR: str = os.path.dirname(os.path.abspath(__file__))
+
+
+@lru_cache(maxsize=None)
+def prototypes() -> Dict[int, str]:
+    """Map each source code point of confusables.txt to its prototype string.
+
+    The dict is usable directly as a str.translate table.
+    """
+    table: Dict[int, str] = {}
+    with open(os.path.join(_APP_DIR, 'files', 'confusables.txt'), encoding='utf-8-sig') as f:
+        for line in f:
+            line = line.split('#', 1)[0].strip()
+            if not line:
+                continue
+            source, target, _ = line.split(';', 2)
+            table[int(source, 16)] = ''.join(chr(int(cp, 16)) for cp in target.split())
+    return table
+
+
+@lru_cache(maxsize=None)
+def confusable_codepoints() -> FrozenSet[int]:
+    """Non-ASCII code points listed in confusables.txt (the homoglyph set).
+
+    ASCII sources such as 'm' (confusable with 'rn') or '1' (with 'l') are
+    the usual targets of spoofing rather than spoofers, so they are left out
+    here; skeleton() still maps them.
+    """
+    return frozenset(cp for cp in prototypes() if cp > 0x7F)
+
+
+def is_confusable_codepoint(cp: int) -> bool:
+    """True if the code point is a non-ASCII character listed in confusables.txt."""
+    return cp in confusable_codepoints()
+
+
+def confusable_with(char: str) -> Optional[str]:
+    """Return the prototype a single character is confusable with, else None.
+
+    Args:
+        char: Single Unicode character.
+
+    Returns:
+        Prototype string from confusables.txt (e.g. 'a' for Cyrillic 'а'),
+        or None for ASCII and unlisted characters.
+    """
+    if len(char) != 1 or not is_confusable_codepoint(ord(char)):
+        return None
+    return prototypes()[ord(char)]
+
+
+def skeleton(text: str) -> str:
+    """Return the UTS #39 skeleton of text.
+
+    Args:
+        text: Any string.
+
+    Returns:
+        NFD(text) with each character replaced by its prototype, in NFD.
+        Strings with equal skeletons are confusable.
+    """
+    return ud.normalize('NFD', ud.normalize('NFD', text).translate(prototypes()))
+
+
+def is_confusable(a: str, b: str) -> bool:
+    """True if the two strings have the same skeleton."""
+    return skeleton(a) == skeleton(b)
+
+
+class SkeletonMatch(NamedTuple):
+    """A screened candidate whose skeleton equals that of one or more targets."""
+
+    index: int
+    candidate: str
+    skeleton: str
+    targets: List[str]
+
+
+class SkeletonIndex:
+    """Hash index of target strings by skeleton, for bulk confusable screening.
+
+    Building the index and screening are both linear in the total length of
+    the strings: each string is skeletonized once and looked up by hash.
+    Skeletons are case-sensitive; casefold targets and candidates first to
+    compare case-insensitively (as most username policies do).
+    """
+
+    def __init__(self, targets: Iterable[str] = ()) -> None:
+        """Index the given targets."""
+        self._targets: Dict[str, List[str]] = {}
+        for target in targets:
+            self.add(target)
+
+    def __len__(self) -> int:
+        return sum(map(len, self._targets.values()))
+
+    def add(self, target: str) -> None:
+        """Add a target string (duplicates are ignored)."""
+        bucket = self._targets.setdefault(skeleton(target), [])
+        if target not in bucket:
+            bucket.append(target)
+
+    def matches(self, text: str) -> List[str]:
+        """Return the targets confusable with text (including text itself if indexed)."""
+        return list(self._targets.get(skeleton(text), ()))
+
+    def screen(self, candidates: Iterable[str]) -> Iterator[SkeletonMatch]:
+        """Yield a SkeletonMatch for every candidate confusable with a target.
+
+        Args:
+            candidates: Strings to check, e.g. a stream of usernames.
+
+        Yields:
+            SkeletonMatch for each matching candidate, in input order.
+        """
+        lookup = self._targets.get
+        for index, candidate in enumerate(candidates):
+            key = skeleton(candidate)
+            targets = lookup(key)
+            if targets:
+                yield SkeletonMatch(index, candidate, key, list(targets))
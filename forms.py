@@ -1,12 +1,48 @@
 from django import forms
+from decode.name_index import SEARCH_LIMIT, SEARCH_MODES
 
 class UnicodeTextForm(forms.Form):
     text = forms.CharField(
         label='',
+        strip=False,
         widget=forms.Textarea(attrs={
             'id': 'textarea1',
             'class': 'materialize-textarea',
             'dir': 'auto',
         }),
     )
-    
\ No newline at end of file
+
+
+class LiveEditForm(forms.Form):
+    """One textarea edit for the live decode delta protocol.
+
+    Offsets and lengths are in UTF-16 code units, as reported by the browser.
+    """
+    revision = forms.CharField(max_length=64)
+    offset = forms.IntegerField(min_value=0)
+    deleted = forms.IntegerField(min_value=0)
+    inserted = forms.CharField(required=False, strip=False)
+
+
+class RowWindowForm(forms.Form):
+    """A window of character table rows for a decoded text revision.
+
+    start and count are in characters (code points), i.e. table rows.
+    """
+    revision = forms.CharField(max_length=64)
+    start = forms.IntegerField(min_value=0)
+    count = forms.IntegerField(min_value=1, required=False)
+
+
+class NameSearchForm(forms.Form):
+    """A character name search (see name_index.NameIndex.search)."""
+    q = forms.CharField(label='', max_length=200, widget=forms.TextInput(attrs={
+        'placeholder': 'e.g. zero width space',
+    }))
+    mode = forms.ChoiceField(
+        label='',
+        choices=[(mode, mode.title()) for mode in SEARCH_MODES],
+        required=False,
+        widget=forms.Select(attrs={'class': 'browser-default'}),
+    )
+    limit = forms.IntegerField(min_value=1, max_value=SEARCH_LIMIT, required=False)
@@ -0,0 +1,77 @@
+"""Management command: time the Unicode analysis hot paths and write the results as JSON."""
+
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from decode.benchmarks import (
+    BENCHMARK_MIN_TIME,
+    BENCHMARK_REPEAT,
+    BENCHMARK_SIZES,
+    BENCHMARKS,
+    REGRESSION_THRESHOLD,
+    SHAPES,
+    compare,
+    run_benchmarks,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Time examen_unicode, normalization, alias and script lookups, the summary and the '
+        'decode page over generated texts of several shapes and sizes, and write the results '
+        'as JSON. With --compare, report the cases slower than a previous run.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--benchmarks', nargs='+', choices=[b.name for b in BENCHMARKS],
+                            help='Benchmarks to run (default: all).')
+        parser.add_argument('--shapes', nargs='+', choices=list(SHAPES), help='Input shapes (default: all).')
+        parser.add_argument('--sizes', nargs='+', type=int, default=list(BENCHMARK_SIZES),
+                            help='Input sizes in UTF-8 bytes (default: %(default)s).')
+        parser.add_argument('--min-time', type=float, default=BENCHMARK_MIN_TIME,
+                            help='Minimum seconds per timed repeat (default: %(default)s).')
+        parser.add_argument('--repeat', type=int, default=BENCHMARK_REPEAT,
+                            help='Timed repeats per case (default: %(default)s).')
+        parser.add_argument('--output', help='Write the JSON results to this file instead of stdout.')
+        parser.add_argument('--compare', metavar='BASELINE',
+                            help='JSON results of an earlier run to compare against.')
+        parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD,
+                            help='Fail if a case is this many times slower than the baseline '
+                                 '(default: %(default)s).')
+
+    def handle(self, *args, **options):
+        if options['repeat'] < 1 or options['min_time'] < 0 or min(options['sizes']) < 1:
+            raise CommandError('--repeat and --sizes must be positive and --min-time not negative.')
+        baseline = None
+        if options['compare']:
+            try:
+                with open(options['compare'], encoding='utf-8') as f:
+                    baseline = json.load(f)
+            except (OSError, ValueError) as exc:
+                raise CommandError(f"Cannot read {options['compare']}: {exc}")
+
+        def progress(result):
+            self.stderr.write(f"{result['benchmark']:<24} {result['shape']:<10} {result['size']:>9} B "
+                              f"{result['min'] * 1000:>11.3f} ms")
+
+        results = run_benchmarks(options['benchmarks'], options['shapes'], options['sizes'],
+                                 options['min_time'], options['repeat'],
+                                 progress if options['verbosity'] > 1 else None)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=1)
+        else:
+            self.stdout.write(json.dumps(results, indent=1))
+        if baseline is not None:
+            try:
+                comparisons = compare(baseline, results)
+            except ValueError as exc:
+                raise CommandError(str(exc))
+            slower = [c for c in comparisons if c.ratio >= options['threshold']]
+            for c in slower:
+                self.stderr.write(f'{c.benchmark} {c.shape} {c.size} B: {c.baseline * 1000:.3f} ms -> '
+                                  f'{c.current * 1000:.3f} ms ({c.ratio:.2f}x)')
+            if slower:
+                raise CommandError(f"{len(slower)} of {len(comparisons)} cases are at least "
+                                   f"{options['threshold']}x slower than {options['compare']}.")
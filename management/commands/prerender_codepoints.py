@@ -0,0 +1,33 @@
+"""Management command: pre-render every codepoint page to static HTML."""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+
+from decode.prerender import build
+
+
+class Command(BaseCommand):
+    help = (
+        'Pre-render codepoint pages for every assigned code point into a static '
+        'directory, with a manifest and sitemap. Unchanged pages are skipped.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('output_dir', help='Directory to write the static pages to.')
+        parser.add_argument('--base-url', required=True,
+                            help='Absolute site URL for the sitemap (e.g. https://example.com).')
+        parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1,
+                            help='Worker processes (default: number of CPUs).')
+        parser.add_argument('--force', action='store_true',
+                            help='Re-render all pages, even if unchanged.')
+
+    def handle(self, *args, **options):
+        if options['jobs'] < 1:
+            raise CommandError('--jobs must be positive.')
+        with ProcessPoolExecutor(max_workers=options['jobs'], initializer=django.setup) as executor:
+            counts = build(options['output_dir'], options['base_url'],
+                           executor=executor, force=options['force'])
+        self.stdout.write(f"Rendered {counts['rendered']} pages, {counts['unchanged']} unchanged.")
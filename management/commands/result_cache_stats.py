@@ -0,0 +1,21 @@
+"""Management command: show (and optionally reset) decode result cache hit-rate metrics."""
+
+from django.core.management.base import BaseCommand
+
+from decode import result_cache
+
+
+class Command(BaseCommand):
+    help = 'Show hits, misses, rejected stores and hit rate of the shared ?s= result cache.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true', help='Reset the counters after printing them.')
+
+    def handle(self, *args, **options):
+        stats = result_cache.stats()
+        self.stdout.write(
+            f"hits={stats['hits']} misses={stats['misses']} rejected={stats['rejected']} "
+            f"hit_rate={stats['hit_rate']:.1%}"
+        )
+        if options['reset']:
+            result_cache.reset_stats()
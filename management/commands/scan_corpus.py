@@ -0,0 +1,41 @@
+"""Management command: scan text files for invisible characters, homoglyphs and normalization."""
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+
+from decode.scanner import DEFAULT_CHUNK_SIZE, scan_file
+
+
+class Command(BaseCommand):
+    help = (
+        'Scan UTF-8 text files with the decode page checks (invisible characters, '
+        'homoglyphs, normalization) and write findings as JSON lines.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='+', help='Files to scan.')
+        parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1,
+                            help='Worker processes (default: number of CPUs).')
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                            help='Target chunk size in bytes (default: %(default)s).')
+        parser.add_argument('--output', help='Write JSON lines to this file instead of stdout.')
+
+    def handle(self, *args, **options):
+        if options['jobs'] < 1 or options['chunk_size'] < 1:
+            raise CommandError('--jobs and --chunk-size must be positive.')
+        for path in options['paths']:
+            if not os.path.isfile(path):
+                raise CommandError(f'Not a file: {path}')
+        out = open(options['output'], 'w', encoding='utf-8') if options['output'] else self.stdout
+        try:
+            with ProcessPoolExecutor(max_workers=options['jobs']) as executor:
+                for path in options['paths']:
+                    for record in scan_file(path, options['chunk_size'], executor):
+                        out.write(json.dumps(record, ensure_ascii=False) + '\n')
+                    out.flush()
+        finally:
+            if out is not self.stdout:
+                out.close()
@@ -11,6 +11,19 @@ bidi = {
     'CS': 'COMMON SEPARATOR',
     'NSM': 'NONSPACING MARK',
     'BN': 'BOUNDARY NEUTRAL',
+    'B': 'PARAGRAPH SEPARATOR',
+    'S': 'SEGMENT SEPARATOR',
+    'WS': 'WHITESPACE',
+    'ON': 'OTHER NEUTRALS',
+    'LRE': 'LEFT-TO-RIGHT EMBEDDING',
+    'LRO': 'LEFT-TO-RIGHT OVERRIDE',
+    'RLE': 'RIGHT-TO-LEFT EMBEDDING',
+    'RLO': 'RIGHT-TO-LEFT OVERRIDE',
+    'PDF': 'POP DIRECTIONAL FORMAT',
+    'LRI': 'LEFT-TO-RIGHT ISOLATE',
+    'RLI': 'RIGHT-TO-LEFT ISOLATE',
+    'FSI': 'FIRST STRONG ISOLATE',
+    'PDI': 'POP DIRECTIONAL ISOLATE',
 }
 
 category = {
@@ -56,108 +69,202 @@ east_asian_categories = {
     'N': 'Non East Asian',
 }
 
-# Unicode Script property short code -> display name (for homoglyph / lookalike detection).
+# Unicode Script property short name -> display name (the long name with spaces),
+# as used in ScriptExtensions.txt (PropertyValueAliases.txt, sc).
 script_display = {
-    'Common': 'Common',
-    'Inherited': 'Inherited',
-    'Unknown': 'Unknown',
-    'Latn': 'Latin',
-    'Cyrl': 'Cyrillic',
+    'Adlm': 'Adlam',
+    'Aghb': 'Caucasian Albanian',
+    'Ahom': 'Ahom',
     'Arab': 'Arabic',
+    'Armi': 'Imperial Aramaic',
+    'Armn': 'Armenian',
+    'Avst': 'Avestan',
+    'Bali': 'Balinese',
+    'Bamu': 'Bamum',
+    'Bass': 'Bassa Vah',
+    'Batk': 'Batak',
+    'Beng': 'Bengali',
+    'Berf': 'Beria Erfe',
+    'Bhks': 'Bhaiksuki',
+    'Bopo': 'Bopomofo',
+    'Brah': 'Brahmi',
+    'Brai': 'Braille',
+    'Bugi': 'Buginese',
+    'Buhd': 'Buhid',
+    'Cakm': 'Chakma',
+    'Cans': 'Canadian Aboriginal',
+    'Cari': 'Carian',
+    'Cham': 'Cham',
+    'Cher': 'Cherokee',
+    'Chrs': 'Chorasmian',
+    'Copt': 'Coptic',
+    'Cpmn': 'Cypro Minoan',
+    'Cprt': 'Cypriot',
+    'Cyrl': 'Cyrillic',
+    'Deva': 'Devanagari',
+    'Diak': 'Dives Akuru',
+    'Dogr': 'Dogra',
+    'Dsrt': 'Deseret',
+    'Dupl': 'Duployan',
+    'Egyp': 'Egyptian Hieroglyphs',
+    'Elba': 'Elbasan',
+    'Elym': 'Elymaic',
+    'Ethi': 'Ethiopic',
+    'Gara': 'Garay',
+    'Geor': 'Georgian',
+    'Glag': 'Glagolitic',
+    'Gong': 'Gunjala Gondi',
+    'Gonm': 'Masaram Gondi',
+    'Goth': 'Gothic',
+    'Gran': 'Grantha',
     'Grek': 'Greek',
-    'Hebr': 'Hebrew',
+    'Gujr': 'Gujarati',
+    'Gukh': 'Gurung Khema',
+    'Guru': 'Gurmukhi',
+    'Hang': 'Hangul',
     'Hani': 'Han',
+    'Hano': 'Hanunoo',
+    'Hatr': 'Hatran',
+    'Hebr': 'Hebrew',
     'Hira': 'Hiragana',
+    'Hluw': 'Anatolian Hieroglyphs',
+    'Hmng': 'Pahawh Hmong',
+    'Hmnp': 'Nyiakeng Puachue Hmong',
+    'Hrkt': 'Katakana Or Hiragana',
+    'Hung': 'Old Hungarian',
+    'Ital': 'Old Italic',
+    'Java': 'Javanese',
+    'Jurc': 'Jurchen',
+    'Kali': 'Kayah Li',
     'Kana': 'Katakana',
-    'Hang': 'Hangul',
-    'Deva': 'Devanagari',
-    'Thai': 'Thai',
-    'Beng': 'Bengali',
-    'Taml': 'Tamil',
-    'Telu': 'Telugu',
-    'Gujr': 'Gujarati',
+    'Kawi': 'Kawi',
+    'Khar': 'Kharoshthi',
+    'Khmr': 'Khmer',
+    'Khoj': 'Khojki',
+    'Kits': 'Khitan Small Script',
     'Knda': 'Kannada',
+    'Krai': 'Kirat Rai',
+    'Kthi': 'Kaithi',
+    'Lana': 'Tai Tham',
+    'Laoo': 'Lao',
+    'Latn': 'Latin',
+    'Lepc': 'Lepcha',
+    'Limb': 'Limbu',
+    'Lina': 'Linear A',
+    'Linb': 'Linear B',
+    'Lisu': 'Lisu',
+    'Lyci': 'Lycian',
+    'Lydi': 'Lydian',
+    'Mahj': 'Mahajani',
+    'Maka': 'Makasar',
+    'Mand': 'Mandaic',
+    'Mani': 'Manichaean',
+    'Marc': 'Marchen',
+    'Medf': 'Medefaidrin',
+    'Mend': 'Mende Kikakui',
+    'Merc': 'Meroitic Cursive',
+    'Mero': 'Meroitic Hieroglyphs',
     'Mlym': 'Malayalam',
+    'Modi': 'Modi',
+    'Mong': 'Mongolian',
+    'Mroo': 'Mro',
+    'Mtei': 'Meetei Mayek',
+    'Mult': 'Multani',
     'Mymr': 'Myanmar',
-    'Khmr': 'Khmer',
-    'Laoo': 'Lao',
-    'Tibt': 'Tibetan',
-    'Geor': 'Georgian',
-    'Armn': 'Armenian',
-    'Thaa': 'Thaana',
-    'Syrc': 'Syriac',
-    'Copt': 'Coptic',
-    'Brai': 'Braille',
-    'Phag': 'Phags-Pa',
+    'Nagm': 'Nag Mundari',
+    'Nand': 'Nandinagari',
+    'Narb': 'Old North Arabian',
+    'Nbat': 'Nabataean',
+    'Newa': 'Newa',
     'Nkoo': 'Nko',
+    'Nshu': 'Nushu',
+    'Ogam': 'Ogham',
+    'Olck': 'Ol Chiki',
+    'Onao': 'Ol Onal',
+    'Orkh': 'Old Turkic',
+    'Orya': 'Oriya',
+    'Osge': 'Osage',
+    'Osma': 'Osmanya',
+    'Ougr': 'Old Uyghur',
+    'Palm': 'Palmyrene',
+    'Pauc': 'Pau Cin Hau',
+    'Pcun': 'Proto Cuneiform',
+    'Perm': 'Old Permic',
+    'Phag': 'Phags Pa',
+    'Phli': 'Inscriptional Pahlavi',
+    'Phlp': 'Psalter Pahlavi',
+    'Phnx': 'Phoenician',
+    'Plrd': 'Miao',
+    'Prti': 'Inscriptional Parthian',
+    'Rjng': 'Rejang',
+    'Rohg': 'Hanifi Rohingya',
+    'Runr': 'Runic',
+    'Samr': 'Samaritan',
+    'Sarb': 'Old South Arabian',
+    'Saur': 'Saurashtra',
+    'Seal': 'Seal',
+    'Sgnw': 'SignWriting',
+    'Shaw': 'Shavian',
+    'Shrd': 'Sharada',
+    'Sidd': 'Siddham',
+    'Sidt': 'Sidetic',
+    'Sind': 'Khudawadi',
+    'Sinh': 'Sinhala',
+    'Sogd': 'Sogdian',
+    'Sogo': 'Old Sogdian',
+    'Sora': 'Sora Sompeng',
+    'Soyo': 'Soyombo',
+    'Sund': 'Sundanese',
+    'Sunu': 'Sunuwar',
+    'Sylo': 'Syloti Nagri',
+    'Syrc': 'Syriac',
+    'Tagb': 'Tagbanwa',
+    'Takr': 'Takri',
+    'Tale': 'Tai Le',
+    'Talu': 'New Tai Lue',
+    'Taml': 'Tamil',
+    'Tang': 'Tangut',
+    'Tavt': 'Tai Viet',
+    'Tayo': 'Tai Yo',
+    'Telu': 'Telugu',
+    'Tfng': 'Tifinagh',
+    'Tglg': 'Tagalog',
+    'Thaa': 'Thaana',
+    'Thai': 'Thai',
+    'Tibt': 'Tibetan',
+    'Tirh': 'Tirhuta',
+    'Tnsa': 'Tangsa',
+    'Todr': 'Todhri',
+    'Tols': 'Tolong Siki',
+    'Toto': 'Toto',
+    'Tutg': 'Tulu Tigalari',
+    'Ugar': 'Ugaritic',
+    'Vaii': 'Vai',
+    'Vith': 'Vithkuqi',
+    'Wara': 'Warang Citi',
+    'Wcho': 'Wancho',
+    'Xpeo': 'Old Persian',
+    'Xsux': 'Cuneiform',
+    'Yezi': 'Yezidi',
+    'Yiii': 'Yi',
+    'Zanb': 'Zanabazar Square',
+    'Zinh': 'Inherited',
+    'Zyyy': 'Common',
+    'Zzzz': 'Unknown',
 }
 
-# Character name prefix (first word of Unicode name) -> display name when ud.script is unavailable.
-name_prefix_to_script = {
-    'LATIN': 'Latin',
-    'CYRILLIC': 'Cyrillic',
-    'ARABIC': 'Arabic',
-    'GREEK': 'Greek',
-    'HEBREW': 'Hebrew',
-    'HAN': 'Han',
-    'CJK': 'Han',
-    'HIRAGANA': 'Hiragana',
-    'KATAKANA': 'Katakana',
-    'HANGUL': 'Hangul',
-    'DEVANAGARI': 'Devanagari',
-    'THAI': 'Thai',
-    'BENGALI': 'Bengali',
-    'TAMIL': 'Tamil',
-    'TELUGU': 'Telugu',
-    'GUJARATI': 'Gujarati',
-    'KANNADA': 'Kannada',
-    'MALAYALAM': 'Malayalam',
-    'MYANMAR': 'Myanmar',
-    'KHMER': 'Khmer',
-    'LAO': 'Lao',
-    'TIBETAN': 'Tibetan',
-    'GEORGIAN': 'Georgian',
-    'ARMENIAN': 'Armenian',
-    'THAANA': 'Thaana',
-    'SYRIAC': 'Syriac',
-    'COPTIC': 'Coptic',
-    'BRAILLE': 'Braille',
-    'PHAGS-PA': 'Phags-Pa',
-    'NKO': 'Nko',
-    'COMBINING': 'Inherited',
-}
-
-# Code points commonly used in homoglyph/spoofing attacks (look like Latin letters or digits).
-# Cyrillic, Greek, and fullwidth ASCII variants that can deceive in domains, usernames, etc.
-# See Unicode confusables (UTR 39) and homograph attack documentation.
-HOMOGLYPH_CODEPOINTS = frozenset({
-    # Cyrillic small (look like Latin a, e, o, p, c, y, x, etc.)
-    0x0430, 0x0435, 0x043E, 0x0440, 0x0441, 0x0443, 0x0445, 0x0438, 0x043D, 0x0432,
-    0x043A, 0x043C, 0x043F, 0x0442, 0x0444, 0x0433, 0x0436, 0x0431, 0x0439, 0x0437,
-    0x0434, 0x043B, 0x044C, 0x044F, 0x0447, 0x0448, 0x0449, 0x044B, 0x044D, 0x044E,
-    0x044A, 0x0454, 0x0456, 0x0457, 0x0491, 0x0455, 0x0475, 0x0458,  # ѕ, ѵ, ј
-    # Cyrillic capital (look like Latin A, B, E, K, M, H, O, P, C, T, Y, X, etc.)
-    0x0410, 0x0412, 0x0415, 0x041A, 0x041C, 0x041D, 0x041E, 0x041F, 0x0420, 0x0421,
-    0x0422, 0x0423, 0x0425, 0x0413, 0x0417, 0x0411, 0x0418, 0x0414, 0x041B, 0x0424,
-    0x0427, 0x0428, 0x0429, 0x042B, 0x042D, 0x042E, 0x042F, 0x0404, 0x0406, 0x0407,
-    # Greek small (α, β, ε, ο, etc. look like Latin)
-    0x03B1, 0x03B2, 0x03B5, 0x03B7, 0x03B9, 0x03BA, 0x03BC, 0x03BD, 0x03BF, 0x03C0,
-    0x03C1, 0x03C2, 0x03C3, 0x03C4, 0x03C5, 0x03C6, 0x03C7, 0x03C8, 0x03B4, 0x03B8,
-    0x03BB, 0x03BE, 0x03B6,
-    # Greek capital (Α, Β, Ε, etc.)
-    0x0391, 0x0392, 0x0395, 0x0396, 0x0397, 0x0399, 0x039A, 0x039C, 0x039D, 0x039F,
-    0x03A0, 0x03A1, 0x03A4, 0x03A5, 0x03A7, 0x0393, 0x0394, 0x0398, 0x039B, 0x039E,
-    0x03A3, 0x03A6, 0x03A8, 0x03A9,
-})
-# Fullwidth ASCII (U+FF01..U+FF5E): often used in spoofing; checked by range in is_homoglyph_codepoint.
-
-
-def is_homoglyph_codepoint(cp: int) -> bool:
-    """True if code point is in curated homoglyph set (Cyrillic/Greek/fullwidth lookalikes)."""
-    if 0xFF01 <= cp <= 0xFF5E:  # Fullwidth ASCII
-        return True
-    return cp in HOMOGLYPH_CODEPOINTS
+# Scripts whose characters are used with every script (UTS #39 section 5.1).
+neutral_scripts = frozenset({'Common', 'Inherited'})
 
+# UTS #39 augmented script sets: characters of these scripts also belong to
+# the writing systems that mix them (Japanese, Korean, Han with Bopomofo).
+script_augmentation = {
+    'Han': ('Han with Bopomofo', 'Japanese', 'Korean'),
+    'Hiragana': ('Japanese',),
+    'Katakana': ('Japanese',),
+    'Hangul': ('Korean',),
+    'Bopomofo': ('Han with Bopomofo',),
+}
 
 # Invisible / zero-width characters: codepoint -> short label for UI.
 INVISIBLE_CHARACTERS = {
@@ -176,6 +283,10 @@ INVISIBLE_CHARACTERS = {
     0x2062: 'Invisible times',
     0x2063: 'Invisible separator',
     0x2064: 'Invisible plus',
+    0x2066: 'Left-to-right isolate',
+    0x2067: 'Right-to-left isolate',
+    0x2068: 'First strong isolate',
+    0x2069: 'Pop directional isolate',
     0xFEFF: 'Zero-width no-break space (BOM)',
     0x034F: 'Combining grapheme joiner',
     0x180E: 'Mongolian vowel separator',
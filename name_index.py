@@ -0,0 +1,267 @@
+"""Search over character names and formal name aliases.
+
+The index is built once per process (on first use, about a second) from
+every ud.name() value and the NameAliases.txt aliases, in code point order,
+and kept in a few compact structures instead of per-name Python objects:
+
+- all names in one newline-separated string, with an ``array`` of start
+  offsets, and the entries sorted by name as an ``array`` (prefix search
+  is a bisection);
+- an inverted word index: the sorted vocabulary in one string (with an
+  ``array`` of offsets), and for each word a posting list of entry numbers
+  stored back to back in one ``array``. Multi-word queries walk the
+  shortest posting list and bisect the others; substring queries search
+  the vocabulary (under a megabyte) and merge the matching words' lists,
+  falling back to a str.find over all names for very common substrings.
+
+All candidates come out in result order, so queries stop after the first
+page of results instead of collecting every match.
+"""
+
+import heapq
+from array import array
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+import unicodedata2 as ud
+
+import decode.unicode_util as u
+
+# Search modes: whole words (all must occur), name prefix, or any substring.
+SEARCH_MODES = ('word', 'prefix', 'substring')
+# Default maximum number of results per query.
+SEARCH_LIMIT = 100
+# Substrings found in more vocabulary words, or more names, than these are
+# searched by scanning all names instead of merging the words' posting lists.
+_SUBSTRING_MAX_WORDS = 64
+_SUBSTRING_MAX_POSTINGS = 4096
+
+
+class NameMatch(NamedTuple):
+    """A code point found by name, with the name or alias that matched."""
+
+    code_point: int
+    name: str
+
+
+def normalize_query(query: str) -> str:
+    """Uppercase the query, treat '_' as a space and collapse whitespace."""
+    return u._alias_key(query)
+
+
+def _all_names() -> Iterator[Tuple[int, str]]:
+    """Yield (code point, name) for every name and alias, in code point order.
+
+    Only code points with a script other than Unknown (i.e. assigned ones,
+    per Scripts.txt) can have a name, so the unassigned planes are skipped.
+    """
+    aliases = u.alias.entries
+    starts, scripts = u._script_ranges()
+    for start, end, script in zip(starts, [*starts[1:], u.MAX_CODEPOINT + 1], scripts):
+        if script == 'Unknown':
+            continue
+        for cp in range(start, end):
+            name = ud.name(chr(cp), None)
+            if name:
+                yield cp, name
+            for entry in aliases.get(cp, ()):
+                yield cp, entry.alias
+
+
+def _bisect_left(key: Callable[[int], str], n: int, target: str) -> int:
+    """First index in range(n) whose key is not less than target (keys sorted)."""
+    lo, hi = 0, n
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if key(mid) < target:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+class NameIndex:
+    """Prefix, word and substring search over a fixed set of names."""
+
+    def __init__(self, entries: Iterable[Tuple[int, str]]) -> None:
+        """Index (code point, name) entries; a code point may have several names.
+
+        Args:
+            entries: Names (uppercase, as in the UCD) with their code points,
+                in code point order.
+        """
+        codepoints = array('I')
+        offsets = array('I', [0])
+        names: List[str] = []
+        postings_by_word: Dict[str, List[int]] = {}
+        for entry, (cp, name) in enumerate(entries):
+            codepoints.append(cp)
+            names.append(name)
+            offsets.append(offsets[-1] + len(name) + 1)
+            for word in set(name.replace('-', ' ').split()):
+                postings_by_word.setdefault(word, []).append(entry)
+        self.codepoints: array = codepoints
+        self.offsets: array = offsets
+        self.names: str = '\n'.join(names) + '\n'
+        self.by_name: array = array('I', sorted(range(len(names)), key=names.__getitem__))
+        words = sorted(postings_by_word)
+        postings = array('I')
+        posting_offsets = array('I', [0])
+        word_starts = array('I', [0])
+        for word in words:
+            postings.extend(postings_by_word[word])
+            posting_offsets.append(len(postings))
+            word_starts.append(word_starts[-1] + len(word) + 1)
+        self.postings: array = postings
+        self.posting_offsets: array = posting_offsets
+        self.vocabulary: str = '\n'.join(words) + '\n'
+        self.word_starts: array = word_starts
+
+    def __len__(self) -> int:
+        return len(self.codepoints)
+
+    def name(self, entry: int) -> str:
+        """Return the name of an entry."""
+        return self.names[self.offsets[entry]:self.offsets[entry + 1] - 1]
+
+    def word(self, word_id: int) -> str:
+        """Return a word of the vocabulary."""
+        return self.vocabulary[self.word_starts[word_id]:self.word_starts[word_id + 1] - 1]
+
+    def _word_entries(self, word: str) -> range:
+        """Positions in self.postings of the entries that contain word as a whole word."""
+        i = _bisect_left(self.word, len(self.word_starts) - 1, word)
+        if i < len(self.word_starts) - 1 and self.word(i) == word:
+            return range(self.posting_offsets[i], self.posting_offsets[i + 1])
+        return range(0)
+
+    def _all_words_entries(self, words: List[str]) -> Iterator[int]:
+        """Entries containing every word, in entry order (intersected lazily); none for no words."""
+        if not words:
+            return
+        postings = self.postings
+        ranges = sorted(map(self._word_entries, dict.fromkeys(words)), key=len)
+        for i in ranges[0]:
+            entry = postings[i]
+            for other in ranges[1:]:
+                j = bisect_left(postings, entry, other.start, other.stop)
+                if j == other.stop or postings[j] != entry:
+                    break
+            else:
+                yield entry
+
+    def _scan_entries(self, query: str) -> Iterator[int]:
+        """Entries whose name contains query, in entry order (one str.find per hit)."""
+        names, offsets = self.names, self.offsets
+        pos = names.find(query)
+        while pos != -1:
+            entry = bisect_right(offsets, pos) - 1
+            yield entry
+            pos = names.find(query, offsets[entry + 1])
+
+    def _words_containing(self, fragment: str) -> Optional[List[int]]:
+        """Ids of the vocabulary words containing fragment, or None if there are too many."""
+        vocabulary, word_starts = self.vocabulary, self.word_starts
+        word_ids: List[int] = []
+        pos = vocabulary.find(fragment)
+        while pos != -1:
+            if len(word_ids) == _SUBSTRING_MAX_WORDS:
+                return None
+            word_id = bisect_right(word_starts, pos) - 1
+            word_ids.append(word_id)
+            pos = vocabulary.find(fragment, word_starts[word_id + 1])
+        return word_ids
+
+    def _substring_entries(self, query: str) -> Iterator[int]:
+        """Entries whose name contains query, in entry order.
+
+        Each part of the query between spaces and hyphens is looked up in the
+        vocabulary, and the posting lists of the words containing the
+        rarest part are merged and checked. If every part is common (found
+        in many words, or many names), the names themselves are scanned,
+        which then finds a page of hits quickly.
+        """
+        offsets = self.posting_offsets
+        best: Optional[Tuple[int, str, List[int]]] = None
+        for fragment in dict.fromkeys(query.replace('-', ' ').split()):
+            word_ids = self._words_containing(fragment)
+            if word_ids is not None:
+                size = sum(offsets[i + 1] - offsets[i] for i in word_ids)
+                if best is None or size < best[0]:
+                    best = (size, fragment, word_ids)
+        if best is None or best[0] > _SUBSTRING_MAX_POSTINGS:
+            yield from self._scan_entries(query)
+            return
+        _, fragment, word_ids = best
+        last = -1
+        for entry in heapq.merge(*(self.postings[offsets[i]:offsets[i + 1]] for i in word_ids)):
+            if entry != last and (query == fragment or query in self.name(entry)):
+                yield entry
+            last = entry
+
+    def _prefix_entries(self, prefix: str) -> Iterator[int]:
+        """Entries whose name starts with prefix, in name order."""
+        by_name = self.by_name
+        lo = _bisect_left(lambda i: self.name(by_name[i]), len(by_name), prefix)
+        for i in range(lo, len(by_name)):
+            entry = by_name[i]
+            if not self.name(entry).startswith(prefix):
+                return
+            yield entry
+
+    def _matches(self, entries: Iterable[int], limit: int) -> List[NameMatch]:
+        """The first limit distinct code points of entries, with the matching name."""
+        matches: List[NameMatch] = []
+        seen = set()
+        for entry in entries:
+            cp = self.codepoints[entry]
+            if cp not in seen:
+                seen.add(cp)
+                matches.append(NameMatch(cp, self.name(entry)))
+                if len(matches) == limit:
+                    break
+        return matches
+
+    def search(self, query: str, mode: str = 'word', limit: int = SEARCH_LIMIT) -> List[NameMatch]:
+        """Find characters by name or alias.
+
+        Candidates are produced lazily and in result order, so a query
+        stops as soon as limit code points are found.
+
+        Args:
+            query: Text to look for; case, '_' and extra whitespace are ignored.
+            mode: 'word' (every query word is a whole word of the name),
+                'prefix' (the name starts with the query) or 'substring'.
+            limit: Maximum number of results.
+
+        Returns:
+            Up to limit NameMatch, one per code point: by code point for
+            word and substring searches, by name for prefix searches.
+
+        Raises:
+            ValueError: If mode is not one of SEARCH_MODES.
+        """
+        if mode not in SEARCH_MODES:
+            raise ValueError(f'unknown search mode {mode!r}')
+        query = normalize_query(query)
+        if not query:
+            return []
+        if mode == 'prefix':
+            entries = self._prefix_entries(query)
+        elif mode == 'word':
+            entries = self._all_words_entries(query.replace('-', ' ').split())
+        else:
+            entries = self._substring_entries(query)
+        return self._matches(entries, limit)
+
+
+@lru_cache(maxsize=None)
+def name_index() -> NameIndex:
+    """The process-wide index over all character names and aliases (built on first use)."""
+    return NameIndex(_all_names())
+
+
+def search(query: str, mode: str = 'word', limit: int = SEARCH_LIMIT) -> List[NameMatch]:
+    """Search the process-wide name index (see NameIndex.search)."""
+    return name_index().search(query, mode, limit)
@@ -0,0 +1,156 @@
+"""Static pre-rendering of codepoint pages.
+
+Every /codepoint/<slug> page depends only on its code point, the Unicode data
+version and the template (see views.codepoint_etag), so the whole set can be
+rendered ahead of time and served as static files. Pages are written to
+codepoint/<slug>.html under the output directory, next to a manifest.json that
+records each page's ETag and content hash, and a sitemap index. Rebuilding
+only re-renders pages whose ETag differs from the manifest.
+"""
+
+import hashlib
+import json
+import os
+from concurrent.futures import Executor
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from xml.sax.saxutils import escape
+
+from django.http import HttpRequest
+
+import unicodedata2 as ud
+
+from decode import views
+import decode.unicode_util as u
+
+MANIFEST_NAME = 'manifest.json'
+SITEMAP_NAME = 'sitemap.xml'
+# Sitemaps may list at most 50,000 URLs each; larger sets go through an index.
+SITEMAP_MAX_URLS = 50000
+# Pages rendered per worker task.
+RENDER_BATCH_SIZE = 1000
+
+# Unassigned, surrogate and private-use code points have no page of their own
+# worth serving statically; Django still renders them on demand.
+_SKIPPED_CATEGORIES = frozenset({'Cn', 'Cs', 'Co'})
+
+
+def codepoint_slugs() -> List[str]:
+    """Slugs of every assigned code point, plus code points that only have aliases.
+
+    Returns:
+        Upper-case hex slugs as used by the codepoint URL (e.g. '0041').
+    """
+    aliased = u.alias.entries.keys()
+    return [f'{cp:04X}' for cp in range(u.MAX_CODEPOINT + 1)
+            if ud.category(chr(cp)) not in _SKIPPED_CATEGORIES or cp in aliased]
+
+
+def page_path(slug: str) -> str:
+    """Path of a pre-rendered page relative to the output directory."""
+    return f'codepoint/{slug}.html'
+
+
+def render_page(slug: str) -> bytes:
+    """Render a codepoint page exactly as the codepoint view serves it."""
+    request = HttpRequest()
+    request.method = 'GET'
+    return views.codepoint(request, slug).content
+
+
+def _render_batch(args: Tuple[str, List[str]]) -> List[Tuple[str, str]]:
+    """Render and write a batch of pages (runs in a worker process)."""
+    output_dir, slugs = args
+    written = []
+    for slug in slugs:
+        content = render_page(slug)
+        with open(os.path.join(output_dir, page_path(slug)), 'wb') as f:
+            f.write(content)
+        written.append((slug, hashlib.sha256(content).hexdigest()))
+    return written
+
+
+def load_manifest(output_dir: str) -> Dict[str, Any]:
+    """Load the manifest of a previous build, or an empty one."""
+    try:
+        with open(os.path.join(output_dir, MANIFEST_NAME), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {'pages': {}}
+
+
+def write_sitemaps(output_dir: str, base_url: str, slugs: List[str]) -> List[str]:
+    """Write sitemap files for slugs and the sitemap index that lists them.
+
+    Args:
+        output_dir: Build output directory.
+        base_url: Absolute site URL the pages are served under (no trailing slash).
+        slugs: Page slugs to list.
+
+    Returns:
+        Names of the files written, index first.
+    """
+    names = []
+    for number, start in enumerate(range(0, len(slugs), SITEMAP_MAX_URLS), 1):
+        name = f'sitemap-codepoints-{number}.xml'
+        with open(os.path.join(output_dir, name), 'w', encoding='utf-8') as f:
+            f.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                    '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n')
+            for slug in slugs[start:start + SITEMAP_MAX_URLS]:
+                f.write(f'<url><loc>{escape(base_url)}/codepoint/{slug}</loc></url>\n')
+            f.write('</urlset>\n')
+        names.append(name)
+    with open(os.path.join(output_dir, SITEMAP_NAME), 'w', encoding='utf-8') as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n')
+        for name in names:
+            f.write(f'<sitemap><loc>{escape(base_url)}/{name}</loc></sitemap>\n')
+        f.write('</sitemapindex>\n')
+    return [SITEMAP_NAME] + names
+
+
+def build(output_dir: str, base_url: str, slugs: Optional[Iterable[str]] = None,
+          executor: Optional[Executor] = None, force: bool = False) -> Dict[str, int]:
+    """Pre-render codepoint pages into output_dir, skipping unchanged ones.
+
+    Args:
+        output_dir: Directory to write pages, manifest and sitemaps to.
+        base_url: Absolute site URL used in the sitemaps.
+        slugs: Slugs to render (default: codepoint_slugs()).
+        executor: Executor to render batches with (e.g. a ProcessPoolExecutor);
+            pages are rendered in this process if None.
+        force: Re-render every page even if its ETag is unchanged.
+
+    Returns:
+        Counts of 'rendered' and 'unchanged' pages.
+    """
+    slugs = list(codepoint_slugs() if slugs is None else slugs)
+    base_url = base_url.rstrip('/')
+    os.makedirs(os.path.join(output_dir, 'codepoint'), exist_ok=True)
+    previous = load_manifest(output_dir)['pages']
+    pages: Dict[str, Dict[str, str]] = {}
+    pending = []
+    for slug in slugs:
+        etag = views.codepoint_etag(None, slug)
+        entry = previous.get(slug)
+        if (not force and entry is not None and entry['etag'] == etag
+                and os.path.exists(os.path.join(output_dir, page_path(slug)))):
+            pages[slug] = entry
+        else:
+            pages[slug] = {'etag': etag, 'path': page_path(slug)}
+            pending.append(slug)
+    tasks = [(output_dir, pending[i:i + RENDER_BATCH_SIZE]) for i in range(0, len(pending), RENDER_BATCH_SIZE)]
+    results = executor.map(_render_batch, tasks) if executor is not None else map(_render_batch, tasks)
+    for written in results:
+        for slug, digest in written:
+            pages[slug]['sha256'] = digest
+    manifest = {
+        'unidata_version': ud.unidata_version,
+        'template_version': views.CODEPOINT_TEMPLATE_VERSION,
+        'pages': pages,
+    }
+    manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+    with open(manifest_path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(manifest_path + '.tmp', manifest_path)
+    write_sitemaps(output_dir, base_url, slugs)
+    return {'rendered': len(pending), 'unchanged': len(slugs) - len(pending)}
@@ -0,0 +1,93 @@
+"""Shared cache of rendered decode results.
+
+Shared /?s= links are opened by many people with the same text. The rendered
+_decode_results.html fragment depends only on the text, the Unicode data
+version and the templates, so it is stored in Django's cache framework under a
+hash of those and reused across requests and worker processes.
+
+The 'decode-results' cache is used if settings.CACHES defines one (so results
+can get their own size bound), otherwise the default cache. Entries expire
+after RESULT_CACHE_TIMEOUT; beyond that, eviction is the backend's (LRU for
+locmem and memcached, or Redis with an allkeys-lru policy).
+"""
+
+import hashlib
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+
+import unicodedata2 as ud
+
+RESULT_CACHE_ALIAS = 'decode-results'
+# Seconds a rendered result is kept.
+RESULT_CACHE_TIMEOUT = 60 * 60 * 24
+# Inputs longer than this (in characters) are never cached.
+RESULT_CACHE_MAX_CHARS = 2000
+# Rendered fragments larger than this (in UTF-8 bytes) are not stored.
+RESULT_CACHE_MAX_BYTES = 256 * 1024
+# Bump when _decode_results.html (or anything it includes) changes.
+RESULT_CACHE_VERSION = 10
+
+STAT_NAMES = ('hits', 'misses', 'rejected')
+
+
+def _cache():
+    alias = RESULT_CACHE_ALIAS if RESULT_CACHE_ALIAS in settings.CACHES else DEFAULT_CACHE_ALIAS
+    return caches[alias]
+
+
+def _count(stat: str) -> None:
+    """Increment a hit/miss/rejected counter shared by all processes using the cache."""
+    cache, key = _cache(), f'decode-results-stats:{stat}'
+    cache.add(key, 0, None)
+    try:
+        cache.incr(key)
+    except ValueError:  # evicted between add and incr
+        cache.set(key, 1, None)
+
+
+def result_key(text: str) -> str:
+    """Cache key for the rendered results of text."""
+    digest = hashlib.sha256(text.encode('utf-8', 'surrogatepass')).hexdigest()
+    return f'decode-results:{RESULT_CACHE_VERSION}:{ud.unidata_version}:{digest}'
+
+
+def admits(text: str) -> bool:
+    """Whether results for text may be cached at all (size-aware admission)."""
+    return len(text) <= RESULT_CACHE_MAX_CHARS
+
+
+def get(text: str) -> Optional[str]:
+    """Return the cached results fragment for text, or None, counting a hit or miss."""
+    html = _cache().get(result_key(text))
+    _count('hits' if html is not None else 'misses')
+    return html
+
+
+def store(text: str, html: str) -> bool:
+    """Cache the results fragment for text unless it is too large.
+
+    Returns:
+        True if the fragment was stored.
+    """
+    if len(html.encode('utf-8')) > RESULT_CACHE_MAX_BYTES:
+        _count('rejected')
+        return False
+    _cache().set(result_key(text), html, RESULT_CACHE_TIMEOUT)
+    return True
+
+
+def stats() -> Dict[str, float]:
+    """Return the hit, miss and rejected counts and the hit rate (0.0 when unused)."""
+    keys = {f'decode-results-stats:{stat}': stat for stat in STAT_NAMES}
+    values = _cache().get_many(keys)
+    counts: Dict[str, float] = {stat: values.get(key, 0) for key, stat in keys.items()}
+    lookups = counts['hits'] + counts['misses']
+    counts['hit_rate'] = counts['hits'] / lookups if lookups else 0.0
+    return counts
+
+
+def reset_stats() -> None:
+    """Reset the hit/miss/rejected counters."""
+    _cache().delete_many([f'decode-results-stats:{stat}' for stat in STAT_NAMES])
@@ -0,0 +1,118 @@
+"""Fast rendering of character table rows.
+
+Produces exactly the markup of templates/decode/_decode_rows.html (which
+remains the reference the tests compare against) without the template loop.
+A row depends only on its character, so each distinct character's row is
+built once -- escaped, with the codepoint URL resolved from a prefix looked
+up once per render -- and cached; rendering a text is then a single join.
+Ranges of code points (block pages) are rendered the same way from the
+precomputed codepoint table, without going through the caches.
+"""
+
+from functools import lru_cache
+
+from django.urls import reverse
+from django.utils.html import escape
+
+import decode.unicode_util as u
+
+# Distinct characters whose row HTML is kept (matches the CharacterInfo cache).
+ROW_CACHE_SIZE = u.CHARACTER_CACHE_SIZE
+
+# The template's {% for %} body, split around the per-row values; the loop
+# tags' own lines contribute ROWS_HEAD before and ROWS_TAIL after all rows.
+ROWS_HEAD = '        '
+ROWS_TAIL = '\n'
+_ROW = (
+    '\n            <tr data-char="{char}" title="Click to copy character">\n'
+    '                <td data-label="Character">{char}</td>\n'
+    '                <td data-label="Name"><a href="{url}" class="green-text text-darken-2">{name}</a></td>\n'
+    '                <td data-label="Script">{script}</td>\n'
+    '                <td data-label="Confusable with">{confusable_with}</td>\n'
+    '                <td data-label="Invisible">{invisible}</td>\n'
+    '                <td data-label="Category">{category}</td>\n'
+    '                <td data-label="Integer">{ordinal}</td>\n'
+    '                <td data-label="Code Point">{code_point}</td>\n'
+    '                <td data-label="UTF-8">{utf8_bytes}</td>\n'
+    '                <td data-label="HTML">{html_entity}</td>\n'
+    '            </tr>\n'
+    '        '
+)
+
+
+def _default(value) -> str:
+    """Escaped value, or 'N/A' if it is falsy (the template's |default:"N/A")."""
+    return escape(value) if value else 'N/A'
+
+
+def _format_row(info: u.CharacterInfo, url_prefix: str) -> str:
+    """Row HTML for one character's CharacterInfo.
+
+    Surrogate code points cannot be encoded in a page, so their character
+    cells are left empty.
+    """
+    char = '' if 0xD800 <= info.ordinal <= 0xDFFF else escape(info.char)
+    if info.invisible:
+        invisible = f'<span class="red-text text-darken-2" title="{escape(info.invisible)}">⚠</span>'
+    else:
+        invisible = '—'
+    return _ROW.format(
+        char=char,
+        url=escape(url_prefix + info.hex_code),
+        name=_default(info.name),
+        script=_default(info.script),
+        confusable_with=escape(info.confusable_with) if info.confusable_with else '—',
+        invisible=invisible,
+        category=_default(info.category),
+        ordinal=_default(info.ordinal),
+        code_point=_default(info.code_point),
+        utf8_bytes=_default(info.utf8_bytes),
+        html_entity=_default(info.html_entity),
+    )
+
+
+@lru_cache(maxsize=ROW_CACHE_SIZE)
+def _row_html(char: str, url_prefix: str, unidata_version: str) -> str:
+    """Row HTML for one character (unidata_version keys the cache like get_character_info)."""
+    return _format_row(u.get_character_info(char), url_prefix)
+
+
+def codepoint_url_prefix() -> str:
+    """URL of the codepoint page without the slug (honours the current script prefix)."""
+    return reverse('codepoint', kwargs={'slug': '0'})[:-1]
+
+
+def render_rows(text: str) -> str:
+    """Render the character table rows for text, as _decode_rows.html would.
+
+    Args:
+        text: Characters to render, one row each.
+
+    Returns:
+        Row HTML (safe to insert unescaped).
+    """
+    prefix = codepoint_url_prefix()
+    version = u.ud.unidata_version
+    return ROWS_HEAD + ''.join([_row_html(char, prefix, version) for char in text]) + ROWS_TAIL
+
+
+def render_codepoint_rows(codepoints: range) -> str:
+    """Render one row per code point of a range (for block and range pages).
+
+    Rows are built from u.iter_character_info and not cached: a page of a
+    block is rendered once and then cached as a whole by HTTP caches, and
+    browsing a plane would otherwise evict the rows of decoded text.
+
+    Args:
+        codepoints: Code points in U+0000..U+10FFFF.
+
+    Returns:
+        Row HTML (safe to insert unescaped).
+    """
+    prefix = codepoint_url_prefix()
+    return ROWS_HEAD + ''.join([_format_row(info, prefix) for info in u.iter_character_info(codepoints)]) + ROWS_TAIL
+
+
+def clear_row_cache() -> None:
+    """Drop all cached row HTML (e.g. after changing the URL configuration)."""
+    _row_html.cache_clear()
@@ -0,0 +1,206 @@
+"""Text sanitizing with configurable policies and an edit log.
+
+Each combination of policies is compiled once into a str.translate table
+(characters to delete or map) and C-level regexes that locate the
+characters it touches, so cleaning a text is one translate over it plus one
+regex scan per policy; Python-level work is proportional to the number of
+edits, not to the length of the text. NFKC is applied last; text already in
+NFKC costs one C-level normalization, and otherwise only the spans that can
+change (see unicode_util._quick_check_tables) are normalized for the log.
+
+Every edit is logged with its offsets in the input (in code points). Edits
+are sorted and never overlap, so applying them to the input yields the
+output.
+"""
+
+import heapq
+import re
+from bisect import bisect_right
+from functools import lru_cache
+from itertools import filterfalse
+from operator import attrgetter
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+import unicodedata2 as ud
+
+from decode.mappings import INVISIBLE_CHARACTERS
+import decode.unicode_util as u
+
+# Policies, in the order they are applied:
+# - strip_invisible: delete INVISIBLE_CHARACTERS (including every bidi control);
+# - fullwidth_to_ascii: map fullwidth forms U+FF01..U+FF5E and the
+#   ideographic space U+3000 to ASCII;
+# - unbalanced_bidi: delete unterminated and unmatched bidi controls
+#   (u.bidi_control_issues), keeping balanced ones;
+# - nfkc: normalize to NFKC.
+SANITIZE_POLICIES = ('strip_invisible', 'fullwidth_to_ascii', 'unbalanced_bidi', 'nfkc')
+
+FULLWIDTH_TO_ASCII: Dict[int, str] = {cp: chr(cp - 0xFEE0) for cp in range(0xFF01, 0xFF5F)}
+FULLWIDTH_TO_ASCII[0x3000] = ' '
+
+
+class Edit(NamedTuple):
+    """One change: input[start:end] (original) was replaced by replacement."""
+
+    start: int
+    end: int
+    original: str
+    replacement: str
+    policy: str
+
+
+class SanitizeResult(NamedTuple):
+    """Cleaned text and the edits that produced it, in input order."""
+
+    text: str
+    edits: List[Edit]
+
+
+class _Sanitizer(NamedTuple):
+    """A compiled policy combination."""
+
+    table: Dict[int, Optional[str]]
+    # (policy, pattern matching runs of the characters the policy translates)
+    patterns: Tuple[Tuple[str, 're.Pattern'], ...]
+    unbalanced_bidi: bool
+    nfkc: Optional['re.Pattern']
+
+
+@lru_cache(maxsize=None)
+def _compile(policies: Tuple[str, ...]) -> _Sanitizer:
+    """Build the translate table and patterns for a combination of policies."""
+    table: Dict[int, Optional[str]] = {}
+    patterns = []
+    if 'strip_invisible' in policies:
+        table.update(dict.fromkeys(INVISIBLE_CHARACTERS))
+        patterns.append(('strip_invisible', re.compile(f'[{u.character_class(INVISIBLE_CHARACTERS)}]+')))
+    if 'fullwidth_to_ascii' in policies:
+        table.update(FULLWIDTH_TO_ASCII)
+        patterns.append(('fullwidth_to_ascii', re.compile(f'[{u.character_class(FULLWIDTH_TO_ASCII)}]+')))
+    nfkc = None
+    if 'nfkc' in policies:
+        unstable = sorted(map(ord, u._quick_check_tables()[u.NormalizationForm.NFKC].unstable))
+        bmp = [cp for cp in unstable if cp <= 0xFFFF]
+        astral = [cp for cp in unstable if cp > 0xFFFF]
+        # re checks BMP classes with a bitmap but scans astral ranges one by
+        # one, so astral ranges are only tried on astral characters.
+        nfkc = re.compile(f'(?:[{u.character_class(bmp)}]'
+                          f'|(?=[\U00010000-\U0010FFFF])[{u.character_class(astral)}])+')
+    # Stripping invisibles already removes every bidi control.
+    unbalanced_bidi = 'unbalanced_bidi' in policies and 'strip_invisible' not in policies
+    return _Sanitizer(table, tuple(patterns), unbalanced_bidi, nfkc)
+
+
+def _policy_edits(text: str, policy: str, pattern: 're.Pattern', table: Dict[int, Optional[str]]) -> Iterator[Edit]:
+    """One edit per character of text that a translate policy changes, in order."""
+    for run in pattern.finditer(text):
+        for pos, char in enumerate(run.group(), run.start()):
+            yield Edit(pos, pos + 1, char, table[ord(char)] or '', policy)
+
+
+def _translation_edits(text: str, sanitizer: _Sanitizer) -> Iterator[Edit]:
+    """Edits of the translate table and bidi policies, one per character, in order."""
+    streams = [_policy_edits(text, policy, pattern, sanitizer.table) for policy, pattern in sanitizer.patterns]
+    if sanitizer.unbalanced_bidi:
+        streams.append(Edit(issue.start, issue.start + 1, text[issue.start], '', 'unbalanced_bidi')
+                       for issue in u.bidi_control_issues(text))
+    return heapq.merge(*streams, key=attrgetter('start'))
+
+
+def _nfkc_edits(text: str, cleaned: str, deleted: List[int], pattern: 're.Pattern') -> Iterator[Edit]:
+    """NFKC edits of cleaned, with offsets mapped back to text.
+
+    Only runs of characters that are not NFKC boundaries can change, together
+    with the character before each run (which they may compose with).
+    cleaned is text with the characters at the sorted positions deleted
+    removed and others replaced one for one, so position i of cleaned is
+    position i + bisect_right(shifts, i) of text, with shifts[j] = deleted[j] - j.
+    The caller has checked that cleaned is not in NFKC; should the runs not
+    account for that, one edit covers the whole span that differs.
+    """
+    shifts = [position - j for j, position in enumerate(deleted)]
+
+    def original_position(i: int) -> int:
+        return i + bisect_right(shifts, i)
+
+    found = False
+    for run in pattern.finditer(cleaned):
+        start, end = max(run.start() - 1, 0), run.end()
+        segment = cleaned[start:end]
+        normalized = ud.normalize('NFKC', segment)
+        if start < run.start() and normalized[:1] == segment[0]:
+            # The character before the run came through unchanged.
+            start, segment, normalized = start + 1, segment[1:], normalized[1:]
+        if normalized != segment:
+            found = True
+            first, last = original_position(start), original_position(end - 1) + 1
+            yield Edit(first, last, text[first:last], normalized, 'nfkc')
+    if not found:
+        normalized = ud.normalize('NFKC', cleaned)
+        start = 0
+        while start < len(cleaned) - 1 and start < len(normalized) and cleaned[start] == normalized[start]:
+            start += 1
+        end, tail = len(cleaned), len(normalized)
+        while end > start + 1 and tail > start and cleaned[end - 1] == normalized[tail - 1]:
+            end, tail = end - 1, tail - 1
+        first, last = original_position(start), original_position(end - 1) + 1
+        yield Edit(first, last, text[first:last], normalized[start:tail], 'nfkc')
+
+
+def _merge_nfkc(edits: List[Edit], nfkc_edits: List[Edit]) -> List[Edit]:
+    """Merge sorted edits with NFKC edits, dropping those an NFKC edit covers."""
+    starts = [edit.start for edit in nfkc_edits]
+
+    def covered(edit: Edit) -> bool:
+        i = bisect_right(starts, edit.start) - 1
+        return i >= 0 and edit.start < nfkc_edits[i].end
+
+    return list(heapq.merge(filterfalse(covered, edits), nfkc_edits, key=attrgetter('start')))
+
+
+def _coalesce(edits: Iterable[Edit]) -> List[Edit]:
+    """Join adjacent edits of the same policy into one."""
+    merged: List[Edit] = []
+    for edit in edits:
+        if merged and merged[-1].end == edit.start and merged[-1].policy == edit.policy:
+            previous = merged[-1]
+            merged[-1] = Edit(previous.start, edit.end, previous.original + edit.original,
+                              previous.replacement + edit.replacement, edit.policy)
+        else:
+            merged.append(edit)
+    return merged
+
+
+def sanitize(text: str, policies: Iterable[str] = SANITIZE_POLICIES) -> SanitizeResult:
+    """Clean text by the given policies and log every change.
+
+    Args:
+        text: Text to clean.
+        policies: Names from SANITIZE_POLICIES (applied in that order,
+            whatever order they are given in).
+
+    Returns:
+        SanitizeResult with the cleaned text and the edits, with offsets in
+        code points of text. Where NFKC rewrites characters another policy
+        already changed, one 'nfkc' edit covers both.
+
+    Raises:
+        ValueError: If a policy is unknown.
+    """
+    unknown = set(policies) - set(SANITIZE_POLICIES)
+    if unknown:
+        raise ValueError(f'unknown policies: {", ".join(sorted(unknown))}')
+    if text.isascii():
+        return SanitizeResult(text, [])
+    sanitizer = _compile(tuple(p for p in SANITIZE_POLICIES if p in policies))
+    edits = list(_translation_edits(text, sanitizer))
+    cleaned = text.translate(sanitizer.table) if edits else text
+    if sanitizer.unbalanced_bidi and edits:
+        # translate maps one for one here, so the controls' offsets still hold.
+        removed = [edit.start for edit in edits if edit.policy == 'unbalanced_bidi']
+        cleaned = ''.join(cleaned[start + 1:end] for start, end in zip([-1, *removed], [*removed, len(cleaned)]))
+    if sanitizer.nfkc is not None and ud.normalize('NFKC', cleaned) != cleaned:
+        deleted = [edit.start for edit in edits if not edit.replacement]
+        edits = _merge_nfkc(edits, list(_nfkc_edits(text, cleaned, deleted, sanitizer.nfkc)))
+        cleaned = ud.normalize('NFKC', cleaned)
+    return SanitizeResult(cleaned, _coalesce(edits))
@@ -0,0 +1,244 @@
+"""Offline corpus scanning.
+
+Runs the checks behind the decode page -- invisible characters, homoglyphs,
+mixed-script words, unbalanced bidi controls (Trojan Source) and
+normalization status -- over large UTF-8 files.
+Files are memory-mapped and split into chunks that never cut a UTF-8
+sequence (preferably at line ends); chunks are decoded and scanned in worker
+processes, and the findings are merged back in file order with byte and
+line offsets.
+"""
+
+import heapq
+import mmap
+import os
+import re
+from concurrent.futures import Executor
+from functools import lru_cache
+from operator import itemgetter
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from decode.confusables import confusable_codepoints, confusable_with
+from decode.mappings import INVISIBLE_CHARACTERS
+import decode.unicode_util as u
+
+# Target size of one chunk in bytes (chunks end at the next line break).
+DEFAULT_CHUNK_SIZE: int = 8 * 1024 * 1024
+# Bytes a chunk may be extended by to end at whitespace instead of inside a word.
+WORD_WINDOW: int = 4096
+_ASCII_WHITESPACE = re.compile(rb'[ \t\n\r\f\v]')
+# UTF-8 of u._BIDI_CONTROL_PATTERN and u._PARAGRAPH_SEPARATOR_PATTERN.
+_BIDI_CONTROL_BYTES = re.compile(rb'\xe2\x80[\xaa-\xae]|\xe2\x81[\xa6-\xa9]')
+_PARAGRAPH_SEPARATOR_BYTES = re.compile(rb'[\n\r\x1c-\x1e]|\xc2\x85|\xe2\x80\xa9')
+
+
+# Invisible characters, homoglyphs (non-ASCII confusables), and the lone
+# surrogates U+DC80..U+DCFF that surrogateescape uses for invalid bytes.
+_FINDING_PATTERN = re.compile('[{}{}\uDC80-\uDCFF]'.format(
+    u.character_class(INVISIBLE_CHARACTERS),
+    u.character_class(confusable_codepoints()),
+))
+
+
+class ChunkResult(NamedTuple):
+    """Findings of one chunk, with lines and columns relative to the chunk.
+
+    trailing_columns is the number of code points after the chunk's last
+    line break (or in the whole chunk if it has none).
+    """
+
+    findings: List[Dict[str, Any]]
+    newlines: int
+    trailing_columns: int
+    normalization: Dict[str, bool]
+
+
+@lru_cache(maxsize=None)
+def _normalization_boundary_pattern() -> re.Pattern:
+    """Characters that start a normalization segment in every form.
+
+    They have combining class 0 and quick-check Yes for NFC, NFD, NFKC and
+    NFKD (u._quick_check_tables), so nothing before them can reorder or
+    compose with them. Lone surrogates (undecodable bytes) are excluded.
+    """
+    unstable = frozenset().union(*(table.unstable for table in u._quick_check_tables().values()))
+    return re.compile(f'[^{u.character_class(map(ord, unstable))}\uD800-\uDFFF]')
+
+
+def _next_normalization_boundary(data: bytes, pos: int) -> int:
+    """Byte offset of the first normalization boundary character at or after pos, or len(data)."""
+    size = len(data)
+    pattern = _normalization_boundary_pattern()
+    while pos < size:
+        while pos < size and data[pos] & 0xC0 == 0x80:
+            pos += 1
+        window = bytes(data[pos:pos + WORD_WINDOW])
+        text = window.decode('utf-8', 'surrogateescape')
+        match = pattern.search(text)
+        if match:
+            return pos + len(text[:match.start()].encode('utf-8', 'surrogateescape'))
+        pos += len(window)
+    return size
+
+
+def _bidi_controls_open(data: bytes, start: int, end: int) -> bool:
+    """Whether a bidi control opened in data[start:end] is still open at end.
+
+    start must be a point where none is open (a chunk start).
+    """
+    if not _BIDI_CONTROL_BYTES.search(data, start, end):
+        return False
+    text = bytes(data[start:end]).decode('utf-8', 'surrogateescape')
+    return any(issue.issue == 'unterminated' and issue.end == len(text) for issue in u.bidi_control_issues(text))
+
+
+def chunk_boundaries(data: bytes, chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[Tuple[int, int]]:
+    """Split data into (start, end) byte ranges of roughly chunk_size bytes.
+
+    Each chunk ends just after a line break when one follows within another
+    chunk_size bytes, otherwise after ASCII whitespace within a larger window
+    (so words, and with them mixed-script findings, stay whole), otherwise
+    before the next character that starts a normalization segment in every
+    form (see _normalization_boundary_pattern), however far that is. No chunk
+    splits a character, and since line breaks, ASCII whitespace and those
+    characters never combine with what precedes them, per-chunk
+    normalization results hold for the whole file. A chunk that would end
+    inside a paragraph with a bidi control still open runs on to the next
+    paragraph separator instead, so bidi findings do not depend on the
+    chunk size either.
+
+    Args:
+        data: File contents (bytes or mmap).
+        chunk_size: Target chunk size in bytes.
+
+    Returns:
+        Consecutive ranges covering data.
+    """
+    size = len(data)
+    ranges: List[Tuple[int, int]] = []
+    start = 0
+    while start < size:
+        end = start + chunk_size
+        if end >= size:
+            end = size
+        else:
+            limit = min(end + chunk_size, size)
+            newline = data.find(b'\n', end, limit)
+            space = None
+            if newline == -1:
+                space = _ASCII_WHITESPACE.search(data, end, min(end + max(chunk_size, WORD_WINDOW), size))
+            if newline != -1:
+                end = newline + 1
+            elif space:
+                end = space.end()
+            else:
+                end = _next_normalization_boundary(data, end)
+            if newline == -1 and _bidi_controls_open(data, start, end):
+                separator = _PARAGRAPH_SEPARATOR_BYTES.search(data, end)
+                end = separator.end() if separator else size
+        ranges.append((start, end))
+        start = end
+    return ranges
+
+
+def scan_text(text: str, base_offset: int = 0) -> ChunkResult:
+    """Scan decoded text (invalid bytes as surrogateescape) for findings.
+
+    Args:
+        text: Text to scan.
+        base_offset: Byte offset of text within its file.
+
+    Returns:
+        ChunkResult; each finding has type, byte offset, 0-based line within
+        text and 1-based column (in code points). Mixed-script words are
+        reported at their first character; unterminated or unmatched bidi
+        controls as 'bidi' findings (after the control's 'invisible' one).
+    """
+    findings: List[Dict[str, Any]] = []
+    line = 0
+    line_start = 0
+    byte = base_offset
+    last = 0
+    analysis = u.examen_unicode(text)
+    matches = ((match.start(), match) for match in _FINDING_PATTERN.finditer(text))
+    tokens = ((token.start, token) for token in analysis.mixed_script_tokens())
+    bidi_issues = ((issue.start, issue) for issue in analysis.bidi_issues())
+    for pos, item in heapq.merge(matches, tokens, bidi_issues, key=itemgetter(0)):
+        newlines = text.count('\n', last, pos)
+        if newlines:
+            line += newlines
+            line_start = text.rindex('\n', last, pos) + 1
+        byte += len(text[last:pos].encode('utf-8', 'surrogateescape'))
+        last = pos
+        finding: Dict[str, Any] = {'byte': byte, 'line': line, 'column': pos - line_start + 1}
+        findings.append(finding)
+        if isinstance(item, u.MixedScriptToken):
+            finding.update(type='mixed_script', token=item.token, scripts=list(item.scripts))
+            continue
+        if isinstance(item, u.BidiIssue):
+            finding.update(type='bidi', control=item.control, issue=item.issue)
+            continue
+        char = item.group()
+        cp = ord(char)
+        if 0xDC80 <= cp <= 0xDCFF:
+            finding.update(type='invalid_utf8', value=f'0x{cp - 0xDC00:02X}')
+        else:
+            finding.update(code_point=u.get_code_point(char), name=u.get_name(char))
+            if cp in INVISIBLE_CHARACTERS:
+                finding.update(type='invisible', label=INVISIBLE_CHARACTERS[cp])
+            else:
+                finding.update(type='homoglyph', script=u.get_script(char),
+                               confusable_with=confusable_with(char))
+    normalization = {form.value: value for form, value in u.get_normalization_form(text).items()}
+    return ChunkResult(findings, text.count('\n'), len(text) - text.rfind('\n') - 1, normalization)
+
+
+def scan_chunk(path: str, start: int, end: int) -> ChunkResult:
+    """Memory-map path and scan the bytes [start, end) (runs in a worker process)."""
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        text = data[start:end].decode('utf-8', 'surrogateescape')
+    return scan_text(text, start)
+
+
+def _scan_chunk_args(args: Tuple[str, int, int]) -> ChunkResult:
+    return scan_chunk(*args)
+
+
+def scan_file(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE,
+              executor: Optional[Executor] = None) -> Iterator[Dict[str, Any]]:
+    """Scan one file, yielding findings in file order and then a file record.
+
+    Args:
+        path: Path of a UTF-8 text file.
+        chunk_size: Target chunk size in bytes.
+        executor: Executor to scan chunks with (e.g. a ProcessPoolExecutor);
+            chunks are scanned in this process if None.
+
+    Yields:
+        Finding dicts (type, path, byte, 1-based line and column, ...),
+        followed by {"type": "file", path, bytes, lines, normalization}.
+    """
+    size = os.path.getsize(path)
+    ranges: List[Tuple[int, int]] = []
+    partial_last_line = False
+    if size:
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            ranges = chunk_boundaries(data, chunk_size)
+            partial_last_line = data[size - 1] != 0x0A
+    tasks = [(path, start, end) for start, end in ranges]
+    results = executor.map(_scan_chunk_args, tasks) if executor is not None else map(_scan_chunk_args, tasks)
+    lines = 0
+    columns = 0  # code points already seen on the current line in earlier chunks
+    normalization = {form.value: True for form in u.NormalizationForm}
+    for result in results:
+        for finding in result.findings:
+            if not finding['line']:
+                finding['column'] += columns
+            finding['line'] += lines + 1
+            yield dict(finding, path=path)
+        lines += result.newlines
+        columns = result.trailing_columns + (0 if result.newlines else columns)
+        for form, value in result.normalization.items():
+            normalization[form] = normalization[form] and value
+    yield {'type': 'file', 'path': path, 'bytes': size, 'lines': lines + partial_last_line,
+           'normalization': normalization}
@@ -85,4 +85,86 @@ describe('decode-live', function() {
     await flushPromises();
     expect(container.innerHTML).toBe('SECOND_RESULT');
   });
+  describe('delta updates', function() {
+    var FULL_HTML = [
+      '<div class="section" id="decode-summary">S1</div>',
+      '<table id="codepoint-details-table"><tbody>',
+      '<tr data-char="a"></tr><tr data-char="b"></tr>',
+      '</tbody></table>',
+      '<div class="section" id="decode-normalization">N1</div>',
+    ].join('');
+
+    function fullResponse(revision) {
+      return {
+        ok: true,
+        headers: { get: function(name) { return name === 'X-Decode-Revision' ? revision : null; } },
+        text: function() { return Promise.resolve(FULL_HTML); }
+      };
+    }
+
+    async function typeText(textarea, value) {
+      textarea.value = value;
+      textarea.dispatchEvent(new Event('input', { bubbles: true }));
+      await new Promise(function(resolve) { setTimeout(resolve, 380); });
+      await flushPromises();
+    }
+
+    beforeEach(function() {
+      document.querySelector('form').setAttribute('data-live-url', '/live');
+    });
+
+    it('sends only the edit after the first result', async function() {
+      var fetchMock = jest.fn()
+        .mockResolvedValueOnce(fullResponse('rev1'))
+        .mockResolvedValueOnce({
+          ok: true,
+          json: function() {
+            return Promise.resolve({
+              revision: 'rev2',
+              start: 1,
+              deleted: 0,
+              rows: '<tr data-char="X"></tr>',
+              summary: '<div class="section" id="decode-summary">S2</div>',
+              normalization: '<div class="section" id="decode-normalization">N2</div>',
+            });
+          }
+        });
+      global.fetch = fetchMock;
+      require('../decode-live.js');
+
+      var textarea = document.getElementById('textarea1');
+      await typeText(textarea, 'ab');
+      await typeText(textarea, 'aXb');
+
+      expect(fetchMock).toHaveBeenCalledTimes(2);
+      var call = fetchMock.mock.calls[1];
+      expect(call[0]).toBe('/live');
+      expect(call[1].body).toContain('revision=rev1&offset=1&deleted=0&inserted=X');
+      var chars = Array.prototype.map.call(
+        document.querySelectorAll('#codepoint-details-table tbody tr'),
+        function(row) { return row.getAttribute('data-char'); }
+      );
+      expect(chars).toEqual(['a', 'X', 'b']);
+      expect(document.getElementById('decode-summary').textContent).toBe('S2');
+      expect(document.getElementById('decode-normalization').textContent).toBe('N2');
+    });
+
+    it('falls back to posting the full text when the revision is unknown', async function() {
+      var fetchMock = jest.fn()
+        .mockResolvedValueOnce(fullResponse('rev1'))
+        .mockResolvedValueOnce({ ok: false, status: 409 })
+        .mockResolvedValueOnce(fullResponse('rev3'));
+      global.fetch = fetchMock;
+      require('../decode-live.js');
+
+      var textarea = document.getElementById('textarea1');
+      await typeText(textarea, 'ab');
+      await typeText(textarea, 'abc');
+      await flushPromises();
+
+      expect(fetchMock).toHaveBeenCalledTimes(3);
+      expect(fetchMock.mock.calls[1][0]).toBe('/live');
+      expect(fetchMock.mock.calls[2][1].body).toContain('text=abc');
+    });
+  });
 });
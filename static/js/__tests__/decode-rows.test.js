@@ -0,0 +1,83 @@
+/**
+ * Unit tests for decode-rows.js: attachRowPager and setRowTotal.
+ * Further table rows are fetched from the rows endpoint and appended.
+ */
+
+const { attachRowPager, setRowTotal } = require('../decode-rows.js');
+
+function flushPromises() {
+  return new Promise(function(resolve) {
+    setTimeout(resolve, 0);
+  });
+}
+
+function setupDom(total, revision) {
+  document.body.innerHTML = [
+    '<table id="codepoint-details-table"><tbody>',
+    '<tr data-char="a"></tr><tr data-char="b"></tr>',
+    '</tbody></table>',
+    '<div id="decode-rows-more" data-rows-url="/rows" data-revision="' + revision + '" data-total="' + total + '">',
+    '<button type="button">Show more characters</button>',
+    '</div>',
+  ].join('');
+}
+
+function tableChars() {
+  return Array.prototype.map.call(
+    document.querySelectorAll('#codepoint-details-table tbody tr'),
+    function(row) { return row.getAttribute('data-char'); }
+  );
+}
+
+describe('attachRowPager', () => {
+  afterEach(() => {
+    document.body.innerHTML = '';
+    delete global.fetch;
+  });
+
+  it('hides the pager when all rows are loaded', () => {
+    setupDom(2, '');
+    global.fetch = jest.fn();
+    attachRowPager();
+    expect(document.getElementById('decode-rows-more').style.display).toBe('none');
+    document.querySelector('#decode-rows-more button').click();
+    expect(global.fetch).not.toHaveBeenCalled();
+  });
+
+  it('appends the next window of rows when the button is clicked', async () => {
+    setupDom(3, 'rev1');
+    global.fetch = jest.fn().mockResolvedValue({
+      ok: true,
+      status: 200,
+      json: function() { return Promise.resolve({ start: 2, rows: '<tr data-char="c"></tr>', total: 3 }); }
+    });
+    attachRowPager();
+    document.querySelector('#decode-rows-more button').click();
+    await flushPromises();
+
+    expect(global.fetch.mock.calls[0][0]).toBe('/rows?revision=rev1&start=2');
+    expect(tableChars()).toEqual(['a', 'b', 'c']);
+    expect(document.getElementById('decode-rows-more').style.display).toBe('none');
+  });
+
+  it('reports an unknown revision and drops windows for an old revision', async () => {
+    setupDom(4, 'rev1');
+    var onStale = jest.fn();
+    global.fetch = jest.fn().mockResolvedValue({ ok: false, status: 409 });
+    attachRowPager({ onStale: onStale });
+    document.querySelector('#decode-rows-more button').click();
+    await flushPromises();
+    expect(onStale).toHaveBeenCalledTimes(1);
+
+    global.fetch = jest.fn().mockResolvedValue({
+      ok: true,
+      status: 200,
+      json: function() { return Promise.resolve({ start: 2, rows: '<tr data-char="c"></tr>', total: 4 }); }
+    });
+    document.querySelector('#decode-rows-more button').click();
+    setRowTotal(5, 'rev2');
+    await flushPromises();
+    expect(tableChars()).toEqual(['a', 'b']);
+    expect(document.getElementById('decode-rows-more').getAttribute('data-total')).toBe('5');
+  });
+});
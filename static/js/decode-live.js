@@ -1,14 +1,26 @@
 /**
  * Decode page: update results as the user types (no Examine button).
  * Debounces input, posts form data, and injects #decode-results-container fragment.
+ *
+ * Once a result is shown, later edits are sent as a delta (UTF-16 offset,
+ * deleted length, inserted text) against the server's revision to the form's
+ * data-live-url; only the changed rows and the summary/normalization sections
+ * come back. Any failure falls back to posting the full text.
+ *
+ * The table is windowed (see decode-rows.js): it holds the first rows of the
+ * text, and deltas only touch rows that are loaded.
  */
 (function() {
   var DEBOUNCE_MS = 350;
   var textarea = document.getElementById('textarea1');
   var container = document.getElementById('decode-results-container');
   var form = textarea && textarea.closest('form');
+  var liveUrl = form && form.getAttribute('data-live-url');
   var latestRequestId = 0;
   var activeController = null;
+  // Text and revision of the results currently shown (null until known).
+  var shownText = null;
+  var shownRevision = null;
 
   if (!textarea || !container) return;
 
@@ -65,56 +77,176 @@
     if (window.decodeClipboard && window.decodeClipboard.attachCopyTableButton) {
       window.decodeClipboard.attachCopyTableButton();
     }
+    attachRowPager();
   }
 
-  function updateResults() {
-    var text = textarea.value;
-    if (!text.length) {
-      container.innerHTML = '';
-      if (window.history && window.history.replaceState) {
-        window.history.replaceState(null, '', window.location.pathname);
+  function attachRowPager() {
+    if (window.decodeRows) {
+      window.decodeRows.attachRowPager({ onStale: function() { requestFull(textarea.value, ++latestRequestId); } });
+    }
+  }
+
+  function isHighSurrogate(code) { return code >= 0xD800 && code <= 0xDBFF; }
+  function isLowSurrogate(code) { return code >= 0xDC00 && code <= 0xDFFF; }
+
+  /**
+   * Smallest single edit turning oldText into newText, in UTF-16 code units,
+   * widened so it never splits a surrogate pair.
+   */
+  function computeEdit(oldText, newText) {
+    var maxPrefix = Math.min(oldText.length, newText.length);
+    var prefix = 0;
+    while (prefix < maxPrefix && oldText.charCodeAt(prefix) === newText.charCodeAt(prefix)) prefix++;
+    if (prefix > 0 && isHighSurrogate(oldText.charCodeAt(prefix - 1))) prefix--;
+    var maxSuffix = maxPrefix - prefix;
+    var suffix = 0;
+    while (suffix < maxSuffix &&
+           oldText.charCodeAt(oldText.length - 1 - suffix) === newText.charCodeAt(newText.length - 1 - suffix)) {
+      suffix++;
+    }
+    if (suffix > 0 && isLowSurrogate(oldText.charCodeAt(oldText.length - suffix))) suffix--;
+    return {
+      offset: prefix,
+      deleted: oldText.length - prefix - suffix,
+      inserted: newText.slice(prefix, newText.length - suffix),
+    };
+  }
+
+  function replaceSection(id, html) {
+    var section = document.getElementById(id);
+    if (section) section.outerHTML = html;
+  }
+
+  /**
+   * Splice changed rows into the table; returns false if there is no table.
+   * The table holds the first rows of the text. Edits past them leave it
+   * alone; when the edit runs past the loaded rows, or not all inserted rows
+   * were sent, rows after the inserted ones are dropped and loaded again
+   * through the pager.
+   */
+  function applyDelta(data) {
+    var tbody = container.querySelector('#codepoint-details-table tbody');
+    if (!tbody) return false;
+    var loaded = tbody.rows.length;
+    if (data.start <= loaded) {
+      var removed = Math.min(data.deleted, loaded - data.start);
+      for (var i = 0; i < removed; i++) tbody.removeChild(tbody.rows[data.start]);
+      var anchor = tbody.rows[data.start] || null;
+      var parsed = document.createElement('tbody');
+      parsed.innerHTML = data.rows;
+      var added = 0;
+      while (parsed.firstElementChild) {
+        tbody.insertBefore(parsed.firstElementChild, anchor);
+        added++;
+      }
+      if (removed < data.deleted || added < data.inserted) {
+        while (tbody.rows.length > data.start + added) tbody.removeChild(tbody.rows[tbody.rows.length - 1]);
       }
-      return;
     }
+    if (window.decodeRows) window.decodeRows.setRowTotal(data.total, data.revision);
+    replaceSection('decode-summary', data.summary);
+    replaceSection('decode-normalization', data.normalization);
+    return true;
+  }
 
-    latestRequestId += 1;
-    var requestId = latestRequestId;
-    if (activeController) activeController.abort();
-    activeController = typeof AbortController !== 'undefined' ? new AbortController() : null;
+  function showResult(text, revision) {
+    shownText = text;
+    shownRevision = revision || null;
+    var newUrl = getDecodeUrlForHistory(text);
+    if (window.history && window.history.replaceState) {
+      window.history.replaceState(null, '', newUrl);
+    }
+  }
 
+  function postForm(url, fields, accept) {
     var csrfInput = form && form.querySelector('input[name="csrfmiddlewaretoken"]');
     var csrfToken = csrfInput ? csrfInput.value : '';
     var body = new URLSearchParams();
-    body.append('text', text);
+    Object.keys(fields).forEach(function(key) { body.append(key, fields[key]); });
     if (csrfToken) body.append('csrfmiddlewaretoken', csrfToken);
-
-    fetch(form ? form.action : window.location.pathname, {
+    return fetch(url, {
       method: 'POST',
       headers: {
-        'Accept': 'text/html',
+        'Accept': accept,
         'Content-Type': 'application/x-www-form-urlencoded; charset=UTF-8',
         'X-Decode-Live': '1',
       },
       body: body.toString(),
       signal: activeController ? activeController.signal : undefined,
-    })
-      .then(function(res) { return res.text(); })
-      .then(function(html) {
+    });
+  }
+
+  function handleError(err) {
+    if (err && err.name === 'AbortError') return;
+    if (typeof M !== 'undefined' && M.toast) {
+      M.toast({ html: 'Could not update results', displayLength: 2000 });
+    }
+  }
+
+  function requestFull(text, requestId) {
+    postForm(form ? form.action : window.location.pathname, { text: text }, 'text/html')
+      .then(function(res) {
+        var revision = res.headers && res.headers.get ? res.headers.get('X-Decode-Revision') : null;
+        return res.text().then(function(html) { return { html: html, revision: revision }; });
+      })
+      .then(function(result) {
         if (requestId !== latestRequestId) return;
-        injectResults(html);
-        var newUrl = getDecodeUrlForHistory(text);
-        if (window.history && window.history.replaceState) {
-          window.history.replaceState(null, '', newUrl);
-        }
+        injectResults(result.html);
+        showResult(text, result.revision);
       })
-      .catch(function(err) {
-        if (err && err.name === 'AbortError') return;
-        if (typeof M !== 'undefined' && M.toast) {
-          M.toast({ html: 'Could not update results', displayLength: 2000 });
+      .catch(handleError);
+  }
+
+  function requestDelta(text, edit, requestId) {
+    postForm(liveUrl, {
+      revision: shownRevision,
+      offset: edit.offset,
+      deleted: edit.deleted,
+      inserted: edit.inserted,
+    }, 'application/json')
+      .then(function(res) {
+        if (!res.ok) return null;
+        return res.json();
+      })
+      .then(function(data) {
+        if (requestId !== latestRequestId) return;
+        if (data && applyDelta(data)) {
+          showResult(text, data.revision);
+        } else {
+          shownRevision = null;
+          requestFull(text, requestId);
         }
-      });
+      })
+      .catch(handleError);
+  }
+
+  function updateResults() {
+    var text = textarea.value;
+    if (!text.length) {
+      container.innerHTML = '';
+      shownText = null;
+      shownRevision = null;
+      if (window.history && window.history.replaceState) {
+        window.history.replaceState(null, '', window.location.pathname);
+      }
+      return;
+    }
+
+    latestRequestId += 1;
+    var requestId = latestRequestId;
+    if (activeController) activeController.abort();
+    activeController = typeof AbortController !== 'undefined' ? new AbortController() : null;
+
+    if (liveUrl && shownRevision && shownText !== null) {
+      if (text === shownText) return;
+      requestDelta(text, computeEdit(shownText, text), requestId);
+    } else {
+      requestFull(text, requestId);
+    }
   }
 
+  attachRowPager();
+
   var debounceTimer;
   textarea.addEventListener('input', function() {
     toggleHomeFeatures();
@@ -0,0 +1,96 @@
+/**
+ * Decode page: windowed Character Details table.
+ * The server renders only the first page of rows; the #decode-rows-more pager carries the
+ * rows URL, the text revision and the total row count. Further rows are fetched from the
+ * rows endpoint and appended when the pager scrolls into view or its button is clicked.
+ * Exposed as window.decodeRows in the browser, or module.exports in Node (for tests).
+ */
+
+/**
+ * Show the pager only while the table holds fewer rows than the text has characters.
+ *
+ * @param {HTMLElement|null} pager - The #decode-rows-more element.
+ */
+function updateRowPager(pager) {
+  var tbody = document.querySelector('#codepoint-details-table tbody');
+  if (!pager || !tbody) return;
+  var total = Number(pager.getAttribute('data-total')) || 0;
+  pager.style.display = tbody.rows.length < total ? '' : 'none';
+}
+
+/**
+ * Record a new text revision and row count on the pager (after a live update).
+ *
+ * @param {number} total - Rows in the new text.
+ * @param {string|null} revision - Revision to load further rows from.
+ */
+function setRowTotal(total, revision) {
+  var pager = document.getElementById('decode-rows-more');
+  if (!pager) return;
+  pager.setAttribute('data-total', String(total));
+  if (revision) pager.setAttribute('data-revision', revision);
+  updateRowPager(pager);
+}
+
+/**
+ * Load further rows when the pager becomes visible or its button is clicked.
+ *
+ * @param {{ onStale: function()|undefined }|undefined} options - onStale is called when the
+ *     server no longer knows the revision (the caller can then reload the results).
+ */
+function attachRowPager(options) {
+  var pager = document.getElementById('decode-rows-more');
+  if (!pager || pager.getAttribute('data-attached')) return;
+  pager.setAttribute('data-attached', '1');
+  var onStale = options && options.onStale;
+  var loading = false;
+  var observer = null;
+
+  function loadMore() {
+    var tbody = document.querySelector('#codepoint-details-table tbody');
+    var revision = pager.getAttribute('data-revision');
+    var total = Number(pager.getAttribute('data-total')) || 0;
+    if (loading || !tbody || !revision || tbody.rows.length >= total) return;
+    loading = true;
+    var start = tbody.rows.length;
+    var url = pager.getAttribute('data-rows-url') +
+      '?revision=' + encodeURIComponent(revision) + '&start=' + start;
+    fetch(url, { headers: { 'Accept': 'application/json' } })
+      .then(function(res) {
+        if (res.status === 409 && onStale) onStale();
+        return res.ok ? res.json() : null;
+      })
+      .then(function(data) {
+        loading = false;
+        // Drop the window if the table changed while it was loading.
+        if (!data || data.start !== tbody.rows.length || pager.getAttribute('data-revision') !== revision) return;
+        var parsed = document.createElement('tbody');
+        parsed.innerHTML = data.rows;
+        while (parsed.firstElementChild) tbody.appendChild(parsed.firstElementChild);
+        updateRowPager(pager);
+        // Re-observe so a pager that is still in view loads the next window.
+        if (observer) {
+          observer.unobserve(pager);
+          observer.observe(pager);
+        }
+      })
+      .catch(function() { loading = false; });
+  }
+
+  var button = pager.querySelector('button');
+  if (button) button.addEventListener('click', loadMore);
+  if (typeof IntersectionObserver !== 'undefined') {
+    observer = new IntersectionObserver(function(entries) {
+      if (entries.some(function(entry) { return entry.isIntersecting; })) loadMore();
+    }, { rootMargin: '800px 0px' });
+    observer.observe(pager);
+  }
+  updateRowPager(pager);
+}
+
+if (typeof window !== 'undefined') {
+  window.decodeRows = { attachRowPager: attachRowPager, setRowTotal: setRowTotal };
+}
+if (typeof module !== 'undefined' && module.exports) {
+  module.exports = { attachRowPager: attachRowPager, setRowTotal: setRowTotal };
+}
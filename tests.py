@@ -1,8 +1,16 @@
 """Backend tests for decode app."""
 
 import dataclasses
+import json
+import os
+import random
+import re
 import sys
+import tempfile
+from collections import Counter
 from copy import copy
+from io import StringIO
+from unittest import mock, skipUnless
 
 # Python 3.14+: fix Django BaseContext.__copy__ (see Django #35844).
 # Remove when upgrading to Django 4.2.16+ or 5.x.
@@ -16,10 +24,14 @@ if sys.version_info >= (3, 14):
         return duplicate
     BaseContext.__copy__ = _base_context_copy_py314
 
+from django.core.management import CommandError, call_command
+from django.template.loader import render_to_string
 from django.test import TestCase, Client
-from django.urls import reverse
+from django.urls import reverse, set_script_prefix
 import unicodedata2 as ud
 import decode.unicode_util as u
+from decode.forms import UnicodeTextForm
+from decode import benchmarks, confusables, mappings, name_index, prerender, row_renderer, sanitize, scanner, views
 
 
 class UnicodeVersionTestCase(TestCase):
@@ -181,6 +193,32 @@ class TestGetScript(TestCase):
         # COMBINING ACUTE ACCENT
         self.assertEqual(u.get_script('\u0301'), 'Inherited')
 
+    def test_scripts_without_name_prefix(self):
+        """Scripts are read from Scripts.txt, not guessed from character names."""
+        self.assertEqual(u.get_script('\u3105'), 'Bopomofo')        # BOPOMOFO LETTER B
+        self.assertEqual(u.get_script('\U0001E900'), 'Adlam')        # ADLAM CAPITAL LETTER ALIF
+        self.assertEqual(u.get_script('\uA840'), 'Phags Pa')
+        self.assertEqual(u.get_script('\u0660'), 'Arabic')           # ARABIC-INDIC DIGIT ZERO
+        self.assertEqual(u.get_script('\u00D7'), 'Common')           # MULTIPLICATION SIGN
+        self.assertEqual(u.get_script('\u0378'), 'Unknown')          # unassigned
+        self.assertEqual(u.get_script('\U0010FFFF'), 'Unknown')
+
+    def test_script_ranges_partition_code_space(self):
+        """The range table starts at U+0000 and has no empty ranges."""
+        starts, names = u._script_ranges()
+        self.assertEqual(starts[0], 0)
+        self.assertEqual(starts, sorted(set(starts)))
+        self.assertEqual(len(starts), len(names))
+
+    def test_script_extensions(self):
+        """Script_Extensions lists every script a shared character is used with."""
+        self.assertEqual(u.get_script_extensions('\u060C'), ('Arabic', 'Garay', 'Nko', 'Hanifi Rohingya',
+                                                             'Syriac', 'Thaana', 'Yezidi'))
+        self.assertIn('Hiragana', u.get_script_extensions('\u3001'))
+        self.assertEqual(u.get_script_extensions('a'), ('Latin',))
+        self.assertEqual(u.get_script_extensions(' '), ('Common',))
+        self.assertEqual(u.get_script_extensions('ab'), ())
+
     def test_returns_none_for_invalid_input(self):
         """Empty or multi-character input returns None."""
         self.assertIsNone(u.get_script(''))
@@ -364,6 +402,58 @@ class TestIsNormalized(TestCase):
         self.assertTrue(u.is_normalized(u.NormalizationForm.NFD, nfd_emoji))
 
 
+class TestQuickCheck(TestCase):
+    """Normalization quick check agrees with comparing against ud.normalize."""
+    CODEPOINTS = [
+        *range(0x0000, 0x3400), *range(0xAC00, 0xAC40), *range(0xF900, 0xFB50),
+        *range(0x1D15E, 0x1D165), *range(0x2F800, 0x2F810),
+    ]
+    CONTEXTS = ('{}', 'e{}', '{}\u0301', 'a{}\u0323\u0301', '\u1100{}', '\uAC00{}x')
+
+    def test_matches_normalize(self):
+        """_quick_check equals (s == normalize(form, s)) for single characters in context."""
+        mismatches = []
+        for cp in self.CODEPOINTS:
+            for context in self.CONTEXTS:
+                text = context.format(chr(cp))
+                for form in u.NormalizationForm:
+                    expected = text == ud.normalize(form.value, text)
+                    if u._quick_check(form, text, set(text)) is not expected:
+                        mismatches.append((hex(cp), context, form.value))
+        self.assertEqual(mismatches, [])
+
+    def test_decomposition_starting_with_maybe(self):
+        """A composite whose decomposition starts with a Maybe character composes with what precedes it."""
+        for text in ('\U00016D67\U00016D68', '\U00016D67\U00016D68a', '\U0001611E\U00016121'):
+            for form in u.NormalizationForm:
+                with self.subTest(text=ascii(text), form=form.value):
+                    expected = text == ud.normalize(form.value, text)
+                    self.assertIs(u._quick_check(form, text, set(text)), expected)
+                    self.assertIs(u.get_normalization_form(text)[form], expected)
+
+    def test_get_normalization_form_with_distinct(self):
+        """Passing the distinct characters gives the same result."""
+        for text in ('abc', 'caf\u00e9', 'cafe\u0301', '\uFB01x', '\u1100\u1161'):
+            with self.subTest(text=repr(text)):
+                self.assertEqual(
+                    u.get_normalization_form(text, u.examen_unicode(text).distinct),
+                    u.get_normalization_form(text),
+                )
+
+    def test_quick_check_tables(self):
+        """Known quick-check values."""
+        tables = u._quick_check_tables()
+        NF = u.NormalizationForm
+        self.assertIn('\u0301', tables[NF.NFC].unstable)   # Maybe (combines)
+        self.assertNotIn('\u0301', tables[NF.NFC].no)
+        self.assertIn('\u0344', tables[NF.NFC].no)         # non-starter decomposition
+        self.assertIn('\u00e9', tables[NF.NFD].no)
+        self.assertNotIn('\uFB01', tables[NF.NFD].no)
+        self.assertIn('\uFB01', tables[NF.NFKD].no)
+        self.assertIn('\uAC00', tables[NF.NFD].no)
+        self.assertIn('\u1161', tables[NF.NFC].unstable)
+
+
 class TestNormalization(TestCase):
     """Normalization form detection."""
     def setUp(self):
@@ -475,6 +565,17 @@ class TestGetDirection(TestCase):
     def test_rtl(self):
         self.assertEqual(u.get_direction('א'), 'RIGHT-TO-LEFT (NON-ARABIC)')
 
+    def test_every_bidi_class_mapped(self):
+        """All 23 bidi classes have a label, including the explicit formatting characters."""
+        self.assertEqual(len(mappings.bidi), 23)
+        self.assertEqual(u.get_direction('\u202E'), 'RIGHT-TO-LEFT OVERRIDE')
+        self.assertEqual(u.get_direction('\u2066'), 'LEFT-TO-RIGHT ISOLATE')
+        self.assertEqual(u.get_direction('\u2069'), 'POP DIRECTIONAL ISOLATE')
+        self.assertEqual(u.get_direction('\n'), 'PARAGRAPH SEPARATOR')
+        self.assertEqual(u.get_direction(' '), 'WHITESPACE')
+        classes = {ud.bidirectional(chr(cp)) for cp in range(u.MAX_CODEPOINT + 1)} - {''}
+        self.assertEqual(classes - set(mappings.bidi), set())
+
     def test_returns_string_or_none(self):
         """get_direction returns str or None."""
         self.assertIsInstance(u.get_direction('A'), str)
@@ -502,16 +603,19 @@ class TestGetEastAsianWidth(TestCase):
 
 
 class TestExamenUnicode(TestCase):
-    """examen_unicode builds per-character CharacterInfo list."""
+    """examen_unicode builds a per-character TextAnalysis."""
     def test_empty_string(self):
-        """Empty string returns empty list."""
-        self.assertEqual(u.examen_unicode(''), [])
+        """Empty string returns an empty analysis."""
+        result = u.examen_unicode('')
+        self.assertIsInstance(result, u.TextAnalysis)
+        self.assertEqual(len(result), 0)
+        self.assertEqual(list(result), [])
 
     def test_single_character(self):
-        """Single character returns one CharacterInfo with all attributes."""
+        """Single character returns one row with all attributes."""
         result = u.examen_unicode('A')
         self.assertEqual(len(result), 1)
-        self.assertIsInstance(result[0], u.CharacterInfo)
+        self.assertIsInstance(result[0], u.CharacterRow)
         self.assertEqual(result[0].char, 'A')
         self.assertEqual(result[0].ordinal, 65)
         self.assertEqual(result[0].code_point, 'U+0041')
@@ -523,7 +627,7 @@ class TestExamenUnicode(TestCase):
         self.assertIsNone(result[0].invisible)
 
     def test_multiple_characters(self):
-        """Multiple characters return one CharacterInfo per character."""
+        """Multiple characters return one row per character."""
         result = u.examen_unicode('Hi')
         self.assertEqual(len(result), 2)
         self.assertEqual(result[0].char, 'H')
@@ -558,6 +662,268 @@ class TestExamenUnicode(TestCase):
         self.assertEqual(result[0].invisible, 'Zero-width space')
 
 
+class TestTextAnalysis(TestCase):
+    """TextAnalysis columns and lazy CharacterRow views."""
+    def test_text_stored_once(self):
+        """The analysis keeps the original text and one column entry per character."""
+        analysis = u.examen_unicode('a😀b')
+        self.assertEqual(analysis.text, 'a😀b')
+        self.assertEqual(list(analysis.codepoints), [0x61, 0x1F600, 0x62])
+        self.assertEqual(len(analysis.category), 3)
+        self.assertEqual(len(analysis.script), 3)
+
+    def test_rows_match_character_info(self):
+        """Row attributes equal the shared CharacterInfo fields."""
+        for row in u.examen_unicode('Ab1 \u0430\u200B\x00😀'):
+            with self.subTest(char=repr(row.char)):
+                self.assertEqual(dataclasses.asdict(row.info), {
+                    f.name: getattr(row, f.name) for f in dataclasses.fields(u.CharacterInfo)
+                })
+
+    def test_indexing(self):
+        """Negative indexes and slices are supported; out of range raises IndexError."""
+        analysis = u.examen_unicode('abc')
+        self.assertEqual(analysis[-1].char, 'c')
+        self.assertEqual([row.char for row in analysis[1:]], ['b', 'c'])
+        with self.assertRaises(IndexError):
+            analysis[3]
+
+    def test_many_distinct_characters(self):
+        """Texts with more than 256 distinct characters build the same columns."""
+        text = ''.join(chr(cp) for cp in range(0x3000, 0x3200))
+        analysis = u.examen_unicode(text)
+        for row in analysis[::37]:
+            with self.subTest(char=repr(row.char)):
+                self.assertEqual(row.category, u.get_category(row.char))
+                self.assertEqual(row.script, u.get_script(row.char))
+                self.assertEqual(row.bidi, u.get_direction(row.char))
+
+    def test_rows_have_no_dict(self):
+        """Rows are __slots__-based views."""
+        row = u.examen_unicode('a')[0]
+        self.assertFalse(hasattr(row, '__dict__'))
+
+    @skipUnless(u.np, 'NumPy is not installed')
+    def test_numpy_engine_matches_python(self):
+        """Both engines build the same columns and summaries, with keys in the same order."""
+        texts = ('', 'x', 'Ab1 \u0430\u200B\x00\U0001F600 e\u0301 \r\n\ud800\u202e',
+                 ''.join(chr(cp) for cp in range(0x2F00, 0x3300, 3)) * 2)
+        for text in texts:
+            with self.subTest(text=text[:10]):
+                python, numpy = u.TextAnalysis(text, 'python'), u.TextAnalysis(text, 'numpy')
+                self.assertEqual(numpy.distinct, python.distinct)
+                for column in ('codepoints', 'category', 'bidi', 'script', 'flags', 'grapheme'):
+                    self.assertEqual(getattr(numpy, column), getattr(python, column))
+                summary = numpy.summarize()
+                self.assertEqual(summary, python.summarize())
+                self.assertEqual(list(summary.counts), list(Counter(text)))
+                self.assertTrue(all(type(n) is int for n in summary.categories.values()))
+
+    def test_engine_selection(self):
+        """examen_unicode picks NumPy for long texts when it is installed."""
+        with mock.patch.object(u, 'NUMPY_MIN_CHARS', 3):
+            self.assertEqual(u.examen_unicode('ab').engine, 'python')
+            self.assertEqual(u.examen_unicode('abc').engine, 'numpy' if u.np else 'python')
+            with mock.patch.object(u, 'np', None):
+                self.assertEqual(u.examen_unicode('abc').engine, 'python')
+                with self.assertRaises(ValueError):
+                    u.examen_unicode('abc', engine='numpy')
+        with self.assertRaises(ValueError):
+            u.TextAnalysis('abc', 'fortran')
+
+
+class TestTextSummary(TestCase):
+    """TextAnalysis.summarize aggregate counts."""
+    CASES = ('', 'a', 'Hello  world', '  lead and trail  ', 'tab\tsep\nline', '😀 é\u0301 Ж',
+             '\u3000wide\u3000space', '\x1c\x1dx')
+
+    def test_counts_match_naive(self):
+        """Counts equal the straightforward str/bytes computations."""
+        for text in self.CASES:
+            with self.subTest(text=repr(text)):
+                summary = u.examen_unicode(text).summarize()
+                self.assertEqual(summary.num_chars, len(text))
+                self.assertEqual(summary.utf8_bytes, len(text.encode('utf-8')))
+                self.assertEqual(summary.utf16_bytes, len(text.encode('utf-16-le')))
+                self.assertEqual(summary.num_tokens, len(text.split()))
+                self.assertEqual(sum(summary.counts.values()), len(text))
+
+    def test_category_and_script_counts(self):
+        """Per-category and per-script counts use the display labels."""
+        summary = u.examen_unicode('ab1 \u0430').summarize()
+        self.assertEqual(summary.categories['LOWERCASE LETTER'], 3)
+        self.assertEqual(summary.categories['DECIMAL NUMBER'], 1)
+        self.assertEqual(summary.scripts, {'Latin': 2, 'Common': 2, 'Cyrillic': 1})
+
+    def test_most_common_ties_in_first_seen_order(self):
+        """most_common breaks ties by first occurrence."""
+        summary = u.examen_unicode('baab c').summarize()
+        self.assertEqual(summary.most_common(3), [('b', 2), ('a', 2), (' ', 1)])
+
+
+class TestMixedScript(TestCase):
+    """Script runs and mixed-script words (UTS #39 resolved script sets)."""
+
+    def test_script_runs(self):
+        """Common and Inherited characters join the run they follow (or the first run)."""
+        analysis = u.examen_unicode('1 p\u0430y \u043c\u0438\u0440!')
+        self.assertEqual(analysis.script_runs(), [(0, 3, 'Latin'), (3, 4, 'Cyrillic'), (4, 6, 'Latin'),
+                                                  (6, 10, 'Cyrillic')])
+        self.assertEqual(u.examen_unicode('1, 2').script_runs(), [(0, 4, 'Common')])
+        self.assertEqual(u.examen_unicode('').script_runs(), [])
+
+    def test_mixed_script_tokens(self):
+        """Words mixing scripts are reported with positions and scripts in order of appearance."""
+        tokens = u.examen_unicode('log in to p\u0430yp\u0430l_com now').mixed_script_tokens()
+        self.assertEqual(tokens, [u.MixedScriptToken(10, 20, 'p\u0430yp\u0430l_com', ('Latin', 'Cyrillic'))])
+
+    def test_single_script_words_not_mixed(self):
+        """Neutral characters, punctuation between words and augmented sets do not count as mixing."""
+        for text in ['hello, \u043c\u0438\u0440', 'abc123', 'e\u0301t\u00e9', '',
+                     '\u6771\u4eac\u30bf\u30ef\u30fc\u306b\u884c\u304f',  # Han + Katakana + Hiragana
+                     '\ud55c\uad6d\uc5b4\u6f22\u5b57']:  # Hangul + Han
+            with self.subTest(text=text):
+                self.assertEqual(u.examen_unicode(text).mixed_script_tokens(), [])
+        self.assertEqual(len(u.examen_unicode('\u3042\ud55c').mixed_script_tokens()), 1)
+
+    def test_script_extensions_restrict_shared_characters(self):
+        """Characters shared by a few scripts only go with those (ARABIC COMMA is not Latin)."""
+        self.assertEqual(u.examen_unicode('\u0628\u0640\u0628').mixed_script_tokens(), [])  # tatweel
+        tokens = u.examen_unicode('ab\u0640c').mixed_script_tokens()
+        self.assertEqual([token.token for token in tokens], ['ab\u0640c'])
+        latin, tatweel = tokens[0].scripts
+        self.assertEqual(latin, 'Latin')
+        self.assertEqual(tatweel, '/'.join(u.get_script_extensions('\u0640')))
+        self.assertIn('Arabic', tatweel.split('/'))
+        self.assertIn('Syriac', tatweel.split('/'))
+
+    def test_summary_includes_mixed_tokens(self):
+        summary = u.examen_unicode('\u0430pple apple').summarize()
+        self.assertEqual([token.token for token in summary.mixed_script_tokens], ['\u0430pple'])
+
+
+class TestGraphemes(TestCase):
+    """Extended grapheme cluster segmentation (UAX #29)."""
+    CASES = [
+        ('', []),
+        ('abc', ['a', 'b', 'c']),
+        ('\r\n\n\r', ['\r\n', '\n', '\r']),
+        ('a\r\nb\r\x00\n', ['a', '\r\n', 'b', '\r', '\x00', '\n']),
+        ('\n\u0301', ['\n', '\u0301']),
+        ('e\u0301\u0302x', ['e\u0301\u0302', 'x']),
+        ('\U0001F468\u200D\U0001F469\u200D\U0001F467!', ['\U0001F468\u200D\U0001F469\u200D\U0001F467', '!']),
+        ('\U0001F44D\U0001F3FD', ['\U0001F44D\U0001F3FD']),
+        ('\U0001F1FA\U0001F1F8\U0001F1E9', ['\U0001F1FA\U0001F1F8', '\U0001F1E9']),
+        ('\u1100\u1161\u11A8\uAC00', ['\u1100\u1161\u11A8', '\uAC00']),
+        ('\u0915\u094D\u0937\u093F', ['\u0915\u094D\u0937\u093F']),  # क्षि (GB9c)
+        ('\u0600\u0661', ['\u0600\u0661']),  # Prepend
+        ('\u0600\n', ['\u0600', '\n']),
+        ('a\u200Db', ['a\u200D', 'b']),  # ZWJ only joins pictographs
+        ('\u0301a', ['\u0301', 'a']),
+    ]
+
+    def test_clusters(self):
+        """graphemes() follows the UAX #29 rules for each case."""
+        for text, clusters in self.CASES:
+            with self.subTest(text=repr(text)):
+                self.assertEqual(list(u.examen_unicode(text).graphemes()), clusters)
+
+    def test_spans_in_long_text(self):
+        """Only multi-codepoint clusters get spans, at the right offsets."""
+        text = 'plain text ' * 100 + 'e\u0301' + ' more' * 100 + '\U0001F1FA\U0001F1F8'
+        analysis = u.examen_unicode(text)
+        start = text.index('e\u0301')
+        self.assertEqual(analysis.grapheme_spans(), [(start, start + 2), (len(text) - 2, len(text))])
+
+    def test_summary_counts_clusters(self):
+        """Summaries count grapheme clusters and the multi-codepoint ones."""
+        text = 'e\u0301 e\u0301 \U0001F1FA\U0001F1F8'
+        summary = u.examen_unicode(text).summarize()
+        self.assertEqual(summary.num_graphemes, 5)
+        self.assertEqual(summary.clusters, {'e\u0301': 2, '\U0001F1FA\U0001F1F8': 1})
+        self.assertEqual(summary.most_common_clusters(1), [('e\u0301', 2)])
+
+    def test_vendored_property_data(self):
+        """The table is loaded from the vendored property files."""
+        table = u.codepoint_table
+        for cp, symbol in ((0x000D, b'r'), (0x200D, b'z'), (0x0301, b'k'), (0x094D, b'l'),
+                           (0x0915, b'C'), (0x1F600, b'g'), (0xAC00, b'A'), (0x0041, b'x')):
+            with self.subTest(cp=hex(cp)):
+                table.ensure(cp)
+                self.assertEqual(bytes([table.grapheme[cp]]), symbol)
+
+
+class TestCodepointTable(TestCase):
+    """Precomputed codepoint_table agrees with the per-character getters."""
+    SAMPLE = 'aZ09 .,€😀\u0301\u0430\u03B1\uFF41\u200B\uFEFF\u0627\u05D0\x00\t\u2166\u00B9\u0967'
+
+    def test_lookup_matches_getters(self):
+        """Each column equals the value returned by the get_* function."""
+        for char in self.SAMPLE:
+            with self.subTest(char=repr(char)):
+                attrs = u.codepoint_table.lookup(ord(char))
+                self.assertEqual(attrs.category, u.get_category(char))
+                self.assertEqual(attrs.bidi, u.get_direction(char))
+                self.assertEqual(attrs.script, u.get_script(char))
+                self.assertEqual(attrs.digit, u.get_digit(char))
+                self.assertEqual(attrs.homoglyph_risk, u.get_homoglyph_risk(char))
+                self.assertEqual(attrs.invisible, u.get_invisible_warning(char))
+
+    def test_blocks_filled_lazily(self):
+        """A fresh table computes only the blocks that are looked up."""
+        table = u.CodepointTable()
+        table.lookup(0x41)
+        self.assertTrue(table._filled[0])
+        self.assertFalse(table._filled[0x10FF])
+
+    def test_covers_whole_code_space(self):
+        """First and last code points can be looked up."""
+        self.assertEqual(u.codepoint_table.lookup(0).category, 'CONTROL')
+        self.assertEqual(u.codepoint_table.lookup(u.MAX_CODEPOINT).category, 'UNASSIGNED')
+
+    def test_examen_unicode_matches_getters(self):
+        """examen_unicode rows agree with the individual getters."""
+        for info in u.examen_unicode(self.SAMPLE):
+            with self.subTest(char=repr(info.char)):
+                self.assertEqual(info.name, u.get_name(info.char))
+                self.assertEqual(info.category, u.get_category(info.char))
+                self.assertEqual(info.bidi, u.get_direction(info.char))
+                self.assertEqual(info.digit, u.get_digit(info.char))
+                self.assertEqual(info.code_point, u.get_code_point(info.char))
+                self.assertEqual(info.hex_code, u.get_code_point(info.char, False))
+                self.assertEqual(info.html_entity, u.get_html_entity(info.char))
+
+
+class TestCharacterCache(TestCase):
+    """examen_unicode computes each distinct character once."""
+    def setUp(self):
+        u.clear_character_cache()
+
+    def test_repeated_characters_share_record(self):
+        """Every position of a character reuses the same CharacterInfo."""
+        result = u.examen_unicode('abab')
+        self.assertIs(result[0].info, result[2].info)
+        self.assertIs(result[1].info, result[3].info)
+        self.assertIsNot(result[0].info, result[1].info)
+
+    def test_counts_distinct_characters(self):
+        """Misses count distinct characters; repeats are hits."""
+        for row in u.examen_unicode('aaaaabbbbb'):
+            row.name
+        info = u.character_cache_info()
+        self.assertEqual((info.hits, info.misses), (8, 2))
+
+    def test_cache_is_bounded(self):
+        """Cache size is capped at CHARACTER_CACHE_SIZE."""
+        self.assertEqual(u.character_cache_info().maxsize, u.CHARACTER_CACHE_SIZE)
+
+    def test_character_info_is_immutable(self):
+        """Shared records cannot be modified."""
+        info = u.examen_unicode('a')[0].info
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            info.name = 'B'
+
+
 class TestAlias(TestCase):
     """Alias lookup from NameAliases.txt."""
     def test_get_aliases_returns_list(self):
@@ -576,13 +942,550 @@ class TestAlias(TestCase):
         self.assertIsInstance(result, str)
         self.assertIn(u.alias.get_alias('x'), (u.get_name('x'), 'UNKNOWN'))
 
+    def test_get_aliases_in_file_order(self):
+        """Multiple aliases are returned in NameAliases.txt order."""
+        self.assertEqual(u.alias.get_aliases('\x00'), ['NULL', 'NUL'])
+        self.assertEqual(u.alias.get_aliases('\uFEFF'), ['BYTE ORDER MARK', 'BOM', 'ZWNBSP'])
+
+    def test_get_aliases_with_digits(self):
+        """Aliases containing digits (e.g. VS1) are found."""
+        self.assertEqual(u.alias.get_aliases('\uFE00'), ['VS1'])
+
+    def test_get_aliases_none(self):
+        """Characters without aliases return an empty list and 'UNKNOWN'."""
+        self.assertEqual(u.alias.get_aliases('A'), [])
+        self.assertEqual(u.alias.get_alias('A'), 'UNKNOWN')
+
+    def test_get_alias_entries_types(self):
+        """get_alias_entries exposes the alias type."""
+        self.assertEqual(
+            u.alias.get_alias_entries('\x80'),
+            (u.NameAlias('PADDING CHARACTER', u.AliasType.FIGMENT),
+             u.NameAlias('PAD', u.AliasType.ABBREVIATION)),
+        )
+        self.assertEqual(u.alias.get_alias_entries('\u01A2')[0].type, u.AliasType.CORRECTION)
+        self.assertEqual(u.alias.get_alias_entries('\x00')[0].type, u.AliasType.CONTROL)
+
+    def test_lookup(self):
+        """lookup resolves aliases back to characters, ignoring case and '_'."""
+        self.assertEqual(u.alias.lookup('NBSP'), '\u00A0')
+        self.assertEqual(u.alias.lookup('BOM'), '\uFEFF')
+        self.assertEqual(u.alias.lookup('byte_order  mark'), '\uFEFF')
+        self.assertEqual(u.alias.lookup('NULL'), '\x00')
+        self.assertIsNone(u.alias.lookup('LATIN SMALL LETTER A'))
+
+
+class TestBidiControls(TestCase):
+    """Unterminated and unmatched explicit bidi controls (Trojan Source)."""
+
+    def issues(self, text):
+        return [(i.start, i.end, i.control, i.issue) for i in u.bidi_control_issues(text)]
+
+    def test_balanced_controls(self):
+        """Closed embeddings, overrides and isolates are fine; so is text without controls."""
+        self.assertEqual(self.issues('a\u202Bb\u202Cc \u2067d\u2069 \u2068\u202De\u202C\u2069'), [])
+        self.assertEqual(self.issues('plain text\n'), [])
+
+    def test_trojan_source_comment(self):
+        """The CVE-2021-42574 'commenting out' pattern: controls left open until the line ends."""
+        text = 'if access_level != "user\u202E \u2066// Check if admin\u2069 \u2066" {\n    ok()\n}'
+        line_end = text.index('\n')
+        self.assertEqual(self.issues(text), [
+            (24, line_end, 'RLO', 'unterminated'),
+            (text.rindex('\u2066'), line_end, 'LRI', 'unterminated'),
+        ])
+        self.assertEqual(self.issues('x = "\u202E'), [(5, 6, 'RLO', 'unterminated')])
+
+    def test_nesting_rules(self):
+        """PDF cannot close across an isolate; PDI closes its isolate and embeddings inside it."""
+        self.assertEqual(self.issues('\u202C\u2069x\u2067\u202Ay\u2069z\u202C'), [
+            (0, 1, 'PDF', 'unmatched'), (1, 2, 'PDI', 'unmatched'), (8, 9, 'PDF', 'unmatched'),
+        ])
+        self.assertEqual(self.issues('\u202Aa\u2068b\u202C\u2069\u202C'), [(4, 5, 'PDF', 'unmatched')])
+        self.assertEqual(self.issues('\u202Ea\u2029\u202C'), [(0, 2, 'RLO', 'unterminated'), (3, 4, 'PDF', 'unmatched')])
+
+    def test_summary(self):
+        """TextAnalysis.summarize reports the issues; texts without controls skip the scan."""
+        self.assertEqual(u.examen_unicode('a\u202Eb').summarize().bidi_issues,
+                         [u.BidiIssue(1, 3, 'RLO', 'unterminated')])
+        with mock.patch.object(u, 'bidi_control_issues') as scan:
+            self.assertEqual(u.examen_unicode('abc').bidi_issues(), [])
+        scan.assert_not_called()
+
+
+class TestScanner(TestCase):
+    """Corpus scanner (decode.scanner and the scan_corpus command)."""
+    TEXT = ('plain line\n'
+            'zero\u200bwidth and p\u0430ypal\n'
+            'caf\u00e9 \U0001F600 \uff21 "\u202e"\n'
+            'no newline at end')
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix='.txt')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(self.TEXT.encode('utf-8') + b' \xff')
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_chunk_boundaries_never_split_characters(self):
+        """Every chunk decodes on its own and the chunks cover the data."""
+        data = ('\u00e9\U0001F600\u4e00' * 50).encode('utf-8')
+        for size in (1, 2, 3, 7, 64):
+            with self.subTest(chunk_size=size):
+                ranges = scanner.chunk_boundaries(data, size)
+                self.assertEqual(ranges[0][0], 0)
+                self.assertEqual(ranges[-1][1], len(data))
+                for (_, end), (start, _) in zip(ranges, ranges[1:]):
+                    self.assertEqual(end, start)
+                for start, end in ranges:
+                    data[start:end].decode('utf-8')
+
+    def test_chunk_boundaries_keep_combining_sequences(self):
+        """Without ASCII to split at, chunks still never separate a base from its marks."""
+        data = ('\u0438\u0306\u1100\u1161' * 500).encode('utf-8')
+        for size in (1, 3, 5, 4096):
+            for start, end in scanner.chunk_boundaries(data, size):
+                self.assertIn(data[start:end].decode('utf-8')[0], '\u0438\u1100')
+        data = ('\u0438' + '\u0306' * 5000).encode('utf-8')
+        self.assertEqual(scanner.chunk_boundaries(data, 5), [(0, len(data))])
+
+    def test_chunked_normalization_matches_whole_file(self):
+        """A file not in NFC is reported as such, however small the chunks."""
+        fd, path = tempfile.mkstemp(suffix='.txt')
+        self.addCleanup(os.remove, path)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(('\u0439\u0438\u0306' * 2000).encode('utf-8'))
+        record = list(scanner.scan_file(path, chunk_size=7))[-1]
+        self.assertFalse(record['normalization']['NFC'])
+        self.assertFalse(record['normalization']['NFD'])
+        # U+16D68 decomposes to U+16D67 U+16D67, which composes with a preceding U+16D67.
+        data = ('\U00016D67\U00016D68' * 1000).encode('utf-8')
+        for size in (1, 4, 5, 64):
+            for start, end in scanner.chunk_boundaries(data, size)[1:]:
+                self.assertNotEqual(data[start:end].decode('utf-8')[0], '\U00016D68')
+
+    def test_chunked_bidi_matches_whole_file(self):
+        """Bidi findings do not depend on where chunks end inside a line."""
+        rng = random.Random(22)
+        units = ('word ', '\u0438\u0306', '\u2066', '\u2067', '\u2069', '\u202b', '\u202c', '\u202e',
+                 '\u2029', '\r', '\n', 'x' * 40)
+        fd, path = tempfile.mkstemp(suffix='.txt')
+        self.addCleanup(os.remove, path)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(''.join(rng.choice(units) for _ in range(3000)).encode('utf-8'))
+        whole = [record for record in scanner.scan_file(path) if record['type'] == 'bidi']
+        self.assertTrue(whole)
+        for size in (1, 3, 17, 64):
+            with self.subTest(chunk_size=size):
+                chunked = [record for record in scanner.scan_file(path, chunk_size=size) if record['type'] == 'bidi']
+                self.assertEqual(chunked, whole)
+
+    def test_findings_with_offsets(self):
+        """Findings carry type, byte offset and 1-based line/column."""
+        records = list(scanner.scan_file(self.path))
+        findings = [(r['type'], r['line'], r['column']) for r in records[:-1]]
+        self.assertEqual(findings, [
+            ('invisible', 2, 5), ('mixed_script', 2, 16), ('homoglyph', 2, 17), ('homoglyph', 3, 8),
+            ('invisible', 3, 11), ('bidi', 3, 11), ('invalid_utf8', 4, 19),
+        ])
+        data = self.TEXT.encode('utf-8') + b' \xff'
+        self.assertEqual(data[records[0]['byte']:].decode('utf-8', 'replace')[0], '\u200b')
+        self.assertEqual(data[records[1]['byte']:].decode('utf-8', 'replace')[0], 'p')
+        self.assertEqual(records[1], dict(records[1], token='p\u0430ypal', scripts=['Latin', 'Cyrillic']))
+        self.assertEqual(data[records[2]['byte']:].decode('utf-8', 'replace')[0], '\u0430')
+        self.assertEqual(records[2]['confusable_with'], 'a')
+        self.assertEqual(records[5], dict(records[5], control='RLO', issue='unterminated'))
+        self.assertEqual(records[6]['byte'], len(data) - 1)
+        self.assertEqual(records[-1], {
+            'type': 'file', 'path': self.path, 'bytes': len(data), 'lines': 4,
+            'normalization': {'NFC': True, 'NFKC': False, 'NFD': False, 'NFKD': False},
+        })
+
+    def test_chunk_size_does_not_change_results(self):
+        """Small chunks give the same records as one chunk."""
+        whole = list(scanner.scan_file(self.path))
+        for size in (1, 5, 16):
+            with self.subTest(chunk_size=size):
+                self.assertEqual(list(scanner.scan_file(self.path, chunk_size=size)), whole)
+
+    def test_command_writes_json_lines(self):
+        """scan_corpus streams the same records as JSON lines using worker processes."""
+        out = StringIO()
+        call_command('scan_corpus', self.path, '--jobs', '2', '--chunk-size', '8', stdout=out)
+        records = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(records, list(scanner.scan_file(self.path)))
+
+
+class TestConfusables(TestCase):
+    """UTS #39 skeletons and the skeleton index (files/confusables.txt)."""
+
+    def test_skeleton_maps_lookalikes(self):
+        """Lookalikes from other scripts share the skeleton of the Latin word."""
+        self.assertEqual(confusables.skeleton('p\u0430ypal'), confusables.skeleton('paypal'))
+        self.assertEqual(confusables.skeleton('\uFF41pple'), 'apple')
+        self.assertTrue(confusables.is_confusable('\u0441\u043E\u0440\u0443', 'copy'))
+        self.assertFalse(confusables.is_confusable('paypal', 'paypa1x'))
+
+    def test_skeleton_maps_ascii_and_decomposes(self):
+        """ASCII sources are mapped too, and precomposed letters are decomposed first."""
+        self.assertEqual(confusables.skeleton('m'), 'rn')
+        self.assertTrue(confusables.is_confusable('paypa1', 'paypal'))
+        self.assertTrue(confusables.is_confusable('\u0451', 'e\u0308'))   # Cyrillic io
+
+    def test_confusable_with(self):
+        """Only non-ASCII listed characters report a prototype."""
+        self.assertEqual(confusables.confusable_with('\u0430'), 'a')
+        self.assertEqual(confusables.confusable_with('\u03BF'), 'o')
+        self.assertIsNone(confusables.confusable_with('m'))
+        self.assertIsNone(confusables.confusable_with('\u00E9'))
+        self.assertIsNone(confusables.confusable_with('ab'))
+        self.assertEqual(u.get_character_info('\u0440').confusable_with, 'p')
+        self.assertGreater(len(confusables.confusable_codepoints()), 6000)
+
+    def test_skeleton_index_screen(self):
+        """Candidates are matched to every target with the same skeleton, in input order."""
+        index = confusables.SkeletonIndex(['paypal', 'apple', 'paypal'])
+        self.assertEqual(len(index), 2)
+        matches = list(index.screen(['p\u0430ypal', 'google', '\u0430pple', 'paypa1']))
+        self.assertEqual([(m.index, m.targets) for m in matches],
+                         [(0, ['paypal']), (2, ['apple']), (3, ['paypal'])])
+        self.assertEqual(matches[0].skeleton, confusables.skeleton('paypal'))
+        self.assertEqual(index.matches('\uFF41pple'), ['apple'])
+        self.assertEqual(index.matches('pear'), [])
+
+
+class TestSanitize(TestCase):
+    """Sanitizing policies and the edit log."""
+
+    @staticmethod
+    def _apply(text, edits):
+        """Apply logged edits to the input."""
+        for edit in reversed(edits):
+            text = text[:edit.start] + edit.replacement + text[edit.end:]
+        return text
+
+    def test_policies(self):
+        """Each policy on its own changes only what it covers."""
+        text = '\uFF28i\u200b \uFB01le \u202eevil'
+        self.assertEqual(sanitize.sanitize(text, ['strip_invisible']).text, '\uFF28i \uFB01le evil')
+        self.assertEqual(sanitize.sanitize(text, ['fullwidth_to_ascii']).text, 'Hi\u200b \uFB01le \u202eevil')
+        self.assertEqual(sanitize.sanitize(text, ['unbalanced_bidi']).text, '\uFF28i\u200b \uFB01le evil')
+        self.assertEqual(sanitize.sanitize(text, ['nfkc']).text, 'Hi\u200b file \u202eevil')
+        self.assertEqual(sanitize.sanitize(text).text, 'Hi file evil')
+        self.assertEqual(sanitize.sanitize(text, []).text, text)
+
+    def test_edit_log(self):
+        """Edits are coalesced runs with offsets in the input."""
+        result = sanitize.sanitize('\uFF21\uFF22\u200b\u200bc', ['strip_invisible', 'fullwidth_to_ascii'])
+        self.assertEqual(result.text, 'ABc')
+        self.assertEqual(result.edits, [
+            sanitize.Edit(0, 2, '\uFF21\uFF22', 'AB', 'fullwidth_to_ascii'),
+            sanitize.Edit(2, 4, '\u200b\u200b', '', 'strip_invisible'),
+        ])
+        self.assertEqual(sanitize.sanitize('plain ascii'), sanitize.SanitizeResult('plain ascii', []))
+
+    def test_balanced_bidi_controls_are_kept(self):
+        """Only unterminated or unmatched controls are removed."""
+        text = '\u2067abc\u2069 \u202cx \u202ey'
+        result = sanitize.sanitize(text, ['unbalanced_bidi'])
+        self.assertEqual(result.text, '\u2067abc\u2069 x y')
+        self.assertEqual([(e.start, e.policy) for e in result.edits], [(6, 'unbalanced_bidi'), (9, 'unbalanced_bidi')])
+
+    def test_nfkc_edits_map_to_input_offsets(self):
+        """NFKC edits span the composed characters, across deleted ones."""
+        text = '\uFF21\u0301 x a\u200b\u0301 \U0001D400'
+        result = sanitize.sanitize(text)
+        self.assertEqual(result.text, '\u00C1 x \u00E1 A')
+        self.assertEqual(self._apply(text, result.edits), result.text)
+        self.assertEqual([(e.start, e.end, e.policy) for e in result.edits],
+                         [(0, 2, 'nfkc'), (5, 8, 'nfkc'), (9, 10, 'nfkc')])
+
+    def test_edits_reproduce_output(self):
+        """Applying the edit log to the input gives the cleaned text for any policies."""
+        text = '\u3000\uFF41\u200d\u0308b\u2066c\u202a\uFF44\u2069\u1E9B\u0323 \u2460\u200b\uFF10'
+        for n in range(1 << len(sanitize.SANITIZE_POLICIES)):
+            policies = [p for i, p in enumerate(sanitize.SANITIZE_POLICIES) if n >> i & 1]
+            with self.subTest(policies=policies):
+                result = sanitize.sanitize(text, policies)
+                self.assertEqual(self._apply(text, result.edits), result.text)
+                self.assertEqual(result.edits, sorted(result.edits))
+
+    def test_nfkc_composing_decompositions(self):
+        """Edits reproduce NFKC output where a composite decomposes to characters that compose."""
+        rng = random.Random(23)
+        units = ('\U00016D67', '\U00016D68', '\U0001611E', '\U00016121', '\u200b', '\uFF21', 'a', '\u0301')
+        texts = ['\U00016D67\U00016D68a', '\U00016D67\u200b\U00016D68', '\U0001611E\U00016121\U0001611E']
+        texts += [''.join(rng.choice(units) for _ in range(rng.randrange(1, 8))) for _ in range(500)]
+        for text in texts:
+            for policies in (['nfkc'], sanitize.SANITIZE_POLICIES):
+                with self.subTest(text=ascii(text), policies=policies):
+                    result = sanitize.sanitize(text, policies)
+                    self.assertEqual(ud.normalize('NFKC', result.text), result.text)
+                    self.assertEqual(self._apply(text, result.edits), result.text)
+
+    def test_nfkc_edit_fallback(self):
+        """If no run accounts for the change, one edit covers the span that differs."""
+        text = 'x\U00016D67\U00016D68y'
+        edits = list(sanitize._nfkc_edits(text, text, [], re.compile('(?!)')))
+        self.assertEqual(edits, [sanitize.Edit(1, 3, text[1:3], ud.normalize('NFKC', text[1:3]), 'nfkc')])
+        self.assertEqual(self._apply(text, edits), ud.normalize('NFKC', text))
+
+    def test_unknown_policy(self):
+        with self.assertRaises(ValueError):
+            sanitize.sanitize('x', ['strip_everything'])
+
+
+class TestNameIndex(TestCase):
+    """Name search over ud.name() values and NameAliases.txt (name_index)."""
+
+    def setUp(self):
+        self.index = name_index.NameIndex([
+            (0x41, 'LATIN CAPITAL LETTER A'),
+            (0x61, 'LATIN SMALL LETTER A'),
+            (0xA0, 'NO-BREAK SPACE'),
+            (0xA0, 'NBSP'),
+            (0x410, 'CYRILLIC CAPITAL LETTER A'),
+            (0x200B, 'ZERO WIDTH SPACE'),
+            (0x200B, 'ZWSP'),
+        ])
+
+    def _search(self, query, mode, limit=name_index.SEARCH_LIMIT):
+        return [m.code_point for m in self.index.search(query, mode, limit)]
+
+    def test_modes(self):
+        """Word, prefix and substring searches, ignoring case, '_' and spacing."""
+        self.assertEqual(self._search('letter a capital', 'word'), [0x41, 0x410])
+        self.assertEqual(self._search('space', 'word'), [0xA0, 0x200B])
+        self.assertEqual(self._search('break', 'word'), [0xA0])
+        self.assertEqual(self._search('latin_small  ', 'prefix'), [0x61])
+        self.assertEqual(self._search('TTER', 'word'), [])
+        self.assertEqual(self._search('tter a', 'substring'), [0x41, 0x61, 0x410])
+        self.assertEqual(self._search('K SPA', 'substring'), [0xA0])
+        self.assertEqual(self._search('ACE', 'substring'), [0xA0, 0x200B])
+        self.assertEqual(self._search('', 'substring'), [])
+
+    def test_one_result_per_code_point(self):
+        """Aliases are searched, and each code point is reported once with the name that matched."""
+        self.assertEqual(self.index.search('nbsp', 'word'), [name_index.NameMatch(0xA0, 'NBSP')])
+        self.assertEqual(self._search('SP', 'substring'), [0xA0, 0x200B])
+        self.assertEqual(self._search('letter', 'word', limit=2), [0x41, 0x61])
+        self.assertEqual(self._search('Z', 'prefix'), [0x200B])
+        with self.assertRaises(ValueError):
+            self.index.search('a', 'fuzzy')
+
+    def test_full_index(self):
+        """The shared index covers every name, including CJK ideographs and aliases."""
+        self.assertEqual(name_index.search('zero width space')[0].code_point, 0x200B)
+        self.assertEqual(name_index.search('nbsp')[0], name_index.NameMatch(0xA0, 'NBSP'))
+        self.assertEqual(name_index.search('cjk unified ideograph-4e00', 'prefix')[0].code_point, 0x4E00)
+        self.assertEqual(name_index.search('grinning face with smiling', 'substring')[0].code_point, 0x1F601)
+        self.assertEqual(len(name_index.search('letter', limit=7)), 7)
+        self.assertEqual(name_index.search('IDEOGRAPH-2A6', 'substring', limit=1)[0].code_point, 0x2A600)
+
+
+class TestBlocks(TestCase):
+    """Unicode blocks from files/Blocks.txt."""
+
+    def test_get_block(self):
+        """Characters map to their block; code points outside every block to None."""
+        self.assertEqual(u.get_block('A'), u.Block(0x0000, 0x007F, 'Basic Latin'))
+        self.assertEqual(u.get_block('\u00e9').name, 'Latin-1 Supplement')
+        self.assertEqual(u.get_block('\U0001F600').name, 'Emoticons')
+        self.assertEqual(u.get_block('\U0010FFFF').name, 'Supplementary Private Use Area-B')
+        self.assertIsNone(u.get_block('\u2FE0'))
+        self.assertIsNone(u.get_block('ab'))
+
+    def test_find_block_loose_matching(self):
+        """Block names match ignoring case, spaces, underscores, hyphens and an 'Is' prefix."""
+        latin1 = u.get_block('\u00e9')
+        self.assertEqual(latin1.slug, 'Latin-1_Supplement')
+        for name in ('Latin-1_Supplement', 'latin 1 supplement', 'LATIN1SUPPLEMENT', 'IsLatin-1Supplement'):
+            self.assertEqual(u.find_block(name), latin1)
+        self.assertIsNone(u.find_block('Latin'))
+
+    def test_blocks_sorted_and_disjoint(self):
+        """Blocks are in code point order, do not overlap and start on multiples of 16."""
+        blocks = u.get_blocks()
+        self.assertGreater(len(blocks), 300)
+        for block, following in zip(blocks, blocks[1:]):
+            self.assertLess(block.last, following.first)
+        self.assertTrue(all(block.first % 16 == 0 and block.last % 16 == 15 for block in blocks))
+        self.assertEqual(len(u.get_block('\u0100').codepoints), 0x80)
+
+    def test_iter_character_info(self):
+        """Uncached records equal the cached ones."""
+        codepoints = range(0x0370, 0x0400)
+        self.assertEqual(list(u.iter_character_info(codepoints)),
+                         [u.get_character_info(chr(cp)) for cp in codepoints])
+
+
+class TestRowRenderer(TestCase):
+    """row_renderer.render_rows matches _decode_rows.html byte for byte."""
+    TEXT = ('aZ09 <>&"\'\x00\t\n\x7f\x80\u00a0\u00e9e\u0301\u0430\u200b\u202e\ufeff'
+            '\u0378\ue000\u4e00\uac00\uff21\U0001F600\U0001F1FA\U000E0001')
+
+    def template_rows(self, text):
+        return render_to_string('decode/_decode_rows.html', {'rows': u.examen_unicode(text)})
+
+    def test_matches_template(self):
+        """Rows for varied characters (escaping, N/A defaults, invisibles) equal the template output."""
+        self.assertEqual(row_renderer.render_rows(self.TEXT), self.template_rows(self.TEXT))
+        self.assertEqual(row_renderer.render_rows(''), self.template_rows(''))
+
+    def test_matches_template_under_script_prefix(self):
+        """The codepoint URL honours the script prefix, as {% url %} does."""
+        set_script_prefix('/sub/')
+        try:
+            self.assertIn('href="/sub/codepoint/0041"', row_renderer.render_rows('A'))
+            self.assertEqual(row_renderer.render_rows(self.TEXT), self.template_rows(self.TEXT))
+        finally:
+            set_script_prefix('/')
+
+    def test_rows_cached_per_character(self):
+        """Each distinct character's row is built once."""
+        row_renderer.clear_row_cache()
+        row_renderer.render_rows('abab')
+        info = row_renderer._row_html.cache_info()
+        self.assertEqual((info.misses, info.hits), (2, 2))
+
+    def test_codepoint_rows_match_text_rows(self):
+        """Range rows equal the rows of the same characters as text, and bypass the caches."""
+        row_renderer.clear_row_cache()
+        u.clear_character_cache()
+        self.assertEqual(row_renderer.render_codepoint_rows(range(0x20, 0x300)),
+                         row_renderer.render_rows(''.join(map(chr, range(0x20, 0x300)))))
+        self.assertEqual(row_renderer.render_codepoint_rows(range(0)), row_renderer.render_rows(''))
+        row_renderer.clear_row_cache()
+        u.clear_character_cache()
+        row_renderer.render_codepoint_rows(range(0x4E00, 0x5000))
+        self.assertEqual(row_renderer._row_html.cache_info().currsize, 0)
+        self.assertEqual(u.character_cache_info().currsize, 0)
+
+    def test_surrogate_rows(self):
+        """Surrogate code points get empty character cells and no UTF-8 bytes."""
+        rows = row_renderer.render_codepoint_rows(range(0xD800, 0xD802))
+        rows.encode('utf-8')
+        self.assertIn('<td data-label="Character"></td>', rows)
+        self.assertIn('<td data-label="UTF-8">N/A</td>', rows)
+
+
+class TestBenchmarks(TestCase):
+    """Benchmark inputs, results and comparison (decode.benchmarks and the benchmark command)."""
+
+    def test_inputs_are_deterministic_and_sized(self):
+        """Each shape gives the same valid decode input, at most size UTF-8 bytes long."""
+        for shape in benchmarks.SHAPES:
+            with self.subTest(shape=shape):
+                text = benchmarks.make_text(shape, 1000)
+                self.assertEqual(text, benchmarks.make_text(shape, 1000))
+                self.assertGreater(len(text.encode('utf-8')), 990)
+                self.assertLessEqual(len(text.encode('utf-8')), 1000)
+                self.assertTrue(UnicodeTextForm({'text': text}).is_valid())
+        self.assertLessEqual(len(benchmarks.make_text('emoji', 10).encode('utf-8')), 10)
+
+    def test_run_and_compare(self):
+        """Every benchmark yields timings for every case, and runs compare case by case."""
+        run = benchmarks.run_benchmarks(shapes=['combining'], sizes=[10, 100], min_time=0, repeat=2)
+        self.assertEqual(len(run['results']), 2 * len(benchmarks.BENCHMARKS))
+        self.assertEqual(run['environment']['unidata_version'], ud.unidata_version)
+        result = run['results'][0]
+        self.assertEqual((result['benchmark'], result['shape'], result['size']), ('examen_unicode', 'combining', 10))
+        self.assertGreater(result['min'], 0)
+        self.assertLessEqual(result['min'], result['median'])
+        json.dumps(run)
+        slower = copy(run)
+        slower['results'] = [dict(result, min=result['min'] * 2) for result in run['results'][:3]]
+        comparisons = benchmarks.compare(run, slower)
+        self.assertEqual([c.ratio for c in comparisons], [2.0] * 3)
+        with self.assertRaises(ValueError):
+            benchmarks.compare(run, dict(slower, format=0))
+        with self.assertRaises(ValueError):
+            benchmarks.run_benchmarks(['nope'], sizes=[10])
+
+    def test_command(self):
+        """The benchmark command writes JSON and fails on regressions against a baseline."""
+        out = StringIO()
+        args = ('benchmark', '--benchmarks', 'get_script', '--shapes', 'ascii', '--sizes', '10',
+                '--min-time', '0', '--repeat', '1')
+        call_command(*args, stdout=out)
+        run = json.loads(out.getvalue())
+        self.assertEqual([r['benchmark'] for r in run['results']], ['get_script'])
+        for result in run['results']:
+            result['min'] /= 1000
+        fd, baseline = tempfile.mkstemp(suffix='.json')
+        self.addCleanup(os.remove, baseline)
+        with os.fdopen(fd, 'w') as f:
+            json.dump(run, f)
+        with self.assertRaises(CommandError):
+            call_command(*args, '--compare', baseline, stdout=StringIO(), stderr=StringIO())
+
+
+class TestPrerender(TestCase):
+    """Static codepoint page pre-rendering (decode.prerender)."""
+    SLUGS = ['0041', '0080', '1F600']
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.output_dir = self.tmp.name
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def read(self, name):
+        with open(os.path.join(self.output_dir, name), 'rb') as f:
+            return f.read()
+
+    def test_codepoint_slugs(self):
+        """Assigned code points and alias-only controls are included; unassigned ones are not."""
+        slugs = set(prerender.codepoint_slugs())
+        self.assertIn('0041', slugs)
+        self.assertIn('0080', slugs)  # control without a name, only aliases
+        self.assertIn('1F600', slugs)
+        self.assertNotIn('0378', slugs)  # unassigned
+        self.assertNotIn('D800', slugs)  # surrogate
+        self.assertNotIn('E000', slugs)  # private use
+
+    def test_pages_match_view(self):
+        """Pre-rendered pages are byte-identical to what the view serves."""
+        counts = prerender.build(self.output_dir, 'https://example.com/', self.SLUGS)
+        self.assertEqual(counts, {'rendered': 3, 'unchanged': 0})
+        for slug in self.SLUGS:
+            response = self.client.get(reverse('codepoint', kwargs={'slug': slug}))
+            self.assertEqual(self.read(prerender.page_path(slug)), response.content)
+        manifest = json.loads(self.read(prerender.MANIFEST_NAME))
+        self.assertEqual(manifest['unidata_version'], ud.unidata_version)
+        self.assertEqual(set(manifest['pages']), set(self.SLUGS))
+        self.assertEqual(manifest['pages']['0041']['etag'], views.codepoint_etag(None, '0041'))
+        sitemap = self.read('sitemap-codepoints-1.xml').decode()
+        self.assertIn('<loc>https://example.com/codepoint/1F600</loc>', sitemap)
+        self.assertIn('sitemap-codepoints-1.xml', self.read(prerender.SITEMAP_NAME).decode())
+
+    def test_incremental_rebuild(self):
+        """Only pages whose ETag changed (or whose file is missing) are re-rendered."""
+        prerender.build(self.output_dir, 'https://example.com', self.SLUGS)
+        os.remove(os.path.join(self.output_dir, prerender.page_path('0080')))
+        self.assertEqual(prerender.build(self.output_dir, 'https://example.com', self.SLUGS),
+                         {'rendered': 1, 'unchanged': 2})
+        with mock.patch.object(views, 'CODEPOINT_TEMPLATE_VERSION', views.CODEPOINT_TEMPLATE_VERSION + 1):
+            counts = prerender.build(self.output_dir, 'https://example.com', self.SLUGS)
+        self.assertEqual(counts, {'rendered': 3, 'unchanged': 0})
+        self.assertEqual(prerender.build(self.output_dir, 'https://example.com', self.SLUGS, force=True),
+                         {'rendered': 3, 'unchanged': 0})
+
+    def test_sitemap_split(self):
+        """Sitemaps are split at SITEMAP_MAX_URLS and listed in the index."""
+        with mock.patch.object(prerender, 'SITEMAP_MAX_URLS', 2):
+            names = prerender.write_sitemaps(self.output_dir, 'https://example.com', self.SLUGS)
+        self.assertEqual(names, ['sitemap.xml', 'sitemap-codepoints-1.xml', 'sitemap-codepoints-2.xml'])
+
 
 class TestGetCharacterPageDescription(TestCase):
     """get_character_page_description for codepoint detail page."""
     REQUIRED_KEYS = {
         'title', 'tagline', 'char', 'name', 'category', 'digit',
-        'direction', 'integer', 'upper', 'lower', 'decomposition',
-        'aliases', 'east_asian',
+        'direction', 'script', 'script_extensions', 'unicode_block', 'integer', 'upper', 'lower',
+        'decomposition', 'aliases', 'east_asian',
     }
 
     def test_returns_codepoint_description(self):
@@ -623,7 +1526,7 @@ class DecodeViewTestCase(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertIn('text', response.context)
         self.assertIn('normalization_form', response.context)
-        self.assertIsInstance(response.context['text'], list)
+        self.assertIsInstance(response.context['text'], u.TextAnalysis)
         self.assertEqual(len(response.context['text']), 5)
 
     def test_decode_post_empty(self):
@@ -653,6 +1556,86 @@ class CodepointViewTestCase(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.context['char'], '😀')
 
+    def test_codepoint_invalid_slug(self):
+        """Slugs that are not hex or are outside the code space are 404 without an ETag."""
+        for slug in ('zz', '110000', 'FFFFFFFF', '-41', '4_1'):
+            with self.subTest(slug=slug):
+                response = self.client.get(reverse('codepoint', kwargs={'slug': slug}))
+                self.assertEqual(response.status_code, 404)
+                self.assertFalse(response.has_header('ETag'))
+
+    def test_codepoint_caching_headers(self):
+        """Codepoint pages carry a strong ETag and long-lived public Cache-Control."""
+        response = self.client.get(reverse('codepoint', kwargs={'slug': '41'}))
+        etag = response['ETag']
+        self.assertTrue(etag.startswith('"') and etag.endswith('"'))
+        self.assertIn(ud.unidata_version, etag)
+        self.assertIn('public', response['Cache-Control'])
+        self.assertIn(f'max-age={views.CODEPOINT_MAX_AGE}', response['Cache-Control'])
+        same = self.client.get(reverse('codepoint', kwargs={'slug': '0041'}))
+        self.assertEqual(same['ETag'], etag)
+        other = self.client.get(reverse('codepoint', kwargs={'slug': '42'}))
+        self.assertNotEqual(other['ETag'], etag)
+
+    def test_codepoint_if_none_match(self):
+        """A matching If-None-Match returns 304 without building the description."""
+        url = reverse('codepoint', kwargs={'slug': '1F600'})
+        etag = self.client.get(url)['ETag']
+        with mock.patch.object(u, 'get_character_page_description') as describe:
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+        self.assertIn('max-age', response['Cache-Control'])
+        describe.assert_not_called()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH='"stale"').status_code, 200)
+
+
+class BlockViewTestCase(TestCase):
+    """Block and code point range pages."""
+    def setUp(self):
+        self.client = Client()
+
+    def test_block_page(self):
+        """A block page lists its code points and links the neighbouring blocks."""
+        response = self.client.get(reverse('block', kwargs={'name': 'latin-1 supplement'}))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['title'], 'Latin-1 Supplement')
+        self.assertContains(response, '<tr data-char=', count=128)
+        self.assertContains(response, reverse('codepoint', kwargs={'slug': '00E9'}))
+        self.assertContains(response, reverse('block', kwargs={'name': 'Latin_Extended-A'}))
+        self.assertIn('public', response['Cache-Control'])
+        etag = response['ETag']
+        self.assertEqual(self.client.get(response.request['PATH_INFO'], HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+    def test_range_pages(self):
+        """Ranges are paginated BLOCK_PAGE_SIZE rows at a time, each page with its own ETag."""
+        url = reverse('codepoint_range', kwargs={'start': 0x10000, 'end': 0x1FFFF})
+        self.assertEqual(url, '/range/10000-1FFFF')
+        first = self.client.get(url)
+        self.assertContains(first, '<tr data-char=', count=views.BLOCK_PAGE_SIZE)
+        self.assertEqual(first.context['page'].paginator.num_pages, 0x10000 // views.BLOCK_PAGE_SIZE)
+        last = self.client.get(url, {'page': 256})
+        self.assertContains(last, reverse('codepoint', kwargs={'slug': '1FFFF'}))
+        self.assertNotEqual(first['ETag'], last['ETag'])
+        surrogates = self.client.get(reverse('codepoint_range', kwargs={'start': 0xD800, 'end': 0xDFFF}))
+        self.assertEqual(surrogates.status_code, 200)
+
+    def test_not_found(self):
+        """Unknown blocks, reversed or out-of-range bounds and missing pages are 404."""
+        self.assertEqual(self.client.get('/block/Nonexistent').status_code, 404)
+        self.assertEqual(self.client.get('/range/41-40').status_code, 404)
+        self.assertEqual(self.client.get('/range/0-110000').status_code, 404)
+        self.assertEqual(self.client.get('/range/0-FF', {'page': 2}).status_code, 404)
+        self.assertEqual(self.client.get('/range/0-FF', {'page': 'x'}).status_code, 404)
+
+    def test_codepoint_page_shows_block(self):
+        """The codepoint page links to the character's block; surrogates render too."""
+        response = self.client.get(reverse('codepoint', kwargs={'slug': '41'}))
+        self.assertContains(response, reverse('block', kwargs={'name': 'Basic_Latin'}))
+        response = self.client.get(reverse('codepoint', kwargs={'slug': 'D800'}))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['char'], '')
+
 
 class StaticPagesTestCase(TestCase):
     """About, terms, privacy, tofu return 200."""
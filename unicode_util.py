@@ -4,26 +4,55 @@ Utilities for inspecting Unicode characters: names, categories, normalization,
 bidirectional class, East Asian width, and aliases from the Unicode database.
 """
 
+import operator
 import os
 import re
+import sys
+import unicodedata as _stdlib_unicodedata
+from array import array
+from bisect import bisect_right
+from collections import Counter
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any, Dict, List, Optional, Union
+from functools import lru_cache
+from itertools import accumulate, compress, starmap
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
 
 import unicodedata2 as ud
+try:
+    import numpy as np
+except ImportError:  # optional: TextAnalysis falls back to the 'python' engine
+    np = None
+from decode.confusables import confusable_with, is_confusable_codepoint
 from decode.mappings import (
     bidi,
     category,
     east_asian_categories,
-    name_prefix_to_script,
+    neutral_scripts,
+    script_augmentation,
     script_display,
-    is_homoglyph_codepoint,
     INVISIBLE_CHARACTERS,
 )
 
 # App package directory (decode/)
 _APP_DIR: str = os.path.dirname(os.path.abspath(__file__))
 
+# Size of the Unicode code space (U+0000..U+10FFFF).
+MAX_CODEPOINT: int = 0x10FFFF
+_CODESPACE_SIZE: int = MAX_CODEPOINT + 1
+# The table is filled in blocks of 2**_TABLE_BLOCK_BITS code points.
+_TABLE_BLOCK_BITS: int = 8
+_TABLE_BLOCK_SIZE: int = 1 << _TABLE_BLOCK_BITS
+
+# Bit flags stored in CodepointTable.flags.
+FLAG_HOMOGLYPH: int = 0x01
+FLAG_INVISIBLE: int = 0x02
+FLAG_WHITESPACE: int = 0x04
+FLAG_WORD: int = 0x08
+
+# Format characters that occur inside words (ZWNJ and ZWJ, e.g. in Indic scripts).
+_WORD_JOINERS: FrozenSet[int] = frozenset({0x200C, 0x200D})
+
 
 class NormalizationForm(str, Enum):
     """Unicode normalization form."""
@@ -34,9 +63,13 @@ class NormalizationForm(str, Enum):
     NFKD = 'NFKD'  # Compatibility Decomposition
 
 
-@dataclass
+@dataclass(frozen=True)
 class CharacterInfo:
-    """Per-character Unicode attributes from examen_unicode."""
+    """Unicode attributes of one character (see CharacterRow.info).
+
+    Instances are shared between every position of the same character, so
+    they are immutable.
+    """
 
     char: str
     name: str
@@ -50,14 +83,15 @@ class CharacterInfo:
     html_entity: str
     script: Optional[str]
     homoglyph_risk: Optional[str]
+    confusable_with: Optional[str]
     invisible: Optional[str]
 
 
 def get_homoglyph_risk(char: str) -> Optional[str]:
-    """Return 'Yes' if the character is commonly used in spoofing/homoglyph attacks, else None."""
+    """Return 'Yes' if the character is a non-ASCII confusable (UTS #39 confusables.txt), else None."""
     if len(char) != 1:
         return None
-    return 'Yes' if is_homoglyph_codepoint(ord(char)) else None
+    return 'Yes' if is_confusable_codepoint(ord(char)) else None
 
 
 def get_invisible_warning(char: str) -> Optional[str]:
@@ -67,35 +101,145 @@ def get_invisible_warning(char: str) -> Optional[str]:
     return INVISIBLE_CHARACTERS.get(ord(char))
 
 
+@lru_cache(maxsize=None)
+def _script_ranges() -> Tuple[List[int], List[str]]:
+    """Sorted range starts and Script display names covering the code space (Scripts.txt).
+
+    Gaps between the listed ranges get 'Unknown', so the starts partition
+    U+0000..U+10FFFF and a lookup is one bisect.
+    """
+    starts: List[int] = []
+    names: List[str] = []
+    end = 0
+    for first, last, value in sorted(_read_property_ranges('Scripts.txt')):
+        if first > end:
+            starts.append(end)
+            names.append('Unknown')
+        starts.append(first)
+        names.append(value.replace('_', ' '))
+        end = last + 1
+    if end <= MAX_CODEPOINT:
+        starts.append(end)
+        names.append('Unknown')
+    return starts, names
+
+
+@lru_cache(maxsize=None)
+def _script_extension_ranges() -> Tuple[List[int], List[int], List[Tuple[str, ...]]]:
+    """Sorted (first, last, display names) columns of the ranges in ScriptExtensions.txt."""
+    firsts: List[int] = []
+    lasts: List[int] = []
+    values: List[Tuple[str, ...]] = []
+    for first, last, value in sorted(_read_property_ranges('ScriptExtensions.txt')):
+        firsts.append(first)
+        lasts.append(last)
+        values.append(tuple(script_display.get(code, code) for code in value.split()))
+    return firsts, lasts, values
+
+
 def get_script(char: str) -> Optional[str]:
     """Return the Unicode script (e.g. Latin, Cyrillic, Arabic) for homoglyph detection.
 
-    Uses ud.script() when available (e.g. unicodedata2), otherwise infers from
-    the character name (e.g. "LATIN CAPITAL LETTER A" -> "Latin").
+    Looked up by bisection in the vendored Scripts.txt ranges, so the result
+    does not depend on which unicodedata module is installed.
 
     Args:
         char: Single Unicode character.
 
     Returns:
-        Script display name (e.g. 'Latin', 'Cyrillic', 'Common'), or None.
+        Script display name (e.g. 'Latin', 'Cyrillic', 'Common', 'Unknown'
+        for unassigned code points), or None.
     """
     if len(char) != 1:
         return None
-    script_getter = getattr(ud, 'script', None)
-    if script_getter is not None:
-        try:
-            code = script_getter(char)
-            return script_display.get(code, code) if code else None
-        except (ValueError, TypeError):
-            pass
-    try:
-        name = ud.name(char)
-    except ValueError:
-        return None
-    if not name:
+    starts, names = _script_ranges()
+    return names[bisect_right(starts, ord(char)) - 1]
+
+
+def get_script_extensions(char: str) -> Tuple[str, ...]:
+    """Return the Script_Extensions of a character: the scripts it is used with.
+
+    Args:
+        char: Single Unicode character.
+
+    Returns:
+        Script display names from ScriptExtensions.txt (e.g. ('Arabic',
+        'Syriac') for ARABIC COMMA), or just the character's script; empty
+        for invalid input.
+    """
+    if len(char) != 1:
+        return ()
+    cp = ord(char)
+    firsts, lasts, values = _script_extension_ranges()
+    i = bisect_right(firsts, cp) - 1
+    if i >= 0 and cp <= lasts[i]:
+        return values[i]
+    return (get_script(char),)
+
+
+class Block(NamedTuple):
+    """A named range of code points from Blocks.txt."""
+
+    first: int
+    last: int
+    name: str
+
+    @property
+    def slug(self) -> str:
+        """URL form of the name (spaces as underscores, e.g. 'Latin-1_Supplement')."""
+        return self.name.replace(' ', '_')
+
+    @property
+    def codepoints(self) -> range:
+        """The block's code points."""
+        return range(self.first, self.last + 1)
+
+
+def _block_key(name: str) -> str:
+    """Loose-matching key of a block name (UAX #44 LM3): case, spaces, '_', '-' and 'is' ignored."""
+    key = re.sub(r'[\s_-]', '', name).lower()
+    return key[2:] if key.startswith('is') else key
+
+
+@lru_cache(maxsize=None)
+def _block_table() -> Tuple[List[int], List[Block], Dict[str, Block]]:
+    """Sorted block starts, the blocks, and the blocks by loose-matching key (Blocks.txt)."""
+    blocks = [Block(first, last, name) for first, last, name in sorted(_read_property_ranges('Blocks.txt'))]
+    return [block.first for block in blocks], blocks, {_block_key(block.name): block for block in blocks}
+
+
+def get_blocks() -> List[Block]:
+    """Return every block, in code point order."""
+    return list(_block_table()[1])
+
+
+def get_block(char: str) -> Optional[Block]:
+    """Return the block containing a character.
+
+    Args:
+        char: Single Unicode character.
+
+    Returns:
+        Block from the vendored Blocks.txt, or None for code points outside
+        every block (and invalid input).
+    """
+    if len(char) != 1:
         return None
-    first = name.split()[0] if name else ''
-    return name_prefix_to_script.get(first, 'Common')
+    cp = ord(char)
+    firsts, blocks, _ = _block_table()
+    i = bisect_right(firsts, cp) - 1
+    if i >= 0 and cp <= blocks[i].last:
+        return blocks[i]
+    return None
+
+
+def find_block(name: str) -> Optional[Block]:
+    """Look up a block by name, ignoring case, spaces, '_' and '-' (e.g. 'basic_latin').
+
+    Returns:
+        The Block, or None if no block has that name.
+    """
+    return _block_table()[2].get(_block_key(name))
 
 
 def get_html_entity(char: str) -> str:
@@ -121,46 +265,697 @@ def get_utf8_bytes(char: str) -> str:
         char: Single Unicode character.
 
     Returns:
-        Hex string of the form '0xXX' or '0xXX 0xYY ...'.
+        Hex string of the form '0xXX' or '0xXX 0xYY ...', or '' for
+        surrogate code points, which have no UTF-8 form.
     """
     if len(char) != 1:
         raise ValueError(f"get_utf8_bytes expects a single character, got length {len(char)}")
+    if 0xD800 <= ord(char) <= 0xDFFF:
+        return ''
     return ' '.join(f'0x{b:02X}' for b in char.encode('utf-8'))
 
 
-def examen_unicode(text: str) -> List[CharacterInfo]:
-    """Build a list of per-character attribute objects for the given text.
+# Maximum number of distinct code points kept by the CharacterInfo cache.
+CHARACTER_CACHE_SIZE: int = 8192
+
+
+def _build_character_info(cp: int, attrs: 'CodepointAttributes') -> CharacterInfo:
+    """Build the CharacterInfo for one code point from its table attributes."""
+    char = chr(cp)
+    return CharacterInfo(
+        char=char,
+        name=get_name(char),
+        category=attrs.category,
+        digit=attrs.digit,
+        bidi=attrs.bidi,
+        ordinal=cp,
+        code_point=f'U+{cp:04X}',
+        hex_code=f'{cp:04X}',
+        utf8_bytes=get_utf8_bytes(char),
+        html_entity=f'&#{cp};',
+        script=attrs.script,
+        homoglyph_risk=attrs.homoglyph_risk,
+        confusable_with=confusable_with(char),
+        invisible=attrs.invisible,
+    )
+
+
+@lru_cache(maxsize=CHARACTER_CACHE_SIZE)
+def _character_info(cp: int, unidata_version: str) -> CharacterInfo:
+    """Build the CharacterInfo for one code point (cached per Unicode version)."""
+    return _build_character_info(cp, codepoint_table.lookup(cp))
+
+
+def get_character_info(char: str) -> CharacterInfo:
+    """Return the shared CharacterInfo record for a single character.
 
     Args:
-        text: String of Unicode characters to inspect.
+        char: Single Unicode character.
+
+    Returns:
+        CharacterInfo from the process-wide cache.
+    """
+    return _character_info(ord(char), ud.unidata_version)
+
+
+def iter_character_info(codepoints: range) -> Iterator[CharacterInfo]:
+    """Yield a CharacterInfo for each code point of a range, bypassing the cache.
+
+    For browsing blocks and planes: the attributes come straight from
+    codepoint_table, one table block at a time, and the records are not
+    kept, so paging through a plane neither fills nor evicts the
+    CharacterInfo cache that decoding relies on.
+
+    Args:
+        codepoints: Code points in U+0000..U+10FFFF (step 1).
+    """
+    table = codepoint_table
+    for block_start in range(codepoints.start & ~(_TABLE_BLOCK_SIZE - 1), codepoints.stop, _TABLE_BLOCK_SIZE):
+        table.ensure(block_start)
+    for cp in codepoints:
+        yield _build_character_info(cp, table.lookup(cp))
+
+
+def character_cache_info() -> Any:
+    """Return hit/miss counters of the process-wide CharacterInfo cache."""
+    return _character_info.cache_info()
+
+
+def clear_character_cache() -> None:
+    """Empty the CharacterInfo cache and reset its counters."""
+    _character_info.cache_clear()
+
+
+# Codec giving one native-endian 32-bit unit per code point (for array('I')).
+_UTF32_NATIVE: str = 'utf-32-le' if sys.byteorder == 'little' else 'utf-32-be'
+
+
+class CharacterRow:
+    """Lazy view of one position of a TextAnalysis.
+
+    Exposes the same attributes as CharacterInfo; values are read from the
+    analysis columns, and formatted strings are only produced when accessed.
+    """
+
+    __slots__ = ('_analysis', '_index')
+
+    def __init__(self, analysis: 'TextAnalysis', index: int) -> None:
+        self._analysis = analysis
+        self._index = index
+
+    def __repr__(self) -> str:
+        return f'<CharacterRow {self._index}: {self.code_point}>'
+
+    @property
+    def info(self) -> CharacterInfo:
+        """Shared CharacterInfo record for this row's code point."""
+        return get_character_info(self.char)
+
+    @property
+    def char(self) -> str:
+        return self._analysis.text[self._index]
+
+    @property
+    def ordinal(self) -> int:
+        return self._analysis.codepoints[self._index]
+
+    @property
+    def name(self) -> str:
+        return self.info.name
+
+    @property
+    def category(self) -> Optional[str]:
+        return codepoint_table.category_labels[self._analysis.category[self._index]]
+
+    @property
+    def digit(self) -> Optional[int]:
+        digit = codepoint_table.digit[self.ordinal]
+        return digit if digit >= 0 else None
+
+    @property
+    def bidi(self) -> Optional[str]:
+        return codepoint_table.bidi_labels[self._analysis.bidi[self._index]]
+
+    @property
+    def script(self) -> Optional[str]:
+        return codepoint_table.script_labels[self._analysis.script[self._index]]
+
+    @property
+    def homoglyph_risk(self) -> Optional[str]:
+        return 'Yes' if self._analysis.flags[self._index] & FLAG_HOMOGLYPH else None
+
+    @property
+    def confusable_with(self) -> Optional[str]:
+        return self.info.confusable_with
+
+    @property
+    def invisible(self) -> Optional[str]:
+        if self._analysis.flags[self._index] & FLAG_INVISIBLE:
+            return INVISIBLE_CHARACTERS[self.ordinal]
+        return None
+
+    @property
+    def code_point(self) -> str:
+        return f'U+{self.ordinal:04X}'
+
+    @property
+    def hex_code(self) -> str:
+        return f'{self.ordinal:04X}'
+
+    @property
+    def utf8_bytes(self) -> str:
+        return self.info.utf8_bytes
+
+    @property
+    def html_entity(self) -> str:
+        return f'&#{self.ordinal};'
+
+
+@dataclass(frozen=True)
+class TextSummary:
+    """Aggregate counts over a TextAnalysis (see TextAnalysis.summarize)."""
+
+    num_chars: int
+    utf8_bytes: int
+    utf16_bytes: int
+    num_tokens: int
+    counts: Dict[str, int]
+    categories: Dict[Optional[str], int]
+    scripts: Dict[Optional[str], int]
+    num_graphemes: int
+    clusters: Dict[str, int]
+    mixed_script_tokens: List['MixedScriptToken']
+    bidi_issues: List['BidiIssue']
+
+    def most_common(self, k: int) -> List[Tuple[str, int]]:
+        """Return the k most frequent characters with counts (ties in first-seen order)."""
+        return Counter(self.counts).most_common(k)
+
+    def most_common_clusters(self, k: int) -> List[Tuple[str, int]]:
+        """Return the k most frequent multi-codepoint grapheme clusters with counts."""
+        return Counter(self.clusters).most_common(k)
+
+
+def _utf8_length(cp: int) -> int:
+    """Number of bytes needed to encode a code point in UTF-8."""
+    if cp < 0x80:
+        return 1
+    if cp < 0x800:
+        return 2
+    if cp < 0x10000:
+        return 3
+    return 4
+
+
+# Maps a flags byte to b' ' for whitespace and b'x' otherwise (for token counting).
+_WHITESPACE_TRANSLATION: bytes = bytes(
+    0x20 if flags & FLAG_WHITESPACE else 0x78 for flags in range(256))
+# Script keys in TextAnalysis.mixed_script_tokens: characters that go with
+# any script, characters outside words, then one key per (script set, script).
+_ANY_SCRIPT_KEY: str = '\x00'
+_WORD_BREAK_KEY: str = '\x01'
+_FIRST_SCRIPT_KEY: int = 2
+# Two different script keys within a word, with only neutral characters between.
+_SCRIPT_CHANGE_PATTERN = re.compile(r'([^\x00\x01])\x00*(?!\1)[^\x00\x01]')
+
+
+@lru_cache(maxsize=CHARACTER_CACHE_SIZE)
+def _script_set(cp: int) -> Optional[FrozenSet[str]]:
+    """Augmented script set (UTS #39) of a code point, or None if it goes with any script.
+
+    The set is the character's Script_Extensions plus, for Han, Hiragana,
+    Katakana, Hangul and Bopomofo, the writing systems that combine them.
+    """
+    scripts = get_script_extensions(chr(cp))
+    if any(script in neutral_scripts for script in scripts):
+        return None
+    return frozenset(scripts).union(*(script_augmentation.get(script, ()) for script in scripts))
+
+
+# Script runs over script keys where 0 is Common/Inherited (see TextAnalysis.script_runs):
+# a script and any following characters of the same script or neutral ones.
+_SCRIPT_RUN_PATTERN = re.compile(rb'\x00*([^\x00])(?:\1|\x00)*|\x00+')
+
+
+def character_class(codepoints: Iterable[int]) -> str:
+    """Regex character class body matching the code points, as ranges."""
+    ranges: List[List[int]] = []
+    for cp in sorted(codepoints):
+        if ranges and ranges[-1][1] == cp - 1:
+            ranges[-1][1] = cp
+        else:
+            ranges.append([cp, cp])
+    return ''.join(re.escape(chr(first)) + (f'-{re.escape(chr(last))}' if last > first else '')
+                   for first, last in ranges)
+
+
+# Explicit directional formatting characters (UAX #9 section 2): embeddings
+# and overrides are closed by PDF, isolates by PDI, and a paragraph separator
+# (bidi class B) closes everything still open.
+_BIDI_CONTROL_PATTERN = re.compile('[\u202A-\u202E\u2066-\u2069]')
+_PARAGRAPH_SEPARATOR_PATTERN = re.compile('[\n\r\x1C-\x1E\x85\u2029]')
+_BIDI_EMBEDDING_CLASSES = frozenset({'LRE', 'RLE', 'LRO', 'RLO'})
+_BIDI_ISOLATE_CLASSES = frozenset({'LRI', 'RLI', 'FSI'})
+
+
+class BidiIssue(NamedTuple):
+    """An explicit bidi control that is not properly closed (see bidi_control_issues).
+
+    issue is 'unterminated' for an embedding, override or isolate still open
+    at the end of its paragraph (end is where the paragraph ends), or
+    'unmatched' for a PDF or PDI with nothing to close (end is start + 1).
+    """
+
+    start: int
+    end: int
+    control: str
+    issue: str
+
+
+def bidi_control_issues(text: str) -> List[BidiIssue]:
+    """Find unterminated and unmatched bidi controls (Trojan Source, CVE-2021-42574).
+
+    Follows the nesting rules of UAX #9 (X1-X8) in one pass over the
+    controls only: a PDF closes the innermost embedding or override unless
+    an isolate is open inside it, a PDI closes the innermost isolate along
+    with any embeddings opened after it, and a paragraph separator closes
+    everything. Text without bidi controls costs one regex search.
+
+    Args:
+        text: Any string, e.g. a whole source file.
 
     Returns:
-        List of CharacterInfo, one per character.
+        BidiIssue for each problem, ordered by start.
+    """
+    issues: List[BidiIssue] = []
+    stack: List[Tuple[int, str]] = []
+    last = 0
+
+    def close_paragraph(end: int) -> None:
+        issues.extend(BidiIssue(start, end, control, 'unterminated') for start, control in stack)
+        stack.clear()
+
+    for match in _BIDI_CONTROL_PATTERN.finditer(text):
+        pos = match.start()
+        if stack:
+            separator = _PARAGRAPH_SEPARATOR_PATTERN.search(text, last, pos)
+            if separator:
+                close_paragraph(separator.start())
+        last = pos
+        control = ud.bidirectional(match.group())
+        if control in _BIDI_EMBEDDING_CLASSES or control in _BIDI_ISOLATE_CLASSES:
+            stack.append((pos, control))
+        elif control == 'PDF':
+            if stack and stack[-1][1] in _BIDI_EMBEDDING_CLASSES:
+                stack.pop()
+            else:
+                issues.append(BidiIssue(pos, pos + 1, control, 'unmatched'))
+        else:
+            for i in range(len(stack) - 1, -1, -1):
+                if stack[i][1] in _BIDI_ISOLATE_CLASSES:
+                    del stack[i:]
+                    break
+            else:
+                issues.append(BidiIssue(pos, pos + 1, control, 'unmatched'))
+    if stack:
+        separator = _PARAGRAPH_SEPARATOR_PATTERN.search(text, last)
+        close_paragraph(separator.start() if separator else len(text))
+    issues.sort()
+    return issues
+
+
+class MixedScriptToken(NamedTuple):
+    """A word whose characters have no script in common (see TextAnalysis.mixed_script_tokens)."""
+
+    start: int
+    end: int
+    token: str
+    scripts: Tuple[str, ...]
+
+
+# Ways TextAnalysis builds its columns and summary counts: 'python' uses
+# str/bytes.translate and Counter, 'numpy' fancy-indexes the codepoint_table
+# columns and counts with np.bincount (needs NumPy installed).
+ANALYSIS_ENGINES = ('python', 'numpy')
+# examen_unicode uses the 'numpy' engine for texts at least this long, if installed.
+NUMPY_MIN_CHARS = 5000
+
+
+class TextAnalysis:
+    """Columnar per-character analysis of a text.
+
+    The text is stored once, with its distinct characters in code point
+    order; code points and the codepoint_table indices for category, bidi and
+    script, plus the flag bits and grapheme cluster symbols, are kept per
+    position in ``array`` columns. Indexing or iterating yields lazy
+    CharacterRow views; graphemes() iterates user-perceived characters.
+    Both engines (ANALYSIS_ENGINES) produce the same columns and summary.
     """
-    return [
-        CharacterInfo(
-            char=char,
-            name=get_name(char),
-            category=get_category(char),
-            digit=get_digit(char),
-            bidi=get_direction(char),
-            ordinal=ord(char),
-            code_point=get_code_point(char),
-            hex_code=get_code_point(char, False),
-            utf8_bytes=get_utf8_bytes(char),
-            html_entity=get_html_entity(char),
-            script=get_script(char),
-            homoglyph_risk=get_homoglyph_risk(char),
-            invisible=get_invisible_warning(char),
+
+    __slots__ = ('text', 'engine', 'distinct', 'codepoints', 'category', 'bidi', 'script', 'flags', 'grapheme')
+
+    def __init__(self, text: str, engine: str = 'python') -> None:
+        """Analyze text, filling one column entry per character.
+
+        Args:
+            text: String of Unicode characters to inspect.
+            engine: One of ANALYSIS_ENGINES.
+
+        Raises:
+            ValueError: If engine is unknown, or is 'numpy' and NumPy is not installed.
+        """
+        if engine not in ANALYSIS_ENGINES:
+            raise ValueError(f'unknown analysis engine {engine!r}')
+        if engine == 'numpy' and np is None:
+            raise ValueError('the numpy analysis engine needs NumPy installed')
+        table = codepoint_table
+        codepoints = array('I')
+        codepoints.frombytes(text.encode(_UTF32_NATIVE, 'surrogatepass'))
+        if engine == 'numpy':
+            # A zero-copy view of the code points; the distinct ones come
+            # from np.bincount, and each column is one vectorized gather.
+            index = np.frombuffer(codepoints, np.uint32)
+            present = np.flatnonzero(np.bincount(index)).astype(np.uint32)
+            for block in np.unique(present >> _TABLE_BLOCK_BITS).tolist():
+                table.ensure(block << _TABLE_BLOCK_BITS)
+            distinct = present.tobytes().decode(_UTF32_NATIVE, 'surrogatepass')
+
+            def gather(column: array) -> array:
+                return array('B', np.frombuffer(column, np.uint8)[index].tobytes())
+        else:
+            distinct = ''.join(sorted(set(text)))
+            for char in distinct:
+                table.ensure(ord(char))
+            if len(distinct) <= 256:
+                # Few distinct characters (the usual case): map each position
+                # to its distinct index once, then build every column with
+                # bytes.translate instead of a Python-level loop per position.
+                dense = text.translate(
+                    {ord(char): i for i, char in enumerate(distinct)}).encode('latin-1')
+
+                def gather(column: array) -> array:
+                    return array('B', dense.translate(
+                        bytes(column[ord(char)] for char in distinct).ljust(256, b'\0')))
+            else:
+                def gather(column: array) -> array:
+                    return array('B', operator.itemgetter(*codepoints)(column)
+                                 if len(codepoints) > 1 else [column[codepoints[0]]])
+        self.text: str = text
+        self.engine: str = engine
+        self.distinct: str = distinct
+        self.codepoints: array = codepoints
+        self.category: array = gather(table.category)
+        self.bidi: array = gather(table.bidi)
+        self.script: array = gather(table.script)
+        self.flags: array = gather(table.flags)
+        self.grapheme: array = gather(table.grapheme)
+
+    def __len__(self) -> int:
+        return len(self.codepoints)
+
+    def grapheme_spans(self) -> List[Tuple[int, int]]:
+        """Return (start, end) of each grapheme cluster longer than one code point."""
+        return grapheme_spans(self.grapheme.tobytes())
+
+    def graphemes(self) -> Iterator[str]:
+        """Iterate the extended grapheme clusters (UAX #29) of the text."""
+        text = self.text
+        pos = 0
+        for start, end in self.grapheme_spans():
+            yield from text[pos:start]
+            yield text[start:end]
+            pos = end
+        yield from text[pos:]
+
+    def bidi_issues(self) -> List[BidiIssue]:
+        """Unterminated and unmatched bidi controls (see bidi_control_issues)."""
+        if not _BIDI_CONTROL_PATTERN.search(self.distinct):
+            return []
+        return bidi_control_issues(self.text)
+
+    def _script_keys(self) -> bytes:
+        """Script column with Common, Inherited and unknown scripts mapped to 0."""
+        return self.script.tobytes().translate(codepoint_table.script_key_translation())
+
+    def script_runs(self) -> List[Tuple[int, int, str]]:
+        """Segment the text into runs of a single script.
+
+        Common and Inherited characters (spaces, punctuation, digits,
+        combining marks) belong to the run they follow, or to the first run
+        if they start the text.
+
+        Returns:
+            (start, end, script) for each run, covering the whole text; a
+            text without any specific script is one 'Common' run.
+        """
+        labels = codepoint_table.script_labels
+        return [(match.start(), match.end(), labels[match[1][0]] if match[1] else 'Common')
+                for match in _SCRIPT_RUN_PATTERN.finditer(self._script_keys())]
+
+    def mixed_script_tokens(self) -> List[MixedScriptToken]:
+        """Return the words that mix scripts, e.g. Latin 'paypal' with a Cyrillic 'а'.
+
+        Words are runs of letters, marks, digits and connector punctuation.
+        As in UTS #39, each character stands for its augmented
+        Script_Extensions set, Common and Inherited characters go with any
+        script, and a word is mixed-script when the sets of its characters
+        have no script in common (so Han with Hiragana is not). Words are
+        reported with the Script_Extensions of their characters, e.g.
+        'Latin' and 'Adlam/Arabic/...' for a Latin word with an ARABIC
+        TATWEEL; neutral characters are not listed. If the distinct
+        characters of the text share a script, no word can mix scripts;
+        otherwise one regex pass finds the words in which the script set
+        changes, and only those are checked.
+        """
+        table = codepoint_table
+        sets = {char: _script_set(ord(char)) for char in self.distinct}
+        specific = [scripts for scripts in sets.values() if scripts is not None]
+        if not specific or frozenset.intersection(*specific):
+            return []
+        key_index: Dict[Tuple[FrozenSet[str], Optional[str]], int] = {}
+        translation: Dict[int, str] = {}
+        for char, scripts in sets.items():
+            cp = ord(char)
+            if not table.flags[cp] & FLAG_WORD:
+                translation[cp] = _WORD_BREAK_KEY
+            elif scripts is None:
+                translation[cp] = _ANY_SCRIPT_KEY
+            else:
+                key = (scripts, '/'.join(get_script_extensions(char)))
+                translation[cp] = chr(key_index.setdefault(key, len(key_index) + _FIRST_SCRIPT_KEY))
+        key_sets = [scripts for scripts, _ in key_index]
+        key_labels = [label for _, label in key_index]
+        keys = self.text.translate(translation)
+        tokens: List[MixedScriptToken] = []
+        pos = 0
+        while True:
+            match = _SCRIPT_CHANGE_PATTERN.search(keys, pos)
+            if match is None:
+                return tokens
+            start = keys.rfind(_WORD_BREAK_KEY, 0, match.start()) + 1
+            pos = keys.find(_WORD_BREAK_KEY, match.end())
+            if pos == -1:
+                pos = len(keys)
+            present = [ord(key) - _FIRST_SCRIPT_KEY for key in dict.fromkeys(keys[start:pos])
+                       if key != _ANY_SCRIPT_KEY]
+            if not frozenset.intersection(*(key_sets[key] for key in present)):
+                tokens.append(MixedScriptToken(start, pos, self.text[start:pos],
+                                               tuple(dict.fromkeys(key_labels[key] for key in present))))
+
+    def summarize(self) -> TextSummary:
+        """Compute summary counts for the text.
+
+        Character counts come from a single Counter pass over the text; byte
+        lengths and per-category/script counts are derived from the distinct
+        characters, and tokens (whitespace-separated, as str.split) are
+        counted on the flags column, so no copies of the text are made.
+        Grapheme clusters are counted from the multi-codepoint spans only.
+        Mixed-script words come from mixed_script_tokens, and bidi control
+        problems from bidi_issues. The 'numpy' engine computes the character
+        and per-category/script counts with _numpy_counts instead.
+        """
+        if self.engine == 'numpy':
+            counts, utf8_bytes, utf16_units, categories, scripts = self._numpy_counts()
+        else:
+            counts = Counter(self.text)
+            table = codepoint_table
+            utf8_bytes = utf16_units = 0
+            categories = Counter()
+            scripts = Counter()
+            for char, n in counts.items():
+                cp = ord(char)
+                utf8_bytes += n * _utf8_length(cp)
+                utf16_units += n * (2 if cp > 0xFFFF else 1)
+                categories[table.category_labels[table.category[cp]]] += n
+                scripts[table.script_labels[table.script[cp]]] += n
+        spaces = self.flags.tobytes().translate(_WHITESPACE_TRANSLATION)
+        num_tokens = spaces.count(b' x') + spaces.startswith(b'x')
+        spans = self.grapheme_spans()
+        text = self.text
+        return TextSummary(
+            num_chars=len(self),
+            utf8_bytes=utf8_bytes,
+            utf16_bytes=2 * utf16_units,
+            num_tokens=num_tokens,
+            counts=dict(counts),
+            categories=dict(categories),
+            scripts=dict(scripts),
+            num_graphemes=len(self) - sum(end - start - 1 for start, end in spans),
+            clusters=dict(Counter(map(text.__getitem__, starmap(slice, spans)))),
+            mixed_script_tokens=self.mixed_script_tokens(),
+            bidi_issues=self.bidi_issues(),
         )
-        for char in text
-    ]
 
+    def _numpy_counts(self) -> Tuple[Dict[str, int], int, int, Dict[Optional[str], int], Dict[Optional[str], int]]:
+        """Character counts, UTF-8 bytes, UTF-16 units and category/script counts, vectorized.
+
+        np.bincount over the code points gives each character's count, and
+        over the category and script columns their histograms; keys are
+        ordered by first occurrence (np.minimum.at), as Counter(self.text)
+        would order them.
+        """
+        table = codepoint_table
+        codepoints = np.frombuffer(self.codepoints, np.uint32)
+        totals = np.bincount(codepoints)
+        first = np.full(len(totals), len(codepoints))
+        np.minimum.at(first, codepoints, np.arange(len(codepoints)))
+        unique = np.flatnonzero(totals)
+        unique = unique[np.argsort(first[unique], kind='stable')]
+        n = totals[unique]
+        utf8_bytes = int(n.sum() + n[unique >= 0x80].sum() + n[unique >= 0x800].sum()
+                         + n[unique >= 0x10000].sum())
+        utf16_units = len(self) + int(n[unique >= 0x10000].sum())
+
+        def histogram(column: array, table_column: array, labels: List[Optional[str]]) -> Dict[Optional[str], int]:
+            totals = np.bincount(np.frombuffer(column, np.uint8), minlength=len(labels))
+            present, first_key = np.unique(np.frombuffer(table_column, np.uint8)[unique], return_index=True)
+            return {labels[key]: int(totals[key]) for key in present[np.argsort(first_key)].tolist()}
+
+        return (dict(zip(map(chr, unique.tolist()), n.tolist())), utf8_bytes, utf16_units,
+                histogram(self.category, table.category, table.category_labels),
+                histogram(self.script, table.script, table.script_labels))
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[CharacterRow, List[CharacterRow]]:
+        if isinstance(index, slice):
+            return [CharacterRow(self, i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('TextAnalysis index out of range')
+        return CharacterRow(self, index)
+
+    def __iter__(self) -> Iterator[CharacterRow]:
+        for i in range(len(self)):
+            yield CharacterRow(self, i)
+
+
+def examen_unicode(text: str, engine: Optional[str] = None) -> TextAnalysis:
+    """Analyze every character of the given text.
+
+    Args:
+        text: String of Unicode characters to inspect.
+        engine: One of ANALYSIS_ENGINES; by default 'numpy' for texts of at
+            least NUMPY_MIN_CHARS characters when NumPy is installed, and
+            'python' otherwise.
+
+    Returns:
+        TextAnalysis with one row per character.
+
+    Raises:
+        ValueError: If engine is unknown, or is 'numpy' and NumPy is not installed.
+    """
+    if engine is None:
+        engine = 'numpy' if np is not None and len(text) >= NUMPY_MIN_CHARS else 'python'
+    return TextAnalysis(text, engine)
+
+
+# Hangul syllables decompose algorithmically; some unicodedata builds report
+# no decomposition() for them. Medial vowels and final consonants (V, T jamo)
+# can compose with a preceding syllable or jamo.
+_HANGUL_SYLLABLES = range(0xAC00, 0xD7A4)
+_HANGUL_COMPOSING_JAMO = ''.join(map(chr, [*range(0x1161, 0x1176), *range(0x11A8, 0x11C3)]))
+# C implementation of the quick check, when one for ud's Unicode version exists.
+_native_is_normalized = getattr(ud, 'is_normalized', None)
+if (_native_is_normalized is None
+        and _stdlib_unicodedata.unidata_version == ud.unidata_version):
+    _native_is_normalized = _stdlib_unicodedata.is_normalized
+# Above this many distinct unstable characters, is_normalized normalizes the
+# whole string rather than locating the span they cover.
+_QUICK_CHECK_MAX_SPAN_CHARS = 8
+
+
+class QuickCheck(NamedTuple):
+    """Normalization quick-check (UAX #15) data for one form."""
+
+    no: FrozenSet[str]
+    unstable: FrozenSet[str]
+
+
+@lru_cache(maxsize=None)
+def _quick_check_tables() -> Dict[NormalizationForm, QuickCheck]:
+    """Derive NFC_QC/NFD_QC/NFKC_QC/NFKD_QC data from unicodedata, once per process.
+
+    For each form, ``no`` holds the characters whose quick-check value is No
+    and ``unstable`` every character that is not a safe boundary (QC Yes with
+    combining class 0): QC No or Maybe, combining marks that may need
+    reordering, and characters whose full decomposition starts with one of
+    those (e.g. U+16D68 = U+16D67 U+16D67, which composes with what precedes it).
+    """
+    codespace = ''.join(map(chr, range(_CODESPACE_SIZE)))
+    marks = set(compress(codespace, map(ud.combining, codespace)))
+    decomposable = set(compress(codespace, map(ud.decomposition, codespace)))
+    decomposable.update(map(chr, _HANGUL_SYLLABLES))
+    canonical = {char for char in decomposable if not ud.decomposition(char).startswith('<')}
+    tables: Dict[NormalizationForm, QuickCheck] = {}
+    for form in NormalizationForm:
+        if form in (NormalizationForm.NFC, NormalizationForm.NFKC):
+            no = {char for char in decomposable if ud.normalize(form.value, char) != char}
+            # Second halves of canonical pairs that recompose may combine
+            # with the preceding character.
+            maybe = set(_HANGUL_COMPOSING_JAMO)
+            for char in canonical:
+                parts = ud.decomposition(char).split()
+                if len(parts) == 2 and ud.normalize('NFC', char) == char:
+                    maybe.add(chr(int(parts[1], 16)))
+            unstable = no | maybe | marks
+        else:
+            no = canonical if form is NormalizationForm.NFD else decomposable
+            unstable = no | marks
+        decompose = 'NFKD' if form in (NormalizationForm.NFKC, NormalizationForm.NFKD) else 'NFD'
+        unstable.update(char for char in decomposable if ud.normalize(decompose, char)[0] in unstable)
+        tables[form] = QuickCheck(frozenset(no), frozenset(unstable))
+    return tables
+
+
+def _quick_check(form: NormalizationForm, s: str, distinct: Union[set, FrozenSet[str]]) -> bool:
+    """Quick-check s (whose set of characters is distinct) for one form.
+
+    Any QC=No character means False; with no unstable characters the answer
+    is True; otherwise only the span covering the unstable characters is
+    normalized and compared.
+    """
+    table = _quick_check_tables()[form]
+    if not distinct.isdisjoint(table.no):
+        return False
+    found = distinct & table.unstable
+    if not found:
+        return True
+    if len(found) > _QUICK_CHECK_MAX_SPAN_CHARS:
+        return s == ud.normalize(form.value, s)
+    # Start one character early: marks may compose with the preceding boundary character.
+    start = max(min(s.find(char) for char in found) - 1, 0)
+    end = max(s.rfind(char) for char in found) + 1
+    segment = s[start:end]
+    return segment == ud.normalize(form.value, segment)
 
 
 def is_normalized(form: NormalizationForm, s: str) -> bool:
     """Return whether the string is already in the given normalization form.
 
+    Uses a C is_normalized matching ud's Unicode version when available,
+    otherwise the quick check in _quick_check, which avoids building a full
+    normalized copy of the string in the common cases.
+
     Args:
         form: Unicode normalization form (NFC, NFKC, NFD, or NFKD).
         s: Unicode string to check.
@@ -168,23 +963,29 @@ def is_normalized(form: NormalizationForm, s: str) -> bool:
     Returns:
         True if s is normalized in that form, False otherwise.
     """
-    return s == ud.normalize(form.value, s)
+    if s.isascii():
+        return True
+    if _native_is_normalized is not None:
+        return _native_is_normalized(form.value, s)
+    return _quick_check(form, s, set(s))
 
 
-def get_normalization_form(string: str) -> Dict[NormalizationForm, bool]:
+def get_normalization_form(string: str, distinct: Optional[str] = None) -> Dict[NormalizationForm, bool]:
     """Report which Unicode normalization forms the string is already in.
 
     Args:
         string: Unicode string to check.
+        distinct: Optional string of the distinct characters of string (e.g.
+            TextAnalysis.distinct), so they are not collected again.
 
     Returns:
         Dict mapping each normalization form to True if the string is
         normalized in that form, else False.
     """
-    normalization_form: Dict[NormalizationForm, bool] = {}
-    for form in NormalizationForm:
-        normalization_form[form] = is_normalized(form, string)
-    return normalization_form
+    if string.isascii() or _native_is_normalized is not None:
+        return {form: is_normalized(form, string) for form in NormalizationForm}
+    characters = set(distinct if distinct is not None else string)
+    return {form: _quick_check(form, string, characters) for form in NormalizationForm}
 
 
 def get_code_point(char: str, prefix: bool = True) -> str:
@@ -207,15 +1008,64 @@ def get_code_point(char: str, prefix: bool = True) -> str:
     return f'{ord(char):04X}'
 
 
+class AliasType(str, Enum):
+    """Formal name alias type label from NameAliases.txt."""
+
+    CORRECTION = 'correction'
+    CONTROL = 'control'
+    ALTERNATE = 'alternate'
+    FIGMENT = 'figment'
+    ABBREVIATION = 'abbreviation'
+
+
+class NameAlias(NamedTuple):
+    """One formal name alias and its type."""
+
+    alias: str
+    type: AliasType
+
+
+def _alias_key(name: str) -> str:
+    """Normalize an alias or name for lookup: uppercase, '_' as space, single spaces."""
+    return ' '.join(name.replace('_', ' ').upper().split())
+
+
 class Alias:
-    """Look up formal name aliases for Unicode characters from NameAliases.txt."""
+    """Look up formal name aliases for Unicode characters from NameAliases.txt.
+
+    The file is parsed once into a code point -> aliases index and a reverse
+    alias -> code point index, so lookups are dict hits rather than scans.
+    """
 
-    raw: str
+    entries: Dict[int, Tuple[NameAlias, ...]]
+    codepoints: Dict[str, int]
 
     def __init__(self) -> None:
-        """Load NameAliases.txt from the package files directory."""
+        """Load and index NameAliases.txt from the package files directory."""
+        entries: Dict[int, List[NameAlias]] = {}
+        codepoints: Dict[str, int] = {}
         with open(os.path.join(_APP_DIR, 'files', 'NameAliases.txt'), encoding='utf-8') as f:
-            self.raw = f.read()
+            for line in f:
+                line = line.split('#', 1)[0].strip()
+                if not line:
+                    continue
+                code, name, kind = (field.strip() for field in line.split(';'))
+                cp = int(code, 16)
+                entries.setdefault(cp, []).append(NameAlias(name, AliasType(kind.lower())))
+                codepoints.setdefault(_alias_key(name), cp)
+        self.entries = {cp: tuple(aliases) for cp, aliases in entries.items()}
+        self.codepoints = codepoints
+
+    def get_alias_entries(self, char: str) -> Tuple[NameAlias, ...]:
+        """Return formal name aliases for the character with their types, in file order.
+
+        Args:
+            char: Single Unicode character.
+
+        Returns:
+            Tuple of NameAlias (alias, type); empty if the character has none.
+        """
+        return self.entries.get(ord(char), ())
 
     def get_aliases(self, char: str) -> List[str]:
         """Return formal name aliases for the character.
@@ -226,9 +1076,7 @@ class Alias:
         Returns:
             List of alias strings.
         """
-        code_point: str = get_code_point(char, False)
-        pattern: str = f'{code_point};([A-Z ]+);'
-        return re.findall(pattern, self.raw, re.IGNORECASE)
+        return [entry.alias for entry in self.get_alias_entries(char)]
 
     def get_alias(self, char: str) -> str:
         """Return the first formal name alias for the character, or 'UNKNOWN'.
@@ -239,12 +1087,26 @@ class Alias:
         Returns:
             First alias string, or 'UNKNOWN' if none are found.
         """
-        aliases: List[str] = self.get_aliases(char)
+        entries: Tuple[NameAlias, ...] = self.get_alias_entries(char)
 
-        if aliases:
-            return aliases[0]
+        if entries:
+            return entries[0].alias
         return "UNKNOWN"
 
+    def lookup(self, name: str) -> Optional[str]:
+        """Resolve a formal name alias (e.g. 'NBSP', 'BOM', 'NULL') to its character.
+
+        Matching ignores case, treats '_' as a space and collapses whitespace.
+
+        Args:
+            name: Alias to resolve.
+
+        Returns:
+            The aliased character, or None if name is not an alias.
+        """
+        cp = self.codepoints.get(_alias_key(name))
+        return chr(cp) if cp is not None else None
+
 
 alias: Alias = Alias()
 
@@ -258,9 +1120,8 @@ def get_name(char: str) -> str:
     Returns:
         Official name or first alias string.
     """
-    try:
-        name: str = ud.name(char)
-    except ValueError:
+    name: Optional[str] = ud.name(char, None)
+    if name is None:
         name = alias.get_alias(char)
     return name
 
@@ -302,7 +1163,8 @@ def get_direction(char: str) -> Optional[str]:
         char: Single Unicode character.
 
     Returns:
-        Bidi class string (e.g. 'LEFT-TO-RIGHT'), or None if not in our mapping.
+        Bidi class string (e.g. 'LEFT-TO-RIGHT', 'RIGHT-TO-LEFT OVERRIDE'),
+        or None for invalid input.
     """
     try:
         return bidi[ud.bidirectional(char)]
@@ -326,6 +1188,230 @@ def get_east_asian_width(char: str) -> Optional[str]:
     except (ValueError, TypeError):
         return None
 
+# Grapheme_Cluster_Break values (UAX #29) as one-byte symbols, so a text's
+# classes form a bytes string that the cluster pattern below can scan in C.
+# Extended_Pictographic and Indic_Conjunct_Break refine Other and Extend.
+_GRAPHEME_SYMBOLS: Dict[str, bytes] = {
+    'CR': b'r', 'LF': b'n', 'Control': b'c', 'Extend': b'e', 'ZWJ': b'z',
+    'Regional_Indicator': b'i', 'Prepend': b'p', 'SpacingMark': b's',
+    'L': b'L', 'V': b'V', 'T': b'T', 'LV': b'A', 'LVT': b'B', 'Other': b'x',
+}
+_GRAPHEME_REFINEMENTS: Dict[Tuple[bytes, str], bytes] = {
+    (b'x', 'Extended_Pictographic'): b'g',
+    (b'x', 'InCB; Consonant'): b'C',
+    (b'e', 'InCB; Linker'): b'l',
+    (b'e', 'InCB; Extend'): b'k',
+    (b'z', 'InCB; Extend'): b'z',
+}
+
+_GRAPHEME_OTHER: int = _GRAPHEME_SYMBOLS['Other'][0]
+_GRAPHEME_EXTEND: int = _GRAPHEME_SYMBOLS['Extend'][0]
+
+# One extended grapheme cluster, after the regular expression in UAX #29
+# Table 1c, over the symbols above.
+_GRAPHEME_CLUSTER = re.compile(rb"""
+    rn | [rnc]                      # GB3-GB5: CR LF, controls
+  | p* (?:                          # GB9b: prepend
+        L* (?: V+ | AV* | B ) T*    # GB6-GB8: Hangul syllables
+      | L+ | T+
+      | ii                          # GB12-GB13: regional indicator pairs
+      | g (?: [ekl]* z g )*         # GB11: emoji ZWJ sequences
+      | C (?: [klz]* l [klz]* C )+  # GB9c: Indic conjuncts
+      | [^rnc]
+    ) [eklzs]*                      # GB9-GB9a: extend, ZWJ, spacing marks
+""", re.VERBOSE)
+
+# Stretches that may hold multi-codepoint clusters. Other (x) only joins a
+# following extender or a preceding Prepend, so every boundary between two
+# x outside a Prepend is a break and runs of x can be skipped; so can
+# controls (always clusters of their own) other than CR LF.
+_GRAPHEME_REGION = re.compile(rb'(?:x?[^xrnc]|(?<=p)x|rn)+')
+
+
+def _read_property_ranges(filename: str) -> Iterator[Tuple[int, int, str]]:
+    """Yield (first, last, value) from a UCD-style property file in files/."""
+    with open(os.path.join(_APP_DIR, 'files', filename), encoding='utf-8') as f:
+        for line in f:
+            line = line.split('#', 1)[0].strip()
+            if not line:
+                continue
+            codepoints, value = line.split(';', 1)
+            first, _, last = codepoints.strip().partition('..')
+            yield int(first, 16), int(last or first, 16), ' '.join(value.split())
+
+
+@lru_cache(maxsize=None)
+def _grapheme_file_classes() -> bytes:
+    """Grapheme symbol of every code point, indexed by code point.
+
+    Loaded from files/GraphemeBreakProperty.txt and
+    files/GraphemeExtraProperties.txt (Unicode 16.0.0); CodepointTable adds
+    marks assigned since then.
+    """
+    classes = bytearray(_GRAPHEME_SYMBOLS['Other'] * _CODESPACE_SIZE)
+    for first, last, value in _read_property_ranges('GraphemeBreakProperty.txt'):
+        classes[first:last + 1] = _GRAPHEME_SYMBOLS[value] * (last - first + 1)
+    for first, last, value in _read_property_ranges('GraphemeExtraProperties.txt'):
+        for cp in range(first, last + 1):
+            symbol = _GRAPHEME_REFINEMENTS.get((bytes(classes[cp:cp + 1]), value))
+            if symbol is None:
+                raise ValueError(f'Unexpected grapheme property {value!r} for U+{cp:04X}')
+            classes[cp] = symbol[0]
+    return bytes(classes)
+
+
+def grapheme_spans(classes: bytes) -> List[Tuple[int, int]]:
+    """Find the grapheme clusters longer than one code point.
+
+    Args:
+        classes: Grapheme symbol per character (CodepointTable.grapheme).
+
+    Returns:
+        (start, end) character offsets of each multi-codepoint cluster, in
+        order; every other character is a cluster on its own.
+    """
+    if not classes.translate(None, b'xrnc'):
+        # Only Other and controls: CR LF is the one cluster that can be longer.
+        return [match.span() for match in re.finditer(b'rn', classes)]
+    spans: List[Tuple[int, int]] = []
+    for region in _GRAPHEME_REGION.finditer(classes):
+        # Cluster lengths -> offsets -> spans of the long ones, all in C.
+        start, end = region.span()
+        lengths = list(map(len, _GRAPHEME_CLUSTER.findall(classes, start, end)))
+        offsets = list(accumulate(lengths, initial=start))
+        spans.extend(compress(zip(offsets, offsets[1:]), map((1).__lt__, lengths)))
+    return spans
+
+
+class CodepointAttributes(NamedTuple):
+    """Table-backed attributes of one code point (see CodepointTable.lookup)."""
+
+    category: Optional[str]
+    bidi: Optional[str]
+    script: Optional[str]
+    digit: Optional[int]
+    homoglyph_risk: Optional[str]
+    invisible: Optional[str]
+
+
+class CodepointTable:
+    """Precomputed per-codepoint attributes for the whole code space.
+
+    Each column is an ``array`` indexed by code point. Category, bidi and
+    script columns hold small integers into interned label lists (index 0 is
+    None), and the grapheme column holds grapheme cluster symbols (see
+    grapheme_spans), so a lookup is a few array reads instead of several unicodedata
+    calls. Blocks of 256 code points are computed on first access, so the
+    table covers U+0000..U+10FFFF without paying for all of it at import time;
+    call fill() to precompute everything.
+    """
+
+    def __init__(self) -> None:
+        """Allocate empty columns; blocks are filled lazily."""
+        self.category: array = array('B', bytes(_CODESPACE_SIZE))
+        self.bidi: array = array('B', bytes(_CODESPACE_SIZE))
+        self.script: array = array('B', bytes(_CODESPACE_SIZE))
+        self.digit: array = array('b', [-1]) * _CODESPACE_SIZE
+        self.flags: array = array('B', bytes(_CODESPACE_SIZE))
+        self.grapheme: array = array('B', bytes(_CODESPACE_SIZE))
+        self.category_labels: List[Optional[str]] = [None]
+        self.bidi_labels: List[Optional[str]] = [None]
+        self.script_labels: List[Optional[str]] = [None]
+        self._category_index: Dict[Optional[str], int] = {None: 0}
+        self._bidi_index: Dict[Optional[str], int] = {None: 0}
+        self._script_index: Dict[Optional[str], int] = {None: 0}
+        self._filled: bytearray = bytearray(_CODESPACE_SIZE >> _TABLE_BLOCK_BITS)
+
+    @staticmethod
+    def _intern(labels: List[Optional[str]], index: Dict[Optional[str], int],
+                value: Optional[str]) -> int:
+        """Return the index of value in labels, appending it if new."""
+        idx = index.get(value)
+        if idx is None:
+            idx = len(labels)
+            labels.append(value)
+            index[value] = idx
+        return idx
+
+    def _fill_block(self, block: int) -> None:
+        """Compute every column for one block of code points."""
+        start = block << _TABLE_BLOCK_BITS
+        grapheme = _grapheme_file_classes()
+        for cp in range(start, start + _TABLE_BLOCK_SIZE):
+            char = chr(cp)
+            self.category[cp] = self._intern(
+                self.category_labels, self._category_index, get_category(char))
+            self.bidi[cp] = self._intern(
+                self.bidi_labels, self._bidi_index, get_direction(char))
+            self.script[cp] = self._intern(
+                self.script_labels, self._script_index, get_script(char))
+            digit = get_digit(char)
+            if digit is not None:
+                self.digit[cp] = digit
+            flags = 0
+            if is_confusable_codepoint(cp):
+                flags |= FLAG_HOMOGLYPH
+            if cp in INVISIBLE_CHARACTERS:
+                flags |= FLAG_INVISIBLE
+            if char.isspace():
+                flags |= FLAG_WHITESPACE
+            general = ud.category(char)
+            if general[0] in 'LMN' or general == 'Pc' or cp in _WORD_JOINERS:
+                flags |= FLAG_WORD
+            self.flags[cp] = flags
+            symbol = grapheme[cp]
+            if symbol == _GRAPHEME_OTHER and general in ('Mn', 'Me'):
+                symbol = _GRAPHEME_EXTEND  # marks newer than the vendored data
+            self.grapheme[cp] = symbol
+        self._filled[block] = 1
+
+    def script_key_translation(self) -> bytes:
+        """bytes.translate table mapping neutral script indices to 0.
+
+        Common and Inherited, and None (no data), are neutral; every other
+        script index is kept.
+        """
+        labels = self.script_labels
+        return bytes(0 if i >= len(labels) or labels[i] is None or labels[i] in neutral_scripts else i
+                     for i in range(256))
+
+    def ensure(self, cp: int) -> None:
+        """Make sure the block containing cp has been computed."""
+        block = cp >> _TABLE_BLOCK_BITS
+        if not self._filled[block]:
+            self._fill_block(block)
+
+    def fill(self) -> None:
+        """Precompute every block of the code space."""
+        for block, filled in enumerate(self._filled):
+            if not filled:
+                self._fill_block(block)
+
+    def lookup(self, cp: int) -> CodepointAttributes:
+        """Return the table attributes for a code point.
+
+        Args:
+            cp: Code point in U+0000..U+10FFFF.
+
+        Returns:
+            CodepointAttributes with display labels (or None) for each column.
+        """
+        self.ensure(cp)
+        flags = self.flags[cp]
+        digit = self.digit[cp]
+        return CodepointAttributes(
+            category=self.category_labels[self.category[cp]],
+            bidi=self.bidi_labels[self.bidi[cp]],
+            script=self.script_labels[self.script[cp]],
+            digit=digit if digit >= 0 else None,
+            homoglyph_risk='Yes' if flags & FLAG_HOMOGLYPH else None,
+            invisible=INVISIBLE_CHARACTERS[cp] if flags & FLAG_INVISIBLE else None,
+        )
+
+
+codepoint_table: CodepointTable = CodepointTable()
+
+
 @dataclass
 class CodepointDescription:
     """Character attributes for the codepoint detail page."""
@@ -337,6 +1423,9 @@ class CodepointDescription:
     category: Optional[str]
     digit: Optional[int]
     direction: Optional[str]
+    script: Optional[str]
+    script_extensions: str
+    unicode_block: Optional[Block]
     integer: int
     upper: str
     lower: str
@@ -352,19 +1441,27 @@ def get_character_page_description(char: str) -> CodepointDescription:
         char: Single Unicode character.
 
     Returns:
-        CodepointDescription with all fields for the codepoint template.
+        CodepointDescription with all fields for the codepoint template;
+        char, upper and lower are empty for surrogates, which cannot be
+        encoded in a page.
     """
+    attrs = codepoint_table.lookup(ord(char))
+    name = get_name(char)
+    shown = '' if 0xD800 <= ord(char) <= 0xDFFF else char
     return CodepointDescription(
-        title=get_name(char),
+        title=name,
         tagline=get_code_point(char),
-        char=char,
-        name=get_name(char),
-        category=get_category(char),
-        digit=get_digit(char),
-        direction=get_direction(char),
+        char=shown,
+        name=name,
+        category=attrs.category,
+        digit=attrs.digit,
+        direction=attrs.bidi,
+        script=attrs.script,
+        script_extensions=', '.join(get_script_extensions(char)),
+        unicode_block=get_block(char),
         integer=ord(char),
-        upper=char.upper(),
-        lower=char.lower(),
+        upper=shown.upper(),
+        lower=shown.lower(),
         decomposition=ud.decomposition(char),
         aliases=', '.join(alias.get_aliases(char)),
         east_asian=get_east_asian_width(char),
@@ -1,10 +1,33 @@
-from django.urls import path
+from django.urls import path, register_converter
 from decode import views
 
+
+class HexConverter:
+    """A code point in hex (1 to 6 digits), passed to the view as an int."""
+    regex = '[0-9A-Fa-f]{1,6}'
+
+    def to_python(self, value):
+        return int(value, 16)
+
+    def to_url(self, value):
+        return f'{value:04X}'
+
+
+register_converter(HexConverter, 'hex')
+
 urlpatterns = [
     path('', views.decode, name='decode'),
+    path('live', views.decode_live, name='decode_live'),
+    path('rows', views.decode_rows, name='decode_rows'),
+    path('api/decode', views.decode_api, name='decode_api'),
+    path('api/confusables', views.confusables_api, name='confusables_api'),
+    path('api/sanitize', views.sanitize_api, name='sanitize_api'),
+    path('api/search', views.search_api, name='search_api'),
     path('about', views.about, name='about'),
+    path('block/<str:name>', views.block, name='block'),
     path('codepoint/<slug:slug>', views.codepoint, name='codepoint'),
+    path('range/<hex:start>-<hex:end>', views.codepoint_range, name='codepoint_range'),
+    path('search', views.search, name='search'),
     path('terms', views.terms, name='terms'),
     path('tofu', views.tofu, name='tofu'),
     path('privacy', views.privacy, name='privacy'),
@@ -1,7 +1,13 @@
-"""Tests for decode view (home and ?s= URL parameter)."""
+"""Tests for decode views (home, ?s= URL parameter, result cache, large inputs, live edits, API, search)."""
 
+import json
+from unittest import mock
+
+from django.core.cache import cache
 from django.test import Client, TestCase
 from django.urls import reverse
+import decode.unicode_util as u
+from decode import result_cache, views
 
 
 class DecodeViewTestCase(TestCase):
@@ -9,6 +15,7 @@ class DecodeViewTestCase(TestCase):
 
     def setUp(self):
         self.client = Client()
+        cache.clear()
 
     def test_decode_get_with_s_param(self):
         """GET with ?s=... shows decode results for that string (e.g. /?s=abcd)."""
@@ -16,7 +23,7 @@ class DecodeViewTestCase(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertIn('text', response.context)
         self.assertIn('normalization_form', response.context)
-        self.assertIsInstance(response.context['text'], list)
+        self.assertIsInstance(response.context['text'], u.TextAnalysis)
         self.assertEqual(len(response.context['text']), 4)
         # Form is prefilled with the query string
         self.assertEqual(response.context['form'].initial.get('text'), 'abcd')
@@ -38,6 +45,32 @@ class DecodeViewTestCase(TestCase):
         self.assertIn('form', response.context)
         self.assertNotIn('text', response.context)
 
+    def test_summary_shows_grapheme_clusters(self):
+        """The summary counts grapheme clusters and lists multi-codepoint ones."""
+        response = self.client.post(reverse('decode'), {'text': 'e\u0301\U0001F1FA\U0001F1F8'})
+        content = response.content.decode('utf-8')
+        self.assertIn('4 characters', content)
+        self.assertIn('2 grapheme clusters', content)
+        self.assertIn('title="U+0065 U+0301">e\u0301</span> (1)', content)
+
+    def test_summary_warns_about_mixed_script_words(self):
+        """Mixed-script words are listed in the summary with their scripts."""
+        response = self.client.post(reverse('decode'), {'text': 'visit p\u0430ypal today'})
+        content = response.content.decode('utf-8')
+        self.assertIn('1 mixed-script word:', content)
+        self.assertIn('<span title="Latin, Cyrillic">p\u0430ypal</span>', content)
+        response = self.client.post(reverse('decode'), {'text': 'visit paypal today'})
+        self.assertNotIn('mixed-script', response.content.decode('utf-8'))
+
+    def test_summary_warns_about_bidi_controls(self):
+        """Unterminated bidi overrides are flagged in the summary."""
+        response = self.client.post(reverse('decode'), {'text': 'user\u202e // admin'})
+        content = response.content.decode('utf-8')
+        self.assertIn('1 unbalanced bidi control', content)
+        self.assertIn('unterminated RLO at character 4', content)
+        response = self.client.post(reverse('decode'), {'text': 'user\u202e\u202c'})
+        self.assertNotIn('unbalanced bidi', response.content.decode('utf-8'))
+
     def test_decode_live_post_returns_results_fragment(self):
         """Live POST path should return HTML fragment instead of full page."""
         response = self.client.post(
@@ -49,3 +82,378 @@ class DecodeViewTestCase(TestCase):
         content = response.content.decode('utf-8')
         self.assertIn('Character Details', content)
         self.assertNotIn('<html', content.lower())
+
+
+class ResultCacheTestCase(TestCase):
+    """Rendered ?s= results are shared through the result cache."""
+
+    def setUp(self):
+        self.client = Client()
+        cache.clear()
+
+    def test_second_request_is_a_hit(self):
+        """The second request for the same text reuses the fragment without analyzing the text."""
+        first = self.client.get(reverse('decode'), {'s': 'p\u0430ypal'})
+        self.assertEqual(first['X-Decode-Cache'], 'MISS')
+        with mock.patch.object(u, 'examen_unicode') as examen:
+            second = self.client.get(reverse('decode'), {'s': 'p\u0430ypal'})
+        examen.assert_not_called()
+        self.assertEqual(second['X-Decode-Cache'], 'HIT')
+        fragment = cache.get(result_cache.result_key('p\u0430ypal')).encode('utf-8')
+        self.assertIn(fragment, first.content)
+        self.assertIn(fragment, second.content)
+        self.assertEqual(second.context['form'].initial.get('text'), 'p\u0430ypal')
+        self.assertEqual(self.client.get(reverse('decode'), {'s': 'paypal'})['X-Decode-Cache'], 'MISS')
+        stats = result_cache.stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 2))
+        self.assertAlmostEqual(stats['hit_rate'], 1 / 3)
+
+    def test_key_includes_unicode_version(self):
+        """Keys change with the Unicode data version."""
+        key = result_cache.result_key('abc')
+        with mock.patch.object(result_cache.ud, 'unidata_version', '0.0.0'):
+            self.assertNotEqual(result_cache.result_key('abc'), key)
+
+    def test_long_inputs_are_not_admitted(self):
+        """Inputs over RESULT_CACHE_MAX_CHARS bypass the cache."""
+        text = 'a' * (result_cache.RESULT_CACHE_MAX_CHARS + 1)
+        response = self.client.get(reverse('decode'), {'s': text})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('X-Decode-Cache', response)
+        self.assertIsNone(cache.get(result_cache.result_key(text)))
+
+    def test_large_fragments_are_rejected(self):
+        """Rendered fragments over RESULT_CACHE_MAX_BYTES are not stored."""
+        with mock.patch.object(result_cache, 'RESULT_CACHE_MAX_BYTES', 100):
+            self.client.get(reverse('decode'), {'s': 'abc'})
+            self.assertEqual(self.client.get(reverse('decode'), {'s': 'abc'})['X-Decode-Cache'], 'MISS')
+        self.assertEqual(result_cache.stats()['rejected'], 2)
+
+
+class RowWindowTestCase(TestCase):
+    """Only the first ROWS_PAGE_SIZE rows are rendered; the rest come from decode_rows."""
+
+    def setUp(self):
+        self.client = Client()
+        cache.clear()
+
+    def test_small_input_renders_all_rows(self):
+        """Texts within one page render every row and a hidden pager."""
+        response = self.client.post(reverse('decode'), {'text': 'abc'})
+        content = response.content.decode('utf-8')
+        self.assertEqual(content.count('<tr data-char='), 3)
+        self.assertIn('id="decode-rows-more"', content)
+        self.assertIn('style="display: none;"', content)
+        self.assertIsNone(response.context['revision'])
+
+    def test_large_input_renders_first_window(self):
+        """Longer texts render one page of rows but summarize the whole text."""
+        with mock.patch.object(views, 'ROWS_PAGE_SIZE', 3):
+            response = self.client.post(reverse('decode'), {'text': 'abcdefg'})
+        content = response.content.decode('utf-8')
+        self.assertEqual(content.count('<tr data-char='), 3)
+        self.assertIn('7 characters', content)
+        revision = response.context['revision']
+        self.assertIn(f'data-revision="{revision}" data-total="7"', content)
+
+    def test_rows_endpoint_returns_window(self):
+        """decode_rows renders the requested slice of the stored text."""
+        with mock.patch.object(views, 'ROWS_PAGE_SIZE', 3):
+            revision = self.client.post(reverse('decode'), {'text': 'abcde\U0001F600g'}).context['revision']
+            response = self.client.get(reverse('decode_rows'), {'revision': revision, 'start': 3})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('max-age', response['Cache-Control'])
+        data = response.json()
+        self.assertEqual((data['start'], data['total']), (3, 7))
+        self.assertEqual(data['rows'].count('<tr data-char='), 3)
+        self.assertIn('data-char="d"', data['rows'])
+        self.assertIn('data-char="\U0001F600"', data['rows'])
+        self.assertNotIn('data-char="g"', data['rows'])
+
+    def test_rows_endpoint_errors(self):
+        """Unknown revisions get 409 and invalid windows 400, neither of them cacheable."""
+        response = self.client.get(reverse('decode_rows'), {'revision': 'missing', 'start': 0})
+        self.assertEqual(response.status_code, 409)
+        self.assertIn('no-store', response['Cache-Control'])
+        self.assertNotIn('max-age=3600', response['Cache-Control'])
+        response = self.client.get(reverse('decode_rows'), {'revision': 'missing', 'start': -1})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('no-store', response['Cache-Control'])
+
+    def test_live_delta_caps_rows(self):
+        """Live deltas send at most one page of inserted rows, plus the counts."""
+        revision = views._live_revision('ab')
+        with mock.patch.object(views, 'ROWS_PAGE_SIZE', 2):
+            response = self.client.post(reverse('decode_live'), {
+                'revision': revision, 'offset': 1, 'deleted': 0, 'inserted': 'xyz',
+            })
+        data = response.json()
+        self.assertEqual((data['start'], data['inserted'], data['total']), (1, 3, 5))
+        self.assertEqual(data['rows'].count('<tr data-char='), 2)
+
+    def test_cached_result_keeps_revision_loadable(self):
+        """A result cache hit stores the text again for its revision."""
+        with mock.patch.object(views, 'ROWS_PAGE_SIZE', 3):
+            revision = self.client.get(reverse('decode'), {'s': 'abcdefg'}).context['revision']
+            cache.delete(f'decode-live:{revision}')
+            response = self.client.get(reverse('decode'), {'s': 'abcdefg'})
+        self.assertEqual(response['X-Decode-Cache'], 'HIT')
+        self.assertEqual(cache.get(f'decode-live:{revision}'), 'abcdefg')
+
+
+class LargeInputDecodeTestCase(TestCase):
+    """Large inputs get a regular response with one page of rows."""
+
+    def setUp(self):
+        self.client = Client()
+
+    def test_large_input_not_streamed(self):
+        """The page and the live fragment are rendered whole, each row once."""
+        text = 'abcde' * 5
+        with mock.patch.object(views, 'ROWS_PAGE_SIZE', 4), \
+                mock.patch.object(views, 'render_rows', wraps=views.render_rows) as render_rows:
+            response = self.client.post(reverse('decode'), {'text': text})
+            live = self.client.post(reverse('decode'), {'text': text}, HTTP_X_DECODE_LIVE='1')
+        self.assertFalse(response.streaming)
+        self.assertFalse(live.streaming)
+        self.assertContains(response, '<tr data-char=', count=4)
+        self.assertContains(live, '<tr data-char=', count=4)
+        self.assertEqual([call.args for call in render_rows.call_args_list], [('abcd',), ('abcd',)])
+
+
+class LiveDeltaTestCase(TestCase):
+    """Live decode delta protocol (decode_live view)."""
+
+    def setUp(self):
+        self.client = Client()
+
+    def _revision(self, text):
+        response = self.client.post(reverse('decode'), {'text': text}, HTTP_X_DECODE_LIVE='1')
+        return response['X-Decode-Revision']
+
+    def _edit(self, revision, offset, deleted, inserted):
+        return self.client.post(reverse('decode_live'), {
+            'revision': revision, 'offset': offset, 'deleted': deleted, 'inserted': inserted,
+        })
+
+    def test_full_live_post_returns_revision(self):
+        """The full live fragment carries a revision header."""
+        self.assertTrue(self._revision('abc'))
+
+    def test_insert_returns_only_new_rows(self):
+        """Inserting one character returns one row plus the recomputed sections."""
+        response = self._edit(self._revision('hello'), 5, 0, '!')
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual((data['start'], data['deleted']), (5, 0))
+        self.assertEqual(data['rows'].count('<tr data-char='), 1)
+        self.assertIn('data-char="!"', data['rows'])
+        self.assertIn('6 characters', data['summary'])
+        self.assertIn('id="decode-summary"', data['summary'])
+        self.assertIn('id="decode-normalization"', data['normalization'])
+        self.assertEqual(data['revision'], self._revision('hello!'))
+
+    def test_replace_with_utf16_offsets(self):
+        """Offsets are UTF-16 units: an emoji counts as two, but is one row."""
+        revision = self._revision('a\U0001F600b')
+        data = self._edit(revision, 1, 2, 'xy').json()
+        self.assertEqual((data['start'], data['deleted']), (1, 1))
+        self.assertEqual(data['rows'].count('<tr data-char='), 2)
+        data = self._edit(revision, 3, 1, '').json()
+        self.assertEqual((data['start'], data['deleted']), (2, 1))
+        self.assertNotIn('<tr', data['rows'])
+
+    def test_unknown_revision(self):
+        """An unknown revision asks the client to resend the full text."""
+        self.assertEqual(self._edit('missing', 0, 0, 'a').status_code, 409)
+
+    def test_invalid_edit(self):
+        """Edits past the end or splitting a surrogate pair are rejected."""
+        revision = self._revision('a\U0001F600')
+        self.assertEqual(self._edit(revision, 2, 5, '').status_code, 400)
+        self.assertEqual(self._edit(revision, 2, 0, 'x').status_code, 400)
+        self.assertEqual(self.client.get(reverse('decode_live')).status_code, 405)
+
+
+class DecodeApiTestCase(TestCase):
+    """JSON batch decode endpoint."""
+
+    def setUp(self):
+        self.client = Client()
+        self.url = reverse('decode_api')
+
+    def _post(self, payload, query='', content_type='application/json'):
+        body = payload if isinstance(payload, str) else json.dumps(payload)
+        return self.client.post(self.url + query, body, content_type=content_type)
+
+    def test_array_of_strings(self):
+        """A JSON array returns one full result per string, in order."""
+        response = self._post(['ab', 'é'])
+        self.assertEqual(response.status_code, 200)
+        results = response.json()['results']
+        self.assertEqual(len(results), 2)
+        self.assertEqual(set(results[0]), set(views.API_SECTIONS))
+        self.assertEqual(results[0]['characters'][1]['name'], 'LATIN SMALL LETTER B')
+        self.assertEqual(set(results[0]['characters'][0]), set(views.API_CHARACTER_FIELDS))
+        self.assertEqual(results[1]['normalization'], {'NFC': True, 'NFKC': True, 'NFD': False, 'NFKD': False})
+        self.assertEqual(results[1]['summary']['utf8_bytes'], 2)
+
+    def test_field_and_section_selection(self):
+        """fields and sections limit what is computed and returned."""
+        response = self._post({'texts': ['aa'], 'fields': ['code_point', 'name'], 'sections': ['characters']})
+        self.assertEqual(response.json()['results'], [{'characters': [
+            {'name': 'LATIN SMALL LETTER A', 'code_point': 'U+0061'},
+            {'name': 'LATIN SMALL LETTER A', 'code_point': 'U+0061'},
+        ]}])
+        response = self._post(['a'], query='?sections=summary')
+        self.assertEqual(list(response.json()['results'][0]), ['summary'])
+
+    def test_ndjson(self):
+        """NDJSON input gets a streamed NDJSON response, one line per input line."""
+        body = '"abc"\n\n{"text": "x y"}\n'
+        response = self._post(body, query='?sections=summary', content_type='application/x-ndjson')
+        self.assertTrue(response.streaming)
+        lines = b''.join(response.streaming_content).decode('utf-8').splitlines()
+        self.assertEqual([json.loads(line)['summary']['num_tokens'] for line in lines], [1, 2])
+
+    def test_mixed_script_tokens_in_summary(self):
+        """The summary lists every mixed-script word with its position and scripts."""
+        response = self._post(['x \u0430b c\u0434'], query='?sections=summary')
+        self.assertEqual(response.json()['results'][0]['summary']['mixed_script_tokens'], [
+            {'start': 2, 'end': 4, 'token': '\u0430b', 'scripts': ['Cyrillic', 'Latin']},
+            {'start': 5, 'end': 7, 'token': 'c\u0434', 'scripts': ['Latin', 'Cyrillic']},
+        ])
+
+    def test_bidi_issues_in_summary(self):
+        """The summary lists unterminated and unmatched bidi controls with their positions."""
+        response = self._post(['a\u2067b\n\u2069'], query='?sections=summary')
+        self.assertEqual(response.json()['results'][0]['summary']['bidi_issues'], [
+            {'start': 1, 'end': 3, 'control': 'RLI', 'issue': 'unterminated'},
+            {'start': 4, 'end': 5, 'control': 'PDI', 'issue': 'unmatched'},
+        ])
+
+    def test_invalid_requests(self):
+        """Malformed bodies and unknown fields return 400; GET is not allowed."""
+        self.assertEqual(self._post('not json').status_code, 400)
+        self.assertEqual(self._post({'texts': 'abc'}).status_code, 400)
+        self.assertEqual(self._post([1, 2]).status_code, 400)
+        response = self._post({'texts': ['a'], 'fields': ['nope']})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('fields', response.json()['error'])
+        self.assertEqual(self._post({'texts': ['a'], 'fields': [{}]}).status_code, 400)
+        self.assertEqual(self._post({'texts': ['a'], 'sections': [['summary']]}).status_code, 400)
+        self.assertEqual(self.client.get(self.url).status_code, 405)
+
+
+class ConfusablesApiTestCase(TestCase):
+    """Bulk confusable screening endpoint."""
+
+    def setUp(self):
+        self.client = Client()
+        self.url = reverse('confusables_api')
+
+    def _post(self, payload):
+        body = payload if isinstance(payload, str) else json.dumps(payload)
+        return self.client.post(self.url, body, content_type='application/json')
+
+    def test_matches_candidates_against_targets(self):
+        """Matching candidates are returned with their targets, in input order."""
+        response = self._post({'targets': ['paypal', 'apple'],
+                               'candidates': ['bob', '\u0430pple', 'p\u0430yp\u0430l']})
+        self.assertEqual(response.status_code, 200)
+        matches = response.json()['matches']
+        self.assertEqual([(m['index'], m['candidate'], m['targets']) for m in matches],
+                         [(1, '\u0430pple', ['apple']), (2, 'p\u0430yp\u0430l', ['paypal'])])
+        self.assertEqual(matches[0]['skeleton'], 'apple')
+
+    def test_rejects_malformed_requests(self):
+        """Bad JSON, missing lists and non-string items are 400; GET is 405."""
+        self.assertEqual(self._post('{').status_code, 400)
+        self.assertEqual(self._post(['a']).status_code, 400)
+        self.assertEqual(self._post({'targets': ['a']}).status_code, 400)
+        self.assertEqual(self._post({'targets': ['a'], 'candidates': [1]}).status_code, 400)
+        self.assertEqual(self.client.get(self.url).status_code, 405)
+
+
+class SanitizeApiTestCase(TestCase):
+    """Bulk sanitizing endpoint."""
+
+    def setUp(self):
+        self.client = Client()
+        self.url = reverse('sanitize_api')
+
+    def _post(self, payload, url=None):
+        body = payload if isinstance(payload, str) else json.dumps(payload)
+        return self.client.post(url or self.url, body, content_type='application/json')
+
+    def test_sanitizes_texts_with_edit_log(self):
+        """Every text is cleaned by all policies by default, with its edits."""
+        response = self._post(['\uFF28i\u200b', 'ok'])
+        self.assertEqual(response.status_code, 200)
+        results = response.json()['results']
+        self.assertEqual([r['text'] for r in results], ['Hi', 'ok'])
+        self.assertEqual(results[0]['edits'][1], {'start': 2, 'end': 3, 'original': '\u200b',
+                                                  'replacement': '', 'policy': 'strip_invisible'})
+        self.assertEqual(results[1]['edits'], [])
+
+    def test_selects_policies(self):
+        """Policies can be given in the object body or as a query parameter."""
+        response = self._post({'texts': ['\uFF28i\u200b'], 'policies': ['strip_invisible']})
+        self.assertEqual(response.json()['results'][0]['text'], '\uFF28i')
+        response = self._post(['\uFF28i\u200b'], self.url + '?policies=fullwidth_to_ascii')
+        self.assertEqual(response.json()['results'][0]['text'], 'Hi\u200b')
+
+    def test_rejects_malformed_requests(self):
+        """Bad JSON, non-string items and unknown policies are 400; GET is 405."""
+        self.assertEqual(self._post('{').status_code, 400)
+        self.assertEqual(self._post([1]).status_code, 400)
+        self.assertEqual(self._post({'texts': ['a'], 'policies': ['nope']}).status_code, 400)
+        self.assertEqual(self._post({'texts': ['a'], 'policies': [{}]}).status_code, 400)
+        self.assertEqual(self._post(['a'], self.url + '?policies=nfkc,bogus').status_code, 400)
+        self.assertEqual(self.client.get(self.url).status_code, 405)
+
+
+class NameSearchTestCase(TestCase):
+    """Name search page and JSON endpoint."""
+
+    def setUp(self):
+        self.client = Client()
+
+    def test_search_page(self):
+        """Results link to codepoint pages; the empty form renders without results."""
+        response = self.client.get(reverse('search'), {'q': 'zero width space'})
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, reverse('codepoint', kwargs={'slug': '200B'}))
+        self.assertIn('max-age=', response['Cache-Control'])
+        response = self.client.get(reverse('search'))
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('results', response.context)
+
+    def test_search_api(self):
+        """Results carry code point, character and matching name; more flags a truncated page."""
+        response = self.client.get(reverse('search_api'), {'q': 'NBSP'})
+        self.assertEqual(response.json(), {
+            'results': [{'code_point': 'U+00A0', 'char': '\u00a0', 'hex_code': '00A0', 'name': 'NBSP'}],
+            'more': False,
+        })
+        data = self.client.get(reverse('search_api'), {'q': 'latin small letter', 'mode': 'prefix',
+                                                       'limit': 3}).json()
+        self.assertEqual(len(data['results']), 3)
+        self.assertTrue(data['more'])
+
+    def test_search_without_words(self):
+        """A word query of only hyphens and spaces finds nothing."""
+        for q in ('-', ' - '):
+            with self.subTest(q=q):
+                response = self.client.get(reverse('search'), {'q': q})
+                self.assertEqual(response.status_code, 200)
+                response = self.client.get(reverse('search_api'), {'q': q})
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.json()['results'], [])
+
+    def test_search_api_rejects_bad_parameters(self):
+        """Unknown modes, missing queries and oversized limits are 400."""
+        url = reverse('search_api')
+        self.assertEqual(self.client.get(url, {'q': 'a', 'mode': 'fuzzy'}).status_code, 400)
+        self.assertEqual(self.client.get(url).status_code, 400)
+        self.assertEqual(self.client.get(url, {'q': 'a', 'limit': 10 ** 6}).status_code, 400)
@@ -1,16 +1,30 @@
 """Unicode decode app views.
 
-Handles rendering of the about, codepoint, decode, privacy, terms, and tofu
-pages, and processes Unicode text decoding form submissions.
+Handles rendering of the about, block and range, codepoint, decode, name
+search, privacy, terms, and tofu pages, and processes Unicode text decoding form submissions
+and live edits.
 """
 
-from collections import Counter
-from dataclasses import asdict
+import hashlib
+import json
+from dataclasses import asdict, fields
+from django.core.cache import cache
+from django.core.paginator import InvalidPage, Paginator
 from django.shortcuts import render
 from django.template.loader import render_to_string
-from django.http import HttpResponse
-from decode.forms import UnicodeTextForm
+from django.utils.cache import add_never_cache_headers, patch_cache_control
+from django.utils.safestring import mark_safe
+from django.http import Http404, JsonResponse, StreamingHttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition, require_GET, require_POST
+from decode.forms import LiveEditForm, NameSearchForm, RowWindowForm, UnicodeTextForm
 from decode.mappings import INVISIBLE_CHARACTERS
+from decode import result_cache
+from decode.confusables import SkeletonIndex
+from decode import name_index
+from decode.sanitize import SANITIZE_POLICIES, sanitize
+from decode.row_renderer import render_codepoint_rows, render_rows
 import decode.unicode_util as u
 
 # Short descriptions for normalization form column tooltips.
@@ -21,6 +35,32 @@ NORMALIZATION_DESCRIPTIONS = {
     u.NormalizationForm.NFKD: 'Compatibility Decomposition: decomposed + compatibility equivalents.',
 }
 
+DECODE_TITLE = 'Unicode Decode'
+DECODE_TAGLINE = 'See every character behind your text instantly'
+
+# Character table rows rendered with the page; the rest are fetched by
+# decode-rows.js from the decode_rows endpoint as the table is scrolled.
+ROWS_PAGE_SIZE = 1000
+# Seconds the text behind a live decode revision is kept for follow-up edits.
+LIVE_REVISION_TIMEOUT = 60 * 60
+# Mixed-script words listed in the page summary (the API returns all of them).
+MIXED_TOKENS_SHOWN = 3
+# Bidi control issues listed in the summary (the count covers all of them).
+BIDI_ISSUES_SHOWN = 3
+# Per-character fields and result sections the decode API can return.
+API_CHARACTER_FIELDS = tuple(f.name for f in fields(u.CharacterInfo))
+API_SECTIONS = ('characters', 'normalization', 'summary')
+# Bump when codepoint.html (or anything it renders) changes, to invalidate ETags.
+CODEPOINT_TEMPLATE_VERSION = 5
+# Seconds browsers and shared caches may reuse a codepoint page.
+CODEPOINT_MAX_AGE = 60 * 60 * 24 * 30
+# Rows per page of the block and range pages (one codepoint table block).
+BLOCK_PAGE_SIZE = 256
+# Bump when block.html or the rows it includes change.
+BLOCK_TEMPLATE_VERSION = 2
+# Seconds search results may be cached (they only change with the Unicode data).
+SEARCH_MAX_AGE = 60 * 60 * 24
+
 
 def _normalization_form_with_descriptions(normalization_form):
     """Return a list of (form, value, description) for the normalization table and tooltips."""
@@ -31,20 +71,18 @@ def _normalization_form_with_descriptions(normalization_form):
 
 
 def _text_summary(text):
-    """Build summary dict from decoded text (list of CharacterInfo): num_chars, num_bytes, num_tokens, top3."""
-    if not text:
-        return {
-            'num_chars': 0,
-            'num_bytes': 0,
-            'num_tokens': 0,
-            'top3': [],
-        }
-    num_chars = len(text)
-    num_bytes = sum(len(info.char.encode('utf-8')) for info in text)
-    num_tokens = len(''.join(info.char for info in text).split())
-    counts = Counter(info.char for info in text)
+    """Build summary dict from decoded text (TextAnalysis).
+
+    Keys: num_chars, num_bytes (UTF-8), num_utf16_bytes, num_tokens, top3,
+    num_graphemes, top_clusters (most common multi-codepoint grapheme
+    clusters), categories and scripts (label -> count), num_mixed_tokens and
+    mixed_tokens (the first MIXED_TOKENS_SHOWN mixed-script words),
+    num_bidi_issues and bidi_issues (the first BIDI_ISSUES_SHOWN unterminated
+    or unmatched bidi controls), all from TextAnalysis.summarize.
+    """
+    summary = text.summarize()
     top3 = []
-    for c, n in counts.most_common(3):
+    for c, n in summary.most_common(3):
         code_point = u.get_code_point(c)
         if c == ' ':
             display = 'space'
@@ -54,30 +92,133 @@ def _text_summary(text):
             display = c
         top3.append({'char': c, 'count': n, 'code_point': code_point, 'display': display})
     return {
-        'num_chars': num_chars,
-        'num_bytes': num_bytes,
-        'num_tokens': num_tokens,
+        'num_chars': summary.num_chars,
+        'num_bytes': summary.utf8_bytes,
+        'num_utf16_bytes': summary.utf16_bytes,
+        'num_tokens': summary.num_tokens,
         'top3': top3,
+        'num_graphemes': summary.num_graphemes,
+        'top_clusters': [
+            {'cluster': cluster, 'count': n, 'code_points': ' '.join(map(u.get_code_point, cluster))}
+            for cluster, n in summary.most_common_clusters(3)
+        ],
+        'categories': summary.categories,
+        'scripts': summary.scripts,
+        'num_mixed_tokens': len(summary.mixed_script_tokens),
+        'mixed_tokens': [
+            {'token': token.token, 'start': token.start, 'scripts': ', '.join(token.scripts)}
+            for token in summary.mixed_script_tokens[:MIXED_TOKENS_SHOWN]
+        ],
+        'num_bidi_issues': len(summary.bidi_issues),
+        'bidi_issues': [issue._asdict() for issue in summary.bidi_issues[:BIDI_ISSUES_SHOWN]],
     }
 
 
 def _decode_context(form, raw_text):
-    """Build common context used by decode result renders."""
-    normalization_form = u.get_normalization_form(raw_text)
-    normalization_form_list = _normalization_form_with_descriptions(normalization_form)
+    """Build common context used by decode result renders.
+
+    The summary and normalization cover the whole text, but only the first
+    ROWS_PAGE_SIZE rows go in the table; longer texts also get a revision that
+    decode-rows.js uses to fetch the remaining rows. The rows themselves are
+    rendered by the caller (see _with_rows_html).
+    """
     text = u.examen_unicode(raw_text)
+    normalization_form = u.get_normalization_form(raw_text, text.distinct)
+    normalization_form_list = _normalization_form_with_descriptions(normalization_form)
     summary = _text_summary(text)
     return {
         'form': form,
         'text': text,
+        'rows': raw_text[:ROWS_PAGE_SIZE],
+        'revision': _live_revision(raw_text) if len(text) > ROWS_PAGE_SIZE else None,
         'summary': summary,
         'normalization_form': normalization_form,
         'normalization_form_list': normalization_form_list,
-        'title': 'Unicode Decode',
-        'tagline': 'See every character behind your text instantly',
+        'title': DECODE_TITLE,
+        'tagline': DECODE_TAGLINE,
     }
 
 
+def _with_rows_html(context):
+    """Return the context with the table rows rendered into rows_html."""
+    return dict(context, rows_html=mark_safe(render_rows(context['rows'])))
+
+
+def _live_revision(text):
+    """Store text for the live delta protocol and return its revision id (a content hash)."""
+    revision = hashlib.sha256(text.encode('utf-8', 'surrogatepass')).hexdigest()[:32]
+    cache.set(f'decode-live:{revision}', text, LIVE_REVISION_TIMEOUT)
+    return revision
+
+
+def _apply_live_edit(base, offset, deleted, inserted):
+    """Apply a UTF-16 offset/length edit to base.
+
+    Returns:
+        (text, start, removed): the edited text, the code point index of the
+        edit, and the number of code points removed; None if the edit does
+        not fit base or splits a surrogate pair.
+    """
+    units = base.encode('utf-16-le', 'surrogatepass')
+    end = 2 * (offset + deleted)
+    if end > len(units):
+        return None
+    try:
+        prefix = units[:2 * offset].decode('utf-16-le')
+        removed = units[2 * offset:end].decode('utf-16-le')
+    except UnicodeDecodeError:
+        return None
+    start = len(prefix)
+    return prefix + inserted + base[start + len(removed):], start, len(removed)
+
+
+def _api_option(options, key, allowed):
+    """Read a list option (JSON list or comma-separated string) restricted to allowed values."""
+    value = options.get(key)
+    if value is None:
+        return allowed
+    if isinstance(value, str):
+        value = [v.strip() for v in value.split(',') if v.strip()]
+    if (not isinstance(value, list) or not all(isinstance(v, str) for v in value)
+            or not set(value) <= set(allowed)):
+        raise ValueError(f'{key} must be a subset of: {", ".join(allowed)}')
+    return tuple(name for name in allowed if name in value)
+
+
+def _api_result(text, character_fields, sections):
+    """Build the decode API result for one string with only the requested parts."""
+    result = {}
+    analysis = u.examen_unicode(text) if 'summary' in sections or 'normalization' in sections else None
+    if 'characters' in sections:
+        rows = {}
+        characters = []
+        for char in text:
+            row = rows.get(char)
+            if row is None:
+                info = u.get_character_info(char)
+                row = rows[char] = {name: getattr(info, name) for name in character_fields}
+            characters.append(row)
+        result['characters'] = characters
+    if 'normalization' in sections:
+        normalization_form = u.get_normalization_form(text, analysis.distinct)
+        result['normalization'] = {form.value: value for form, value in normalization_form.items()}
+    if 'summary' in sections:
+        summary = analysis.summarize()
+        result['summary'] = {
+            'num_chars': summary.num_chars,
+            'utf8_bytes': summary.utf8_bytes,
+            'utf16_bytes': summary.utf16_bytes,
+            'num_tokens': summary.num_tokens,
+            'num_graphemes': summary.num_graphemes,
+            'top': [{'char': c, 'count': n} for c, n in summary.most_common(3)],
+            'categories': summary.categories,
+            'scripts': summary.scripts,
+            'mixed_script_tokens': [token._asdict() for token in summary.mixed_script_tokens],
+            'bidi_issues': [issue._asdict() for issue in summary.bidi_issues],
+        }
+    return result
+
+
 def about(request):
     """Render the About page.
 
@@ -88,6 +229,32 @@ def about(request):
                                          'tagline' : 'Get To Know Us'})
 
 
+def _slug_codepoint(slug):
+    """The code point a codepoint page slug names, or None if it is not hex or is outside the code space."""
+    if not slug.isalnum():  # int() would also accept a sign or underscores
+        return None
+    try:
+        cp = int(slug, 16)
+    except ValueError:
+        return None
+    return cp if cp <= u.MAX_CODEPOINT else None
+
+
+def codepoint_etag(request, slug):
+    """Strong ETag for a codepoint page, computed without any Unicode lookups.
+
+    The page depends only on the code point, the Unicode data version and the
+    template, so those make up the tag. Returns None for invalid slugs (see
+    _slug_codepoint), leaving them to the view.
+    """
+    cp = _slug_codepoint(slug)
+    if cp is None:
+        return None
+    return f'cp-{cp:04X}-{u.ud.unidata_version}-{CODEPOINT_TEMPLATE_VERSION}'
+
+
+@cache_control(public=True, max_age=CODEPOINT_MAX_AGE)
+@condition(etag_func=codepoint_etag)
 def codepoint(request, slug):
     """Render the codepoint detail page for a Unicode code point.
 
@@ -97,12 +264,359 @@ def codepoint(request, slug):
 
     Returns:
         HttpResponse: Rendered codepoint.html with codepoint description context.
+
+    Raises:
+        Http404: If the slug is not hex or is above U+10FFFF.
     """
-    char = chr(int(slug, 16))
+    cp = _slug_codepoint(slug)
+    if cp is None:
+        raise Http404('invalid code point')
+    char = chr(cp)
     char_desc = u.get_character_page_description(char)
     return render(request, 'decode/codepoint.html', asdict(char_desc))
 
 
+def _page_number(request):
+    """The ?page= parameter as given ('1' if absent), for ETags and the paginator."""
+    return request.GET.get('page', '1')
+
+
+def _codepoint_range_etag(first, last, request):
+    """Strong ETag for a page of a block or range: bounds, page, Unicode version and template."""
+    page = _page_number(request)
+    if not page.isdigit():
+        return None
+    return f'range-{first:04X}-{last:04X}-{int(page)}-{u.ud.unidata_version}-{BLOCK_TEMPLATE_VERSION}'
+
+
+def block_etag(request, name):
+    """ETag for a block page (None for unknown blocks, leaving them to the view)."""
+    block = u.find_block(name)
+    return _codepoint_range_etag(block.first, block.last, request) if block else None
+
+
+def range_etag(request, start, end):
+    """ETag for a range page."""
+    return _codepoint_range_etag(start, end, request)
+
+
+def _render_codepoint_range(request, first, last, context):
+    """Render one page of the character table for the code points first..last.
+
+    Rows are rendered straight from the codepoint table, BLOCK_PAGE_SIZE per
+    page (?page=, 1-based), so even a whole plane costs one page of rows per
+    request.
+
+    Raises:
+        Http404: If the range is empty or out of the code space, or the page
+            does not exist.
+    """
+    if not 0 <= first <= last <= u.MAX_CODEPOINT:
+        raise Http404('invalid code point range')
+    paginator = Paginator(range(first, last + 1), BLOCK_PAGE_SIZE)
+    try:
+        page = paginator.page(_page_number(request))
+    except InvalidPage:
+        raise Http404('no such page')
+    context.update(
+        first=f'U+{first:04X}',
+        last=f'U+{last:04X}',
+        page=page,
+        rows_html=mark_safe(render_codepoint_rows(page.object_list)),
+    )
+    return render(request, 'decode/block.html', context)
+
+
+@require_GET
+@cache_control(public=True, max_age=CODEPOINT_MAX_AGE)
+@condition(etag_func=block_etag)
+def block(request, name):
+    """Render a page of the character table for a Unicode block.
+
+    Args:
+        request: The HTTP request.
+        name: Block name from Blocks.txt, loosely matched (e.g.
+            'Latin-1_Supplement' or 'latin-1 supplement').
+
+    Returns:
+        HttpResponse: Rendered block.html; 404 for unknown blocks.
+    """
+    current = u.find_block(name)
+    if current is None:
+        raise Http404('unknown block')
+    blocks = u.get_blocks()
+    i = blocks.index(current)
+    context = {
+        'title': current.name,
+        'tagline': f'U+{current.first:04X}–U+{current.last:04X}',
+        'unicode_block': current,
+        'previous_block': blocks[i - 1] if i else None,
+        'next_block': blocks[i + 1] if i + 1 < len(blocks) else None,
+    }
+    return _render_codepoint_range(request, current.first, current.last, context)
+
+
+@require_GET
+@cache_control(public=True, max_age=CODEPOINT_MAX_AGE)
+@condition(etag_func=range_etag)
+def codepoint_range(request, start, end):
+    """Render a page of the character table for an arbitrary code point range.
+
+    Args:
+        request: The HTTP request.
+        start: First code point (hex in the URL).
+        end: Last code point, inclusive.
+
+    Returns:
+        HttpResponse: Rendered block.html; 404 for invalid ranges.
+    """
+    context = {'title': 'Code Point Range', 'tagline': f'U+{start:04X}–U+{end:04X}'}
+    return _render_codepoint_range(request, start, end, context)
+
+
+@require_POST
+def decode_live(request):
+    """Apply one textarea edit to a previous live decode and return only what changed.
+
+    The client posts the revision returned with its last result (the
+    X-Decode-Revision header or a previous response), the edit's UTF-16
+    offset, deleted length and inserted text. Rows outside the edit do not
+    change, so only the rows for the inserted text are rendered (at most
+    ROWS_PAGE_SIZE of them); the summary and normalization sections are
+    recomputed over the whole text.
+
+    Returns:
+        JsonResponse: revision, start (first replaced row), deleted (rows to
+            remove), inserted (rows added, of which rows holds the HTML of
+            up to ROWS_PAGE_SIZE), total (rows in the new text), summary and
+            normalization HTML; 409 if the revision is unknown (the client
+            then posts the full text), 400 if the edit is invalid.
+    """
+    form = LiveEditForm(request.POST)
+    if not form.is_valid():
+        return JsonResponse({'error': 'invalid edit'}, status=400)
+    base = cache.get(f"decode-live:{form.cleaned_data['revision']}")
+    if base is None:
+        return JsonResponse({'error': 'unknown revision'}, status=409)
+    inserted = form.cleaned_data['inserted']
+    edit = _apply_live_edit(base, form.cleaned_data['offset'], form.cleaned_data['deleted'], inserted)
+    if edit is None:
+        return JsonResponse({'error': 'invalid edit'}, status=400)
+    raw_text, start, removed = edit
+    context = _decode_context(None, raw_text)
+    rows = raw_text[start:start + min(len(inserted), ROWS_PAGE_SIZE)]
+    return JsonResponse({
+        'revision': _live_revision(raw_text),
+        'start': start,
+        'deleted': removed,
+        'inserted': len(inserted),
+        'total': len(raw_text),
+        'rows': render_rows(rows),
+        'summary': render_to_string('decode/_decode_summary.html', context, request=request),
+        'normalization': render_to_string('decode/_decode_normalization.html', context, request=request),
+    })
+
+
+@require_GET
+def decode_rows(request):
+    """Return a window of character table rows for a decoded text.
+
+    The text is looked up by the revision embedded in the results (or sent
+    with a live update). Rows depend only on their own character, so only
+    the requested slice is rendered. Revisions are content hashes, so
+    responses never change and may be cached by the browser.
+
+    Returns:
+        JsonResponse: start, rows (HTML of up to ROWS_PAGE_SIZE rows from
+            start) and total (rows in the text); 409 if the revision is
+            unknown (the client then reloads the results), 400 if the
+            parameters are invalid. Errors are never cached: after a 409 the
+            client stores the text again under the same revision and
+            retries the same URL.
+    """
+    form = RowWindowForm(request.GET)
+    if not form.is_valid():
+        response = JsonResponse({'error': 'invalid window'}, status=400)
+        add_never_cache_headers(response)
+        return response
+    text = cache.get(f"decode-live:{form.cleaned_data['revision']}")
+    if text is None:
+        response = JsonResponse({'error': 'unknown revision'}, status=409)
+        add_never_cache_headers(response)
+        return response
+    start = form.cleaned_data['start']
+    count = min(form.cleaned_data['count'] or ROWS_PAGE_SIZE, ROWS_PAGE_SIZE)
+    response = JsonResponse({
+        'start': start,
+        'rows': render_rows(text[start:start + count]),
+        'total': len(text),
+    })
+    patch_cache_control(response, private=True, max_age=LIVE_REVISION_TIMEOUT)
+    return response
+
+
+@csrf_exempt
+@require_POST
+def decode_api(request):
+    """Decode a batch of strings and return the results as JSON.
+
+    The body is either JSON -- an array of strings, or an object with
+    "texts" and optional "fields" and "sections" -- or NDJSON
+    (Content-Type application/x-ndjson), one JSON string or {"text": ...}
+    object per line. For array and NDJSON bodies, fields and sections may be
+    given as comma-separated query parameters. "fields" selects the
+    per-character CharacterInfo fields (API_CHARACTER_FIELDS) and "sections"
+    which of characters, normalization and summary are computed.
+
+    Returns:
+        JsonResponse: {"results": [...]} in input order, or for NDJSON input
+            a streamed NDJSON response with one result per line; 400 with
+            an error message if the request is malformed.
+    """
+    ndjson = request.content_type == 'application/x-ndjson'
+    try:
+        if ndjson:
+            items = [json.loads(line) for line in request.body.decode('utf-8').splitlines() if line.strip()]
+            options = request.GET
+        else:
+            payload = json.loads(request.body)
+            if isinstance(payload, dict):
+                items, options = payload.get('texts'), payload
+            else:
+                items, options = payload, request.GET
+        if not isinstance(items, list):
+            raise ValueError('expected a list of strings')
+        texts = [item.get('text') if isinstance(item, dict) else item for item in items]
+        if not all(isinstance(text, str) for text in texts):
+            raise ValueError('expected a list of strings')
+        character_fields = _api_option(options, 'fields', API_CHARACTER_FIELDS)
+        sections = _api_option(options, 'sections', API_SECTIONS)
+    except (ValueError, UnicodeDecodeError) as exc:
+        return JsonResponse({'error': str(exc)}, status=400)
+
+    if ndjson:
+        lines = (json.dumps(_api_result(text, character_fields, sections)) + '\n' for text in texts)
+        return StreamingHttpResponse(lines, content_type='application/x-ndjson')
+    return JsonResponse({'results': [_api_result(text, character_fields, sections) for text in texts]})
+
+
+@csrf_exempt
+@require_POST
+def confusables_api(request):
+    """Screen a batch of strings against a target set by UTS #39 skeleton.
+
+    The body is a JSON object with "targets" (e.g. brand names or existing
+    usernames) and "candidates", both arrays of strings. The targets are
+    indexed by skeleton once, so each candidate costs one skeleton and one
+    hash lookup.
+
+    Returns:
+        JsonResponse: {"matches": [...]} with index, candidate, skeleton and
+            the confusable targets for each candidate that matches, in
+            input order; 400 with an error message if the request is
+            malformed.
+    """
+    try:
+        payload = json.loads(request.body)
+        if not isinstance(payload, dict):
+            raise ValueError('expected an object with targets and candidates')
+        targets, candidates = payload.get('targets'), payload.get('candidates')
+        for items in (targets, candidates):
+            if not isinstance(items, list) or not all(isinstance(item, str) for item in items):
+                raise ValueError('expected lists of strings for targets and candidates')
+    except (ValueError, UnicodeDecodeError) as exc:
+        return JsonResponse({'error': str(exc)}, status=400)
+    index = SkeletonIndex(targets)
+    return JsonResponse({'matches': [match._asdict() for match in index.screen(candidates)]})
+
+
+@csrf_exempt
+@require_POST
+def sanitize_api(request):
+    """Clean a batch of strings and return the cleaned text with an edit log.
+
+    The body is JSON: an array of strings, or an object with "texts" and
+    optional "policies". For an array body, policies may be given as a
+    comma-separated query parameter. "policies" selects which of
+    SANITIZE_POLICIES are applied (all of them by default).
+
+    Returns:
+        JsonResponse: {"results": [{"text": ..., "edits": [...]}, ...]} in
+            input order, each edit with start, end (code point offsets in
+            the input), original, replacement and policy; 400 with an error
+            message if the request is malformed.
+    """
+    try:
+        payload = json.loads(request.body)
+        if isinstance(payload, dict):
+            texts, options = payload.get('texts'), payload
+        else:
+            texts, options = payload, request.GET
+        if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+            raise ValueError('expected a list of strings')
+        policies = _api_option(options, 'policies', SANITIZE_POLICIES)
+    except (ValueError, UnicodeDecodeError) as exc:
+        return JsonResponse({'error': str(exc)}, status=400)
+    results = (sanitize(text, policies) for text in texts)
+    return JsonResponse({'results': [
+        {'text': result.text, 'edits': [edit._asdict() for edit in result.edits]} for result in results
+    ]})
+
+
+def _search_results(form):
+    """Run a valid NameSearchForm's query.
+
+    Returns:
+        (results, more): up to limit result dicts with code_point, char,
+        hex_code and name, and whether more matches were left out.
+    """
+    data = form.cleaned_data
+    limit = data['limit'] or name_index.SEARCH_LIMIT
+    matches = name_index.search(data['q'], data['mode'] or 'word', limit + 1)
+    results = [{
+        'code_point': u.get_code_point(chr(match.code_point)),
+        'char': chr(match.code_point),
+        'hex_code': f'{match.code_point:04X}',
+        'name': match.name,
+    } for match in matches[:limit]]
+    return results, len(matches) > limit
+
+
+@require_GET
+@cache_control(public=True, max_age=SEARCH_MAX_AGE)
+def search(request):
+    """Render the name search page, with results if a query was given.
+
+    Returns:
+        HttpResponse: Rendered search.html with the form and results.
+    """
+    form = NameSearchForm(request.GET or None)
+    context = {'title': 'Search', 'tagline': 'Find Characters By Name', 'form': form}
+    if form.is_valid():
+        context['results'], context['more'] = _search_results(form)
+    return render(request, 'decode/search.html', context)
+
+
+@require_GET
+@cache_control(public=True, max_age=SEARCH_MAX_AGE)
+def search_api(request):
+    """Search character names and aliases and return the matches as JSON.
+
+    Query parameters are q, mode (word, prefix or substring; default word)
+    and limit (at most name_index.SEARCH_LIMIT, the default).
+
+    Returns:
+        JsonResponse: {"results": [...], "more": bool} with code_point,
+            char, hex_code and the matching name or alias of each result;
+            400 with the form errors if the parameters are invalid.
+    """
+    form = NameSearchForm(request.GET)
+    if not form.is_valid():
+        return JsonResponse({'error': form.errors.get_json_data()}, status=400)
+    results, more = _search_results(form)
+    return JsonResponse({'results': results, 'more': more})
+
+
 def privacy(request):
     """Render the Privacy Policy page.
 
@@ -118,7 +632,8 @@ def decode(request):
 
     GET returns the home form, or decode results if the `s` query parameter
     is present (e.g. /?s=abcd). POST validates the form, normalizes and analyzes
-    the submitted text, then renders the decode results.
+    the submitted text, then renders the decode results. Rendered
+    results for ?s= are shared through result_cache (see X-Decode-Cache).
 
     Returns:
         HttpResponse: Rendered home.html (GET) or decode.html (POST) with form
@@ -130,15 +645,35 @@ def decode(request):
             raw_text = form.cleaned_data['text']
             context = _decode_context(form, raw_text)
             if request.headers.get('X-Decode-Live') == '1':
-                html = render_to_string('decode/_decode_results.html', context, request=request)
-                return HttpResponse(html)
-            return render(request, 'decode/decode.html', context)
+                response = render(request, 'decode/_decode_results.html', _with_rows_html(context))
+                response['X-Decode-Revision'] = _live_revision(raw_text)
+                return response
+            return render(request, 'decode/decode.html', _with_rows_html(context))
 
     # GET with ?s=... : show decode results for that string
     query_string = request.GET.get('s')
     if query_string is not None and query_string != '':
         form = UnicodeTextForm(initial={'text': query_string})
-        return render(request, 'decode/decode.html', _decode_context(form, query_string))
+        if not result_cache.admits(query_string):
+            return render(request, 'decode/decode.html', _with_rows_html(_decode_context(form, query_string)))
+        results_html = result_cache.get(query_string)
+        status = 'HIT'
+        if results_html is not None and len(query_string) > ROWS_PAGE_SIZE:
+            _live_revision(query_string)  # keep the cached table's revision loadable
+        if results_html is None:
+            status = 'MISS'
+            context = _decode_context(form, query_string)
+            results_html = render_to_string('decode/_decode_results.html', _with_rows_html(context),
+                                            request=request)
+            result_cache.store(query_string, results_html)
+        response = render(request, 'decode/decode.html', {
+            'form': form,
+            'results_html': mark_safe(results_html),
+            'title': DECODE_TITLE,
+            'tagline': DECODE_TAGLINE,
+        })
+        response['X-Decode-Cache'] = status
+        return response
 
     form = UnicodeTextForm()
     return render(request, 'decode/home.html', {'form': form})